@@ -0,0 +1,180 @@
+#  filename: asset_cache.py
+#  Pre-scaled images kept on disk as raw pixels, so startup skips decoding and smoothscale
+#
+#      python asset_cache.py [--clear]
+#
+#  Entries live in images/.cache, one file per (source contents, size, pixel
+#  format). Changing a source image just means a new entry; old ones stay
+#  until --clear.
+
+import os
+import sys
+import weakref
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+CACHE_DIR = os.path.join("images", ".cache")
+ENTRY_EXT = ".px"
+
+_digests = {}  # path -> ((mtime, size), digest), so a source is only read again when it changes
+_sources = weakref.WeakKeyDictionary()  # loaded surface -> (source path, alpha), for rescale()
+
+
+def _format(alpha):
+    return "RGBA" if alpha else "RGB"
+
+
+def _digest(path):
+    """Checksum of the source file's contents (mtimes don't survive copying into a bundle)."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    known = _digests.get(path)
+    if known is not None and known[0] == stamp:
+        return known[1]
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = f"{zlib.crc32(data):08x}{len(data):x}"
+    _digests[path] = (stamp, digest)
+    return digest
+
+
+def entry_path(path, size, alpha=False):
+    """Where the cached pixels for `path` scaled to `size` are (or would be) stored."""
+    w, h = size
+    return os.path.join(CACHE_DIR, f"{_digest(path)}_{w}x{h}_{_format(alpha)}{ENTRY_EXT}")
+
+
+def _build(path, size, alpha, entry):
+    """Load and smoothscale `path`, store the pixels in `entry` and return them.
+
+    Runs on warm()'s worker threads: image.load and smoothscale release the
+    GIL, and nothing here needs the display.
+    """
+    img = pygame.image.load(path)
+    if img.get_bitsize() < 24:
+        img = img.convert(32, pygame.SRCALPHA) if alpha else img.convert(24)
+    data = pygame.image.tobytes(pygame.transform.smoothscale(img, size), _format(alpha))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, entry)  # readers never see a half-written entry
+    except OSError as e:
+        print(f"Warning: could not cache {path}: {e}")
+    return data
+
+
+def load_scaled(path, size, alpha=False):
+    """`path` smoothscaled to `size`, from the cache when it's there.
+
+    A hit is one read of raw pixels wrapped with image.frombuffer, whatever the
+    source resolution. Converted for the display when there is one, like
+    `.convert()` / `.convert_alpha()`. Raises pygame.error / OSError as
+    image.load would.
+    """
+    size = (int(size[0]), int(size[1]))
+    fmt = _format(alpha)
+    entry = entry_path(path, size, alpha)
+    data = None
+    try:
+        with open(entry, 'rb') as f:
+            data = f.read()
+        if len(data) != size[0] * size[1] * len(fmt):
+            data = None  # torn or foreign file: rebuild it
+    except OSError:
+        pass
+    if data is None:
+        data = _build(path, size, alpha, entry)
+    img = pygame.image.frombuffer(data, size, fmt)
+    if pygame.display.get_surface() is not None:
+        img = img.convert_alpha() if alpha else img.convert()
+    remember(img, path, alpha)
+    return img
+
+
+def remember(img, path, alpha=False):
+    """Note that `img` is `path` scaled (load_scaled does this; call it for
+    copies from elsewhere, like the atlas), so rescale() can go back to the source."""
+    _sources[img] = (path, alpha)
+
+
+def rescale(img, factor):
+    """`img` at a whole `factor` times its size: scaled again from its source
+    file when it came from load_scaled() or remember() (and cached like any
+    other size), else pixel-doubled from `img` itself."""
+    size = (img.get_width() * factor, img.get_height() * factor)
+    source = _sources.get(img)
+    if source is not None:
+        try:
+            return load_scaled(source[0], size, source[1])
+        except (pygame.error, OSError) as e:
+            print(f"Warning: could not rescale {source[0]}: {e}")
+    return pygame.transform.scale(img, size)
+
+
+def warm(items, workers=None):
+    """Build the missing entries for (path, size, alpha) items on a thread pool.
+
+    Called before a batch of load_scaled() calls so that the first launch
+    scales everything in parallel; afterwards nothing is missing and this only
+    checks that the entries exist. Returns how many were built. Sources that
+    don't exist or don't load are skipped here; load_scaled() reports them.
+    """
+    todo = {}
+    for path, size, alpha in items:
+        size = (int(size[0]), int(size[1]))
+        try:
+            entry = entry_path(path, size, alpha)
+        except OSError:
+            continue
+        if not os.path.exists(entry):
+            todo[entry] = (path, size, alpha)
+    if not todo:
+        return 0
+
+    def build(entry):
+        path, size, alpha = todo[entry]
+        try:
+            _build(path, size, alpha, entry)
+            return True
+        except (pygame.error, OSError, ValueError):
+            return False
+
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        return sum(pool.map(build, todo))
+
+
+def clear():
+    """Delete every entry; returns (files, bytes) removed."""
+    files = size = 0
+    if not os.path.isdir(CACHE_DIR):
+        return files, size
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(ENTRY_EXT) or name.endswith(".tmp"):
+            p = os.path.join(CACHE_DIR, name)
+            size += os.path.getsize(p)
+            os.remove(p)
+            files += 1
+    return files, size
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Show or clear the pre-scaled image cache")
+    parser.add_argument("--clear", action="store_true", help="delete every cached image")
+    args = parser.parse_args(argv)
+    if args.clear:
+        files, size = clear()
+        print(f"Removed {files} cached images ({size / 1e6:.1f} MB) from {CACHE_DIR}")
+        return 0
+    names = [n for n in os.listdir(CACHE_DIR) if n.endswith(ENTRY_EXT)] if os.path.isdir(CACHE_DIR) else []
+    size = sum(os.path.getsize(os.path.join(CACHE_DIR, n)) for n in names)
+    print(f"{len(names)} cached images ({size / 1e6:.1f} MB) in {CACHE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#  filename: atlas.py
+#  Build step + loader for the sprite atlas (tiles and avatars pre-scaled into one image)
+#
+#  Build:  python atlas.py [--tile-size 32] [--player-size 20]
+#  Writes images/atlas.png and images/atlas.json; the game falls back to the
+#  individual image files if they are missing or built for other sizes.
+#  `python atlas.py --check` tells you whether the sources changed since.
+
+import json
+import os
+import sys
+import zlib
+
+import pygame
+
+ATLAS_IMAGE = os.path.join("images", "atlas.png")
+ATLAS_INDEX = os.path.join("images", "atlas.json")
+
+TILE_IMAGES = ["block_1.png", "obj-spike.png", "coin.png", "orb-yellow.png", "obj-breakable.png"]
+AVATAR_DIR = os.path.join("images", "avatar")
+ATLAS_WIDTH = 256
+PADDING = 1  # transparent gap so smoothscaled edges never bleed into neighbours
+
+
+def _sources(tile_size, player_size):
+    """(key, path, size) for everything that goes in the atlas. Keys are paths
+    relative to the project root, so callers look frames up by the file they
+    would otherwise have loaded."""
+    items = [(os.path.join("images", fn), (tile_size, tile_size)) for fn in TILE_IMAGES]
+    items.append((os.path.join("images", "avatar.png"), (player_size, player_size)))
+    if os.path.isdir(AVATAR_DIR):
+        for fn in sorted(os.listdir(AVATAR_DIR)):
+            if fn.lower().endswith(('.png', '.jpg', '.jpeg')):
+                items.append((os.path.join(AVATAR_DIR, fn), (player_size, player_size)))
+    return [(path.replace(os.sep, "/"), path, size) for path, size in items if os.path.isfile(path)]
+
+
+def _stamp(path):
+    """Content checksum (mtimes don't survive copying into a bundle)."""
+    with open(path, 'rb') as f:
+        return zlib.crc32(f.read())
+
+
+def build_atlas(tile_size=32, player_size=20, image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX):
+    """Scale every source once and shelf-pack them into a single image + JSON index."""
+    sources = _sources(tile_size, player_size)
+    placed = []
+    x = y = shelf_h = 0
+    for key, path, (w, h) in sources:
+        if x + w + PADDING > ATLAS_WIDTH:
+            x, y = 0, y + shelf_h + PADDING
+            shelf_h = 0
+        placed.append((key, path, pygame.Rect(x, y, w, h)))
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+
+    sheet = pygame.Surface((ATLAS_WIDTH, y + shelf_h), pygame.SRCALPHA, 32)
+    sheet.fill((0, 0, 0, 0))
+    frames = {}
+    stamps = {}
+    for key, path, r in placed:
+        img = pygame.image.load(path)
+        if img.get_bitsize() < 24:
+            img = img.convert(32, pygame.SRCALPHA)
+        sheet.blit(pygame.transform.smoothscale(img, r.size), r)
+        frames[key] = [r.x, r.y, r.w, r.h]
+        stamps[key] = _stamp(path)
+
+    pygame.image.save(sheet, image_path)
+    with open(index_path, 'w') as f:
+        json.dump({"tile_size": tile_size, "player_size": player_size,
+                   "frames": frames, "sources": stamps}, f)
+    return frames
+
+
+class Atlas:
+    """One decoded sheet; frames are subsurfaces of it (no per-frame copies)."""
+
+    def __init__(self, sheet, frames):
+        self.sheet = sheet
+        self.frames = {key: sheet.subsurface(pygame.Rect(r)) for key, r in frames.items()}
+
+    def __contains__(self, key):
+        return _key(key) in self.frames
+
+    def get(self, key):
+        return self.frames[_key(key)]
+
+
+def _key(path):
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def is_stale(index_path=ATLAS_INDEX):
+    """True if the atlas is missing or any source image changed since the build."""
+    if not os.path.isfile(index_path):
+        return True
+    with open(index_path, 'r') as f:
+        index = json.load(f)
+    for key, stamp in index.get("sources", {}).items():
+        if not os.path.isfile(key) or _stamp(key) != stamp:
+            return True
+    return {key for key, _, _ in _sources(index["tile_size"], index["player_size"])} != set(index["frames"])
+
+
+def load_atlas(tile_size, player_size, image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX):
+    """Return an Atlas, or None if it is missing or built for other sizes
+    (callers then load the files directly). One file open and decode in total;
+    sources are not re-read here, that is what --check at build time is for."""
+    try:
+        if not (os.path.isfile(image_path) and os.path.isfile(index_path)):
+            return None
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index.get("tile_size") != tile_size or index.get("player_size") != player_size:
+            return None
+        sheet = pygame.image.load(image_path).convert_alpha()
+        return Atlas(sheet, index["frames"])
+    except Exception as e:
+        print(f"Error loading atlas: {e}")
+        return None
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Pack tiles and avatars into images/atlas.png")
+    parser.add_argument("--tile-size", type=int, default=32)
+    parser.add_argument("--player-size", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="only report whether the atlas is out of date")
+    args = parser.parse_args(argv)
+    if args.check:
+        stale = is_stale()
+        print("Atlas is out of date; run python atlas.py" if stale else "Atlas is up to date")
+        return 1 if stale else 0
+    frames = build_atlas(args.tile_size, args.player_size)
+    print(f"Packed {len(frames)} images into {ATLAS_IMAGE} ({ATLAS_INDEX})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
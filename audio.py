@@ -0,0 +1,194 @@
+#  filename: audio.py
+#  Sound effects and per-level music, loaded once at startup
+
+import math
+import os
+import random
+import threading
+from array import array
+
+import pygame
+
+MUSIC_DIR = "music"
+SOUND_DIR = "sounds"
+
+DEFAULT_TRACK = "bossfight-Vextron.mp3"
+# level index (0-based) -> track in MUSIC_DIR; other levels use DEFAULT_TRACK
+LEVEL_MUSIC = {
+    1: "Castle-town.mp3",
+}
+
+SFX_NAMES = ("coin", "jump", "orb", "death")
+SFX_CHANNELS = 8
+
+
+def _synth(kind, rate):
+    """Fallback effect as mono signed 16-bit samples, used when sounds/<kind>.wav is missing."""
+    def tone(freqs, length, volume=0.35, square=True):
+        n = int(rate * length)
+        out = []
+        phase = 0.0
+        for i in range(n):
+            # sweep linearly through the given frequencies
+            pos = i / n * (len(freqs) - 1)
+            lo = int(pos)
+            hi = min(lo + 1, len(freqs) - 1)
+            f = freqs[lo] + (freqs[hi] - freqs[lo]) * (pos - lo)
+            phase += f / rate
+            wave = (1.0 if (phase % 1.0) < 0.5 else -1.0) if square else math.sin(2 * math.pi * phase)
+            env = 1.0 - i / n  # linear fade out
+            out.append(int(32767 * volume * env * wave))
+        return out
+
+    if kind == "coin":
+        return tone([988, 988], 0.06) + tone([1319, 1319], 0.12)
+    if kind == "jump":
+        return tone([330, 660], 0.12, volume=0.25)
+    if kind == "orb":
+        return tone([880, 1760], 0.2, volume=0.3, square=False)
+    if kind == "death":
+        rng = random.Random(7)
+        n = int(rate * 0.35)
+        return [int(32767 * 0.4 * (1.0 - i / n) * rng.uniform(-1, 1)) for i in range(n)]
+    return []
+
+
+class AudioManager:
+    """Preloaded sound effects on a fixed channel pool, plus level music.
+
+    Everything that touches the disk happens in __init__ (and in the optional
+    background music preload), so coins, jumps, orbs, deaths and retries never
+    open files. With preload_music, switching to a track that is still being
+    decoded starts it from the loader thread once it is ready, so a level
+    change never loads music on the frame thread either. If the mixer is
+    unavailable every method is a no-op.
+    """
+
+    def __init__(self, channels=SFX_CHANNELS, preload_music=False):
+        self.enabled = pygame.mixer.get_init() is not None
+        self.sounds = {}
+        self.channels = []
+        self.started = {}  # channel index -> tick the current voice started
+        self.current_track = None
+        self.music_channel = None
+        self.music_sounds = {}  # track -> fully decoded Sound (only with preload_music)
+        self.preloading = False  # the loader thread has tracks left to decode
+        self.streamed = None  # track open in pygame.mixer.music
+        self._lock = threading.Lock()  # music state shared with the loader thread
+        if not self.enabled:
+            return
+
+        # fixed pool of SFX channels; one extra channel is kept for preloaded music
+        pygame.mixer.set_num_channels(channels + 1)
+        pygame.mixer.set_reserved(channels + 1)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.music_channel = pygame.mixer.Channel(channels)
+
+        freq, size, n_channels = pygame.mixer.get_init()
+        for name in SFX_NAMES:
+            path = os.path.join(SOUND_DIR, name + ".wav")
+            try:
+                if os.path.isfile(path):
+                    self.sounds[name] = pygame.mixer.Sound(path)
+                elif size == -16:
+                    mono = _synth(name, freq)
+                    samples = array('h', (s for s in mono for _ in range(n_channels)))
+                    self.sounds[name] = pygame.mixer.Sound(buffer=samples.tobytes())
+            except pygame.error as e:
+                print(f"Warning: could not load sound '{name}': {e}")
+
+        if preload_music:
+            # the first level's track first: the game starts with it
+            tracks = [DEFAULT_TRACK] + sorted(set(LEVEL_MUSIC.values()) - {DEFAULT_TRACK})
+            self.preloading = True
+            threading.Thread(target=self._preload_music, args=(tracks,), daemon=True).start()
+
+    def _preload_music(self, tracks):
+        """Decode tracks into memory off the main thread; used once ready. A track
+        that was asked for while it was decoding starts here (streamed if it
+        can't be decoded)."""
+        for track in tracks:
+            try:
+                sound = pygame.mixer.Sound(os.path.join(MUSIC_DIR, track))
+            except pygame.error as e:
+                print(f"Warning: could not preload music '{track}': {e}")
+                sound = None
+            with self._lock:
+                if sound is not None:
+                    self.music_sounds[track] = sound
+                if track == self.current_track and self.streamed is None and not self.music_channel.get_busy():
+                    if sound is not None:
+                        self.music_channel.play(sound, loops=-1)
+                    else:
+                        self._stream(track)
+        with self._lock:
+            self.preloading = False
+
+    # -------------------- Sound effects --------------------
+
+    def play(self, name, volume=1.0):
+        """Play a preloaded effect, stealing the oldest voice if every channel is busy."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        idx = None
+        for i, ch in enumerate(self.channels):
+            if not ch.get_busy():
+                idx = i
+                break
+        if idx is None:
+            idx = min(self.started, key=self.started.get)
+        ch = self.channels[idx]
+        ch.set_volume(volume)
+        ch.play(sound)
+        self.started[idx] = pygame.time.get_ticks()
+
+    # -------------------- Music --------------------
+
+    def track_for(self, level):
+        return LEVEL_MUSIC.get(level, DEFAULT_TRACK)
+
+    def play_music(self, track, restart=True):
+        """Play a track from MUSIC_DIR, looping.
+
+        Replaying the track that is already loaded just rewinds it; only a
+        different track opens a file (or none at all once it is preloaded, or
+        is being preloaded).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if track == self.current_track:
+                if restart:
+                    self._restart_music()
+                return
+            self.current_track = track
+            preloaded = self.music_sounds.get(track)
+            pygame.mixer.music.stop()
+            self.music_channel.stop()
+            self.streamed = None
+            if preloaded is not None:
+                self.music_channel.play(preloaded, loops=-1)
+            elif not self.preloading:
+                self._stream(track)
+            # otherwise _preload_music starts it when it gets there
+
+    def _stream(self, track):
+        try:
+            pygame.mixer.music.load(os.path.join(MUSIC_DIR, track))
+            pygame.mixer.music.play(-1)
+            self.streamed = track
+        except pygame.error as e:
+            print(f"Warning: could not play music '{track}': {e}")
+
+    def _restart_music(self):
+        sound = self.music_sounds.get(self.current_track)
+        if sound is not None:
+            # a preloaded Sound has no rewind; replaying it costs no I/O
+            self.music_channel.play(sound, loops=-1)
+        elif self.streamed is not None:
+            pygame.mixer.music.play(-1)  # restarts the already-open stream
+
+    def play_level_music(self, level, restart=True):
+        """Music for a level (0-based); call on every reset."""
+        self.play_music(self.track_for(level), restart=restart)
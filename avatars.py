@@ -0,0 +1,83 @@
+#  filename: avatars.py
+#  Avatar catalogue: which avatar images exist, where they are, and their thumbnails
+#
+#  The unlock logic, the start menu's picker and the game all ask this one
+#  catalogue, so the avatar folder is listed once per run and each thumbnail
+#  is scaled once, the first time it is shown.
+
+import os
+
+import asset_cache
+
+AVATAR_DIR = os.path.join("images", "avatar")
+FALLBACK_DIR = "images"  # older saves name avatars that live directly in images/
+DEFAULT_AVATAR = "avatar.png"
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg')
+
+
+class AvatarCatalogue:
+    """name -> path for every avatar, and (path, size) -> scaled surface.
+
+    AVATAR_DIR is listed when the catalogue is made (rescan() lists it
+    again). Names not in it are looked up in FALLBACK_DIR on first use and
+    the answer is kept. Scaled images are built lazily through asset_cache
+    and kept for the rest of the run.
+    """
+
+    def __init__(self, avatar_dir=AVATAR_DIR, fallback_dir=FALLBACK_DIR):
+        self.avatar_dir = avatar_dir
+        self.fallback_dir = fallback_dir
+        self.paths = {}  # name -> path
+        self._images = {}  # (path, size) -> Surface
+        self.rescan()
+
+    def rescan(self):
+        self.paths = {}
+        if os.path.isdir(self.avatar_dir):
+            for fn in sorted(os.listdir(self.avatar_dir)):
+                if fn.lower().endswith(IMAGE_EXTS):
+                    self.paths[fn] = os.path.join(self.avatar_dir, fn)
+        self._unlockable = list(self.paths)
+
+    def unlockable(self):
+        """Names of the avatars in AVATAR_DIR (the ones coins can unlock)."""
+        return list(self._unlockable)
+
+    def path(self, name):
+        """Where the avatar called `name` is, or None if there is no such file."""
+        if name not in self.paths:
+            candidate = os.path.join(self.fallback_dir, name)
+            self.paths[name] = candidate if os.path.isfile(candidate) else None
+        return self.paths[name]
+
+    def __contains__(self, name):
+        return self.path(name) is not None
+
+    def image(self, path, size):
+        """`path` scaled to `size` with alpha; raises pygame.error / OSError if it won't load."""
+        key = (path, tuple(size))
+        img = self._images.get(key)
+        if img is None:
+            img = self._images[key] = asset_cache.load_scaled(path, size, alpha=True)
+        return img
+
+    def thumbnail(self, name, size):
+        """The avatar called `name` as a size x size surface, or None if it doesn't exist."""
+        path = self.path(name)
+        return None if path is None else self.image(path, (size, size))
+
+
+_catalogue = None
+
+
+def catalogue():
+    """The shared catalogue, made on first use."""
+    global _catalogue
+    if _catalogue is None:
+        _catalogue = AvatarCatalogue()
+    return _catalogue
+
+
+def avatar_path(name):
+    """Path of the avatar called `name`, falling back to the default avatar."""
+    return catalogue().path(name) or catalogue().path(DEFAULT_AVATAR)
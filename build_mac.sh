@@ -21,6 +21,9 @@ PYINSTALLER_OPTS+=(--add-data "images:images" --add-data "music:music")
 # Nếu bạn muốn single-file (không khuyến nghị cho pygame), thêm --onefile
 # PYINSTALLER_OPTS+=(--onefile)
 
+# Đóng gói tiles + avatars vào images/atlas.png (game tự dùng file lẻ nếu thiếu)
+python atlas.py
+
 # Chạy PyInstaller
 pyinstaller "${PYINSTALLER_OPTS[@]}" main.py
 
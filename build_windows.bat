@@ -4,6 +4,9 @@ REM Usage: run in Command Prompt with virtualenv activated
 
 set APP_NAME=Jump Rush
 
+REM Pack tiles + avatars into images\atlas.png (the game falls back to single files without it)
+python atlas.py
+
 REM On Windows use ; as separator for --add-data
 pyinstaller --noconfirm --windowed --name "%APP_NAME%" --add-data "images;images" --add-data "music;music" main.py
 
@@ -0,0 +1,50 @@
+#  filename: checkpoint.py
+#  Practice mode: the run state packed into small fixed-size snapshots to respawn from
+
+import struct
+from collections import namedtuple
+
+# everything a respawn needs. x, y: player rect topleft on screen; scroll: how
+# far the tiles had scrolled (TileLayers.scroll); taken: how many coins had been
+# picked up this run (main.py revives the ones after that); coins: the level's
+# coin counter; elapsed: seconds on the level timer; fill: progress bar; angle:
+# player spin
+Snapshot = namedtuple("Snapshot", "x y vel_x vel_y on_ground scroll taken coins elapsed fill angle")
+_LAYOUT = struct.Struct("<iidd?iHHfff")
+SNAPSHOT_SIZE = _LAYOUT.size
+
+
+def pack(snapshot):
+    return _LAYOUT.pack(*snapshot)
+
+
+def unpack(data):
+    return Snapshot._make(_LAYOUT.unpack(data))
+
+
+class Checkpoints:
+    """Stack of packed snapshots, newest last; restoring never pops, so dying
+    again goes back to the same one until it is removed."""
+
+    def __init__(self):
+        self.packed = []
+
+    def __len__(self):
+        return len(self.packed)
+
+    def __iter__(self):
+        return map(unpack, self.packed)
+
+    def place(self, snapshot):
+        self.packed.append(pack(snapshot))
+
+    def remove_last(self):
+        if self.packed:
+            self.packed.pop()
+
+    def last(self):
+        """The newest snapshot, or None if there are none."""
+        return unpack(self.packed[-1]) if self.packed else None
+
+    def clear(self):
+        self.packed.clear()
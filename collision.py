@@ -0,0 +1,360 @@
+#  filename: collision.py
+#  Typed collision layers and the registry that maps level tokens to tiles
+
+import pygame
+
+# collision layers
+SOLID = "solid"      # blocks you stand on (and die against side-on)
+HAZARD = "hazard"    # spikes
+PICKUP = "pickup"    # coins; removed from their layer once collected
+TRIGGER = "trigger"  # orbs
+GOAL = "goal"        # end of level
+DECOR = "decor"      # drawn and scrolled but never collided (trick blocks)
+
+# order in which Player.collide visits the layers
+COLLISION_ORDER = (TRIGGER, GOAL, HAZARD, PICKUP, SOLID)
+ALL_LAYERS = COLLISION_ORDER + (DECOR,)
+
+# level token (as written in level_N.csv) -> TileType
+TILE_TYPES = {}
+
+# layer -> handler(player, sprite, yvel)
+HANDLERS = {}
+
+
+class TileType:
+    """One kind of tile: the sprite class to build, its layer, its image and its
+    collision geometry.
+
+    `image` is a callable so tiles always pick up the current surface (the End
+    tile, for instance, uses whichever avatar was selected in the menu).
+    `hitbox` is a Rect in tile-local coordinates (None means the whole tile) and
+    `use_mask` adds a pixel-exact mask built from the image alpha, clipped to the
+    hitbox. Both are computed once per image surface, not per frame.
+    """
+
+    def __init__(self, token, cls, layer, image, hitbox=None, use_mask=False):
+        self.token = token
+        self.cls = cls
+        self.layer = layer
+        self.image = image
+        self.hitbox = pygame.Rect(hitbox) if hitbox is not None else None
+        self.use_mask = use_mask
+        self.mask = None
+        self._source = None  # image surface the geometry was built from
+
+    def prepare(self):
+        """Return the current image, rebuilding the cached mask if the image changed."""
+        img = self.image()
+        if img is self._source:
+            return img
+        self._source = img
+        self.mask = None
+        if self.use_mask:
+            mask = pygame.mask.from_surface(img)
+            if self.hitbox is not None:
+                box = pygame.mask.Mask(img.get_size())
+                box.draw(pygame.mask.Mask(self.hitbox.size, fill=True), self.hitbox.topleft)
+                mask = mask.overlap_mask(box, (0, 0))
+            self.mask = mask
+        return img
+
+    def spawn(self, pos, layers):
+        sprite = self.cls(self.prepare(), pos, layers.all, layers[self.layer])
+        sprite.tile = self
+        return sprite
+
+    def reuse(self, sprite, pos, layers):
+        """Put a retired sprite of this type back into play at `pos`."""
+        sprite.image = self.prepare()
+        sprite.rect = sprite.image.get_rect(topleft=pos)
+        sprite.add(layers.all, layers[self.layer])
+        return sprite
+
+
+def register_tile(token, cls, layer, image, hitbox=None, use_mask=False):
+    """Register a level token. New tile types only need a call to this."""
+    if layer not in ALL_LAYERS:
+        raise ValueError(f"unknown collision layer: {layer}")
+    tile = TileType(token, cls, layer, image, hitbox, use_mask)
+    tile.prepare()
+    TILE_TYPES[token] = tile
+    return tile
+
+
+def hits(player, sprite, ox=0, oy=0):
+    """Narrow-phase test, run after the rect-vs-rect test has passed.
+
+    Checks the tile's cached hitbox with plain integer comparisons, then its mask
+    against the player's mask. (ox, oy) offsets the player, for testing points
+    along a sweep. Nothing is allocated unless the masks overlap.
+    """
+    tile = sprite.tile
+    r = sprite.rect
+    px = player.rect.x + ox
+    py = player.rect.y + oy
+    hb = tile.hitbox
+    if hb is not None:
+        left = r.x + hb.x
+        top = r.y + hb.y
+        if px + player.rect.w <= left or px >= left + hb.w or py + player.rect.h <= top or py >= top + hb.h:
+            return False
+    if tile.mask is not None:
+        player_mask = getattr(player, "mask", None)
+        if player_mask is not None:
+            return tile.mask.overlap(player_mask, (px - r.x, py - r.y)) is not None
+    return True
+
+
+def _bounds(sprite):
+    """(left, top, width, height) of the part of a tile that can be hit."""
+    r = sprite.rect
+    hb = sprite.tile.hitbox
+    if hb is None:
+        return r.x, r.y, r.w, r.h
+    return r.x + hb.x, r.y + hb.y, hb.w, hb.h
+
+
+def sweep_interval(x, y, w, h, dx, dy, target):
+    """Times in [0, 1] during which box (x, y, w, h) moving by (dx, dy) overlaps
+    the static box `target` (left, top, width, height). Returns (t_enter, t_exit,
+    nx, ny) or None; (nx, ny) is the normal of the face hit first, (0, 0) if the
+    boxes already overlap at t=0.
+    """
+    tl, tt, tw, th = target
+    if dx > 0:
+        tx_enter, tx_exit = (tl - (x + w)) / dx, (tl + tw - x) / dx
+    elif dx < 0:
+        tx_enter, tx_exit = (tl + tw - x) / dx, (tl - (x + w)) / dx
+    elif x + w <= tl or x >= tl + tw:
+        return None
+    else:
+        tx_enter, tx_exit = float("-inf"), float("inf")
+    if dy > 0:
+        ty_enter, ty_exit = (tt - (y + h)) / dy, (tt + th - y) / dy
+    elif dy < 0:
+        ty_enter, ty_exit = (tt + th - y) / dy, (tt - (y + h)) / dy
+    elif y + h <= tt or y >= tt + th:
+        return None
+    else:
+        ty_enter, ty_exit = float("-inf"), float("inf")
+
+    t_enter = max(tx_enter, ty_enter)
+    t_exit = min(tx_exit, ty_exit)
+    # t_enter == t_exit is a corner graze, not an overlap
+    if t_enter >= t_exit or t_exit <= 0 or t_enter > 1:
+        return None
+    if t_enter < 0:
+        return 0.0, min(t_exit, 1.0), 0, 0
+    if tx_enter > ty_enter:
+        return t_enter, min(t_exit, 1.0), (-1 if dx > 0 else 1), 0
+    return t_enter, min(t_exit, 1.0), 0, (-1 if dy > 0 else 1)
+
+
+def handler(layer):
+    """Decorator registering the collision handler for a layer."""
+    def register(fn):
+        HANDLERS[layer] = fn
+        return fn
+    return register
+
+
+class TileLayers:
+    """Sprite groups for a loaded level, one per collision layer.
+
+    `all` holds every tile and is what gets scrolled and drawn; the per-layer
+    groups are what collisions are tested against. Tiles are also indexed by the
+    level column they occupy, so collision tests only look at the few columns
+    around the player instead of every tile in the level.
+
+    Tokens and handlers come from the TILE_TYPES and HANDLERS registries unless
+    other dicts are passed (as the tests do).
+    """
+
+    def __init__(self, tile_size=32, tile_types=None, handlers=None):
+        self.tile_types = TILE_TYPES if tile_types is None else tile_types
+        self.handlers = HANDLERS if handlers is None else handlers
+        self.all = pygame.sprite.Group()
+        self.groups = {layer: pygame.sprite.Group() for layer in ALL_LAYERS}
+        self.tile_size = tile_size
+        self.scroll = 0  # how far the tiles have been scrolled left, in px
+        self.columns = {}  # level column -> tiles touching that column
+        self.retired = 0  # columns left of this have been dropped (streaming mode)
+        self.spare = {}  # TileType -> retired sprites waiting to be reused
+
+    def __getitem__(self, layer):
+        return self.groups[layer]
+
+    def spawn(self, token, pos):
+        """Create the tile for a level token, or return None for empty/unknown tokens."""
+        tile = self.tile_types.get(token)
+        if tile is None:
+            return None
+        spare = self.spare.get(tile)
+        sprite = tile.reuse(spare.pop(), pos, self) if spare else tile.spawn(pos, self)
+        # index in level coordinates (undo any scroll already applied)
+        left = sprite.rect.left + self.scroll
+        for col in range(left // self.tile_size, (left + sprite.rect.w - 1) // self.tile_size + 1):
+            self.columns.setdefault(col, []).append(sprite)
+        return sprite
+
+    def at(self, col, row):
+        """Tiles spawned at level cell (col, row), collected coins included."""
+        ts = self.tile_size
+        return [sprite for sprite in self.columns.get(col, ())
+                if sprite.rect.left + self.scroll == col * ts and sprite.rect.top == row * ts]
+
+    def remove(self, sprite):
+        """Take a tile out of the level for good: kill it and drop it from the column index."""
+        sprite.kill()
+        left = sprite.rect.left + self.scroll
+        for col in range(left // self.tile_size, (left + sprite.rect.w - 1) // self.tile_size + 1):
+            tiles = self.columns.get(col)
+            if tiles and sprite in tiles:
+                tiles.remove(sprite)
+
+    def revive(self, sprite, left):
+        """Put a killed tile (a collected coin) back at level x `left`; it never
+        left the column index, so this is just re-adding it to its groups."""
+        sprite.rect.x = left - self.scroll
+        sprite.add(self.all, self[sprite.tile.layer])
+
+    def scroll_by(self, step):
+        """Move every tile `step` px to the left (the camera follows the player)."""
+        for sprite in self.all:
+            sprite.rect.x -= step
+        self.scroll += step
+
+    def retire_before(self, col):
+        """Drop the level columns left of `col`, killing their tiles once they are
+        fully off screen (a tile spanning several columns lives on in the others).
+        Killed tiles are kept and handed out again by spawn."""
+        while self.retired < col:
+            for sprite in self.columns.pop(self.retired, ()):
+                if sprite.rect.right <= 0 and sprite.alive():
+                    sprite.kill()
+                    self.spare.setdefault(sprite.tile, []).append(sprite)
+            self.retired += 1
+
+    def clear(self):
+        """Unload the level: kill every tile and forget the column index and
+        the spare sprites, so nothing keeps the old level's tiles alive."""
+        for sprite in self.all:
+            sprite.kill()
+        for group in self.groups.values():
+            group.empty()
+        self.columns.clear()
+        self.spare.clear()
+        self.scroll = 0
+        self.retired = 0
+
+    def near(self, rect, dx=0, dy=0):
+        """Live tiles in the columns covered by `rect` swept by (dx, dy)."""
+        left = rect.left + self.scroll + min(dx, 0)
+        right = rect.right + self.scroll + max(dx, 0)
+        found = []
+        seen = set()
+        for col in range(int(left) // self.tile_size, int(right) // self.tile_size + 1):
+            for sprite in self.columns.get(col, ()):
+                if id(sprite) not in seen and sprite.alive():
+                    seen.add(id(sprite))
+                    found.append(sprite)
+        return found
+
+    def draw(self, surface, scale=1, image=None):
+        """Draw the tiles in the columns currently on screen in one batched call.
+
+        With a whole `scale` > 1 the surface is that many times the screen's
+        size and image(tile image) gives each tile's image at that scale.
+        """
+        if scale == 1:
+            view = surface.get_rect()
+            visible = self.near(view)
+            surface.blits([(sprite.image, sprite.rect) for sprite in visible if view.colliderect(sprite.rect)],
+                          doreturn=False)
+            return
+        view = pygame.Rect(0, 0, surface.get_width() // scale, surface.get_height() // scale)
+        surface.blits([(image(sprite.image), (sprite.rect.x * scale, sprite.rect.y * scale))
+                       for sprite in self.near(view) if view.colliderect(sprite.rect)], doreturn=False)
+
+    def collide(self, player, yvel):
+        """Run each layer's handler on every tile of that layer the player overlaps."""
+        candidates = self.near(player.rect)
+        for layer in COLLISION_ORDER:
+            fn = self.handlers.get(layer)
+            if fn is None:
+                continue
+            # The rect test is repeated per tile because handlers move the player.
+            for sprite in candidates:
+                if sprite.tile.layer == layer and player.rect.colliderect(sprite.rect) \
+                        and hits(player, sprite):
+                    fn(player, sprite, yvel)
+
+    def sweep(self, player, dx, dy):
+        """Move the player down by dy while the map scrolls dx px, without tunnelling.
+
+        The player's box is swept through the tile grid (relative to the tiles it
+        moves by (dx, dy)). Non-solid tiles crossed on the way get their handler
+        called once; the first solid face hit stops the motion on that axis, the
+        player is placed against it and the solid handler decides what happens
+        (land, bump head or die). Motion along the other axis continues.
+        """
+        rect = player.rect
+        x, y = float(rect.x), float(rect.y)
+        touched = set()
+        for _ in range(3):
+            if dx == 0 and dy == 0:
+                break
+            candidates = self.near(rect, dx, dy)
+
+            # earliest solid contact
+            t_hit, hit, normal = 1.0, None, (0, 0)
+            for sprite in candidates:
+                if sprite.tile.layer != SOLID:
+                    continue
+                res = sweep_interval(x, y, rect.w, rect.h, dx, dy, _bounds(sprite))
+                if res and (res[2] or res[3]) and res[0] < t_hit:
+                    t_hit, hit, normal = res[0], sprite, (res[2], res[3])
+
+            # everything else crossed before that contact
+            for layer in COLLISION_ORDER:
+                fn = self.handlers.get(layer)
+                if fn is None or layer == SOLID:
+                    continue
+                for sprite in candidates:
+                    if sprite.tile.layer != layer or id(sprite) in touched:
+                        continue
+                    if self._crossed(player, sprite, x, y, dx, dy, t_hit):
+                        touched.add(id(sprite))
+                        fn(player, sprite, dy)
+
+            x += dx * t_hit
+            y += dy * t_hit
+            rect.y = round(y)
+            if hit is None:
+                break
+            fn = self.handlers.get(SOLID)
+            if fn is not None:
+                fn(player, hit, dy if normal[1] else 0)
+            y = float(rect.y)
+            # keep sliding along the face for the rest of the frame
+            remaining = 1.0 - t_hit
+            dx = 0 if normal[0] else dx * remaining
+            dy = 0 if normal[1] else dy * remaining
+
+    def _crossed(self, player, sprite, x, y, dx, dy, t_end):
+        """Did the swept player touch `sprite` between t=0 and t_end?"""
+        rect = player.rect
+        res = sweep_interval(x, y, rect.w, rect.h, dx, dy, _bounds(sprite))
+        if res is None or res[0] > t_end:
+            return False
+        if sprite.tile.mask is None:
+            return True
+        # sample the overlap interval every couple of pixels for the mask test
+        t0, t1 = res[0], min(res[1], t_end)
+        steps = max(1, int(max(abs(dx), abs(dy)) * (t1 - t0) / 2))
+        for i in range(steps + 1):
+            t = t0 + (t1 - t0) * i / steps
+            if hits(player, sprite, round(x + dx * t) - rect.x, round(y + dy * t) - rect.y):
+                return True
+        return False
@@ -0,0 +1,300 @@
+#  filename: endless.py
+#  Endless run: an infinite column stream stitched from seeded, jump-checked chunks
+#
+#  Check a pool from the command line:
+#      python endless.py [--seed N]
+
+import random
+import sys
+import time
+
+from collision import sweep_interval
+from physics import Physics, game_physics
+
+ROWS = 18            # level height in tiles (fills the 600 px window like level_2..5)
+CHUNK_WIDTH = 24     # columns per chunk
+INTRO_WIDTH = 30     # flat run-in at the start of every run
+ENTRY_COLS = 3       # flat columns at base height that start and end every chunk,
+EXIT_COLS = 3        # so any two chunks can be stitched together
+BASE_HEIGHT = 2      # rows of ground at chunk boundaries
+MAX_HEIGHT = 5
+
+TIERS = 4            # difficulty tiers; a run climbs one tier every RAMP_CHUNKS chunks
+RAMP_CHUNKS = 8
+CHUNKS_PER_TIER = 6
+MAX_ATTEMPTS = 20    # generator retries per chunk before falling back to a flat one
+
+EMPTY = "-1"
+BLOCK, SPIKE, COIN, ORB, TRICK = "0", "Spike", "Coin", "Orb", "T"
+
+
+# -------------------- Generation --------------------
+
+def _column(height, spike=False, coin=None, orb=None, trick=None):
+    """One column, top row first. `coin`/`orb`/`trick` are heights above the ground."""
+    col = [EMPTY] * ROWS
+    top = ROWS - height
+    for r in range(top, ROWS):
+        col[r] = BLOCK
+    if spike and height:
+        col[top - 1] = SPIKE
+    for token, above in ((COIN, coin), (ORB, orb), (TRICK, trick)):
+        if above is not None:
+            col[top - above] = token
+    return col
+
+
+def flat_chunk(width=CHUNK_WIDTH):
+    return [_column(BASE_HEIGHT) for _ in range(width)]
+
+
+def make_chunk(rng, tier):
+    """Propose a chunk for a difficulty tier (0 = easiest). Not yet checked."""
+    d = tier / max(TIERS - 1, 1)
+    cols = [_column(BASE_HEIGHT) for _ in range(ENTRY_COLS)]
+    h = BASE_HEIGHT
+    end = CHUNK_WIDTH - EXIT_COLS - 1  # leave room to step back down
+    features = ("run", "spikes", "gap", "step", "orb", "trick")
+    weights = (3 - 2 * d, 1 + 2 * d, 1 + 2 * d, 1 + d, d, 0.5)
+    while len(cols) < end:
+        feature = rng.choices(features, weights)[0]
+        if feature == "run":
+            cols += [_column(h) for _ in range(rng.randint(1, 4))]
+        elif feature == "spikes":
+            n = rng.randint(1, 2 if d >= 0.3 else 1)
+            cols += [_column(h, spike=True, coin=3 if i == n // 2 else None) for i in range(n)]
+            cols.append(_column(h))
+        elif feature == "gap":
+            n = rng.randint(1, 1 + round(2 * d))
+            cols += [_column(0) for _ in range(n)]
+            cols[-1 - n // 2][ROWS - h - 3] = COIN
+            cols.append(_column(h))
+        elif feature == "step":
+            up = rng.randint(1, 2 if d >= 0.5 else 1)
+            h = h + up if h + up <= MAX_HEIGHT else max(1, h - up)
+            cols += [_column(h) for _ in range(rng.randint(2, 4))]
+        elif feature == "orb":
+            # a wide gap with an orb to bounce off halfway across
+            n = rng.randint(3, 4)
+            cols.append(_column(h))
+            cols += [_column(0) for _ in range(n)]
+            cols[-n][ROWS - h - 2] = ORB
+            cols.append(_column(h))
+        elif feature == "trick":
+            cols += [_column(h, trick=rng.randint(3, 4)) for _ in range(rng.randint(2, 3))]
+    cols = cols[:end]
+    cols += [_column(BASE_HEIGHT) for _ in range(CHUNK_WIDTH - len(cols))]
+    return cols
+
+
+# -------------------- Jumpability --------------------
+
+def jumpable(columns, physics):
+    """True if a player running in at base height can reach the far end alive.
+
+    Simulates Player.update frame by frame with the game's gravity, jump speed
+    and scroll speed: the player may jump on any frame it is on the ground, and
+    either keeps the key held for the whole jump (so orbs fire) or lets go.
+    Reaching the exit columns back on the ground at base height counts.
+    A running player only touches the ground every other frame, so the chunk
+    has to be passable from both phases of that.
+    """
+    ts = physics.tile
+    pw = physics.player
+    # token -> level column -> [(row, cell, box it can be hit in)]
+    hitboxes = {BLOCK: (0, 0, ts, ts), SPIKE: physics.spike_hitbox, ORB: (0, 0, ts, ts)}
+    index = {tok: {} for tok in hitboxes}
+    for c, column in enumerate(columns):
+        for r, tok in enumerate(column):
+            if tok in hitboxes:
+                hx, hy, hw, hh = hitboxes[tok]
+                index[tok].setdefault(c, []).append((r, (c, r), (c * ts + hx, r * ts + hy, hw, hh)))
+    solid, spikes, orbs = index[BLOCK], index[SPIKE], index[ORB]
+    floor_y = ROWS * ts
+    base_y = (ROWS - BASE_HEIGHT) * ts - pw
+    goal_x = (len(columns) - EXIT_COLS) * ts
+    speed = physics.speed
+
+    def boxes(index, x, y, dx, dy):
+        """(cell, box) for the tiles in `index` the swept player could touch."""
+        r0 = int(min(y, y + dy)) // ts - 1
+        r1 = int(max(y, y + dy) + pw) // ts
+        for c in range(int(min(x, x + dx)) // ts - 1, int(max(x, x + dx) + pw) // ts + 1):
+            for r, cell, box in index.get(c, ()):
+                if r0 <= r <= r1:
+                    yield cell, box
+
+    def overlaps(x, y, box):
+        left, top, w, h = box
+        return x < left + w and x + pw > left and y < top + h and y + pw > top
+
+    def step(x, y, vy, grounded, jump, held):
+        """One frame of Player.update (collide, then TileLayers.sweep) on the
+        chunk's grid; returns the next (x, y, vy, grounded) or None if the
+        player dies."""
+        if jump and grounded:
+            vy = -physics.jump
+        if not grounded:
+            vy = min(vy + physics.gravity, physics.max_fall)
+        # tiles already overlapped (collide with yvel 0: any solid is side-on)
+        if held:
+            for _, box in boxes(orbs, x, y, 0, 0):
+                if overlaps(x, y, box):
+                    vy = -physics.orb_jump
+        if any(overlaps(x, y, box) for _, box in boxes(spikes, x, y, 0, 0)) or \
+                any(overlaps(x, y, box) for _, box in boxes(solid, x, y, 0, 0)):
+            return None
+        # the swept move, same rules as TileLayers.sweep
+        fx, fy = float(x), float(y)
+        dx, dy = speed, vy
+        ry = y
+        grounded = False
+        touched = set()
+        for _ in range(3):
+            if dx == 0 and dy == 0:
+                break
+            t_hit, hit, normal = 1.0, None, (0, 0)
+            for _, box in boxes(solid, fx, fy, dx, dy):
+                res = sweep_interval(fx, fy, pw, pw, dx, dy, box)
+                if res and (res[2] or res[3]) and res[0] < t_hit:
+                    t_hit, hit, normal = res[0], box, (res[2], res[3])
+            if held:
+                for cell, box in boxes(orbs, fx, fy, dx, dy):
+                    res = sweep_interval(fx, fy, pw, pw, dx, dy, box)
+                    if cell not in touched and res and res[0] <= t_hit:
+                        touched.add(cell)
+                        vy = -physics.orb_jump
+            for _, box in boxes(spikes, fx, fy, dx, dy):
+                res = sweep_interval(fx, fy, pw, pw, dx, dy, box)
+                if res and res[0] <= t_hit:
+                    return None
+            fx += dx * t_hit
+            fy += dy * t_hit
+            ry = round(fy)
+            if hit is None:
+                break
+            if not normal[1] or dy == 0:
+                return None  # ran into the side of a block
+            if dy > 0:
+                ry = hit[1] - pw
+                vy = 0.0
+                grounded = True
+            else:
+                ry = hit[1] + hit[3]
+            fy = float(ry)
+            remaining = 1.0 - t_hit
+            dx = 0 if normal[0] else dx * remaining
+            dy = 0 if normal[1] else dy * remaining
+        return x + speed, ry, vy, grounded
+
+    has_orbs = bool(orbs)
+
+    def reach(start):
+        stack = [start]
+        seen = set()
+        while stack:
+            x, y, vy, grounded, held = stack.pop()
+            key = (x, y, vy, grounded, held)
+            if key in seen:
+                continue
+            seen.add(key)
+            if x >= goal_x and grounded and y == base_y:
+                return True
+            if y > floor_y or x >= len(columns) * ts:
+                continue
+            options = [(False, held)]
+            if grounded:
+                options = [(False, False), (True, False)] + ([(True, True)] if has_orbs else [])
+            for jump, keep in options:
+                nxt = step(x, y, vy, grounded, jump, keep)
+                if nxt is not None:
+                    stack.append(nxt + (keep and not nxt[3],))
+        return False
+
+    x0 = ENTRY_COLS * ts - pw
+    return reach((x0, base_y, 0.0, True, False)) and reach((x0, base_y, 0.0, False, False))
+
+
+# -------------------- Pool and column stream --------------------
+
+class ChunkPool:
+    """CHUNKS_PER_TIER checked chunks per difficulty tier, built once per seed.
+
+    Everything expensive (generation and the jump check) happens here, before
+    the run starts; during the run chunks are only picked and reused.
+    """
+
+    def __init__(self, physics, seed=None):
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+        self.physics = physics
+        self.rejected = 0
+        self.fallbacks = 0
+        rng = random.Random(self.seed)
+        self.tiers = [[self._checked(rng, tier) for _ in range(CHUNKS_PER_TIER)] for tier in range(TIERS)]
+
+    def _checked(self, rng, tier):
+        for _ in range(MAX_ATTEMPTS):
+            chunk = make_chunk(rng, tier)
+            if jumpable(chunk, self.physics):
+                return chunk
+            self.rejected += 1
+        self.fallbacks += 1
+        return flat_chunk()
+
+
+class EndlessColumns:
+    """Infinite column iterator for LevelStreamer: a flat intro, then chunks from
+    the pool, one tier harder every RAMP_CHUNKS chunks.
+
+    Chunks are yielded by reference, so a run of any length holds nothing but
+    the pool; `seed` only decides the order chunks are picked in.
+    """
+
+    def __init__(self, pool, seed=None):
+        self.pool = pool
+        self.rng = random.Random(seed)
+        self.chunks = 0  # chunks handed out so far (not counting the intro)
+        self.intro = flat_chunk(INTRO_WIDTH)
+
+    @property
+    def tier(self):
+        return min(self.chunks // RAMP_CHUNKS, TIERS - 1)
+
+    def __iter__(self):
+        yield from self.intro
+        last = None
+        while True:
+            choices = self.pool.tiers[self.tier]
+            chunk = self.rng.choice(choices)
+            if chunk is last and len(choices) > 1:
+                continue  # never the same chunk twice in a row
+            last = chunk
+            self.chunks += 1
+            yield from chunk
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Build and check an endless-mode chunk pool")
+    parser.add_argument("--seed", type=int, default=None)
+    game = game_physics()
+    parser.add_argument("--gravity", type=float, default=game.gravity)
+    parser.add_argument("--jump", type=float, default=game.jump)
+    parser.add_argument("--speed", type=int, default=game.speed)
+    parser.add_argument("--show", type=int, default=None, metavar="TIER", help="print the chunks of one tier")
+    args = parser.parse_args(argv)
+    t = time.perf_counter()
+    pool = ChunkPool(Physics(args.gravity, args.jump, args.speed), args.seed)
+    print(f"seed {pool.seed}: {TIERS * CHUNKS_PER_TIER} chunks in {time.perf_counter() - t:.2f}s, "
+          f"{pool.rejected} rejected, {pool.fallbacks} flat fallbacks")
+    if args.show is not None:
+        glyph = {EMPTY: " ", BLOCK: "#", SPIKE: "^", COIN: "o", ORB: "@", TRICK: "%"}
+        for chunk in pool.tiers[args.show]:
+            for r in range(ROWS - 8, ROWS):
+                print("".join(glyph[col[r]] for col in chunk))
+            print("-" * CHUNK_WIDTH)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
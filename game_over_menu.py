@@ -3,6 +3,7 @@
 import pygame as pg
 import os
 from typing import Optional, Tuple, Dict
+from scenes import Scene
 
 COLOR_BG_DIM   = (0, 0, 0, 170)
 COLOR_PANEL    = (28, 32, 40)
@@ -16,6 +17,10 @@ BG_CANDIDATES = [
     "images/bg_start.png",
 ]
 
+# processed (scaled + cropped) backgrounds, by screen size; kept across deaths
+_bg_cache: Dict[Tuple[int,int], Optional[pg.Surface]] = {}
+_fonts = []
+
 class Button:
     def __init__(self, rect: pg.Rect, text: str, font: pg.font.Font, on_click):
         self.rect = pg.Rect(rect)
@@ -24,10 +29,15 @@ class Button:
         self.on_click = on_click
         self.hover = False
         self.pressed = False
+        self.dirty = True  # needs drawing (hover state changed)
+        self.label = font.render(text, True, COLOR_TEXT)
 
     def handle(self, event):
         if event.type == pg.MOUSEMOTION:
-            self.hover = self.rect.collidepoint(event.pos)
+            hover = self.rect.collidepoint(event.pos)
+            if hover != self.hover:
+                self.hover = hover
+                self.dirty = True
         elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
             if self.rect.collidepoint(event.pos):
                 self.pressed = True
@@ -42,10 +52,26 @@ class Button:
         border = COLOR_ACCENT if self.hover else COLOR_BORDER
         pg.draw.rect(surf, bg, self.rect, border_radius=radius)
         pg.draw.rect(surf, border, self.rect, width=2, border_radius=radius)
-        label = self.font.render(self.text, True, COLOR_TEXT)
-        surf.blit(label, label.get_rect(center=self.rect.center))
+        surf.blit(self.label, self.label.get_rect(center=self.rect.center))
+        self.dirty = False
+
+def _get_fonts():
+    """Fonts are looked up once and reused by every Game Over screen."""
+    if not _fonts:
+        _fonts.extend([
+            pg.font.SysFont("arial", 48, bold=True),
+            pg.font.SysFont("arial", 24, bold=True),
+            pg.font.SysFont("arial", 28),
+            pg.font.SysFont("arial", 18),
+        ])
+    return _fonts
 
 def _try_load_bg(size: Tuple[int,int]) -> Optional[pg.Surface]:
+    if size not in _bg_cache:
+        _bg_cache[size] = _load_bg(size)
+    return _bg_cache[size]
+
+def _load_bg(size: Tuple[int,int]) -> Optional[pg.Surface]:
     W, H = size
     for path in BG_CANDIDATES:
         if os.path.isfile(path):
@@ -59,100 +85,126 @@ def _try_load_bg(size: Tuple[int,int]) -> Optional[pg.Surface]:
             return img.subsurface(pg.Rect(x, y, W, H)).copy()
     return None
 
-def run_game_over(screen: pg.Surface,
-                  total_score: Optional[int]=None,
-                  best_score: Optional[int]=None,
-                  tip: Optional[str]=None) -> Dict[str, object]:
-    """Modal Game Over UI. Returns {'action': 'retry'|'home'|None, 'quit': bool}"""
-    clock = pg.time.Clock()
+class GameOver(Scene):
+    """Modal Game Over UI. Finishes with {'action': 'retry'|'home'}.
+
+    Fonts, layout and buttons are made on the first visit (again only if the
+    window size changes); each visit only composes the static layer over the
+    last game frame.
+    """
+
+    def __init__(self, on_result=None):
+        super().__init__(on_result)
+        self.size = None
+        self.panel = None
+        self.buttons = []
+        self.static = None
+        self.full = False  # the whole static layer needs presenting (first frame of a visit)
+
+    def _layout(self, size):
+        W, H = self.size = size
+        label_font = _get_fonts()[1]
+
+        # Bố cục bảng
+        panel_w, panel_h = int(W*0.60), int(H*0.50)
+        self.panel = pg.Rect((W-panel_w)//2, (H-panel_h)//2, panel_w, panel_h)
+
+        # Bố cục nút bấm
+        btn_w, btn_h, gap = 220, 56, 24
+        btn_y = self.panel.bottom - btn_h - 24
+        x_center = self.panel.centerx
+        retry_rect = pg.Rect(x_center - btn_w - gap//2, btn_y, btn_w, btn_h)
+        home_rect  = pg.Rect(x_center + gap//2,         btn_y, btn_w, btn_h)
+        self.buttons = [Button(retry_rect, "Retry", label_font, self.do_retry),
+                        Button(home_rect,  "Home",   label_font, self.do_home)]
+
+    def do_retry(self): self.finish({"action": "retry"})
+    def do_home(self):  self.finish({"action": "home"})
+
+    def enter(self, screen: pg.Surface,
+              total_score: Optional[int]=None,
+              best_score: Optional[int]=None,
+              tip: Optional[str]=None):
+        if screen.get_size() != self.size:
+            self._layout(screen.get_size())
+        for b in self.buttons:
+            b.hover = b.pressed = False
+        # Static layers (background, dim, panel, text) are composited once per open
+        self.static = _compose_static(screen, self.panel, *_get_fonts(), total_score, best_score, tip)
+        self.full = True
+
+    def exit(self):
+        self.static = None  # holds a copy of the last game frame
+
+    def active(self):
+        # frame rate only while a button is hovered; otherwise sleep until input
+        return any(b.hover for b in self.buttons)
+
+    def handle(self, event):
+        for b in self.buttons:
+            b.handle(event)
+        if event.type == pg.KEYDOWN:
+            if event.key == pg.K_SPACE or event.key == pg.K_r:
+                self.do_retry()
+            elif event.key == pg.K_h or event.key == pg.K_ESCAPE:
+                self.do_home()
+
+    def draw(self, screen: pg.Surface):
+        if self.full:
+            self.full = False
+            screen.blit(self.static, (0, 0))
+            for b in self.buttons: b.draw(screen)
+            return True
+        # Only buttons whose hover state changed are redrawn (over the static layer)
+        dirty = [b.rect for b in self.buttons if b.dirty]
+        for b in self.buttons:
+            if b.dirty:
+                screen.blit(self.static, b.rect, b.rect)
+                b.draw(screen)
+        return dirty
+
+def _compose_static(screen: pg.Surface, panel: pg.Rect, title_font, label_font, value_font,
+                    small_font, total_score, best_score, tip) -> pg.Surface:
+    """Everything in the modal except the buttons, drawn into one surface."""
     W, H = screen.get_size()
-    title_font = pg.font.SysFont("arial", 48, bold=True)
-    label_font = pg.font.SysFont("arial", 24, bold=True)
-    value_font = pg.font.SysFont("arial", 28)
-    small_font = pg.font.SysFont("arial", 18)
-
-    result = {"action": None, "quit": False}
-
-    # Bố cục bảng
-    panel_w, panel_h = int(W*0.60), int(H*0.50)
-    panel = pg.Rect((W-panel_w)//2, (H-panel_h)//2, panel_w, panel_h)
-
-    # Bố cục nút bấm
-    btn_w, btn_h, gap = 220, 56, 24
-    btn_y = panel.bottom - btn_h - 24
-    x_center = panel.centerx
-    retry_rect = pg.Rect(x_center - btn_w - gap//2, btn_y, btn_w, btn_h)
-    home_rect  = pg.Rect(x_center + gap//2,         btn_y, btn_w, btn_h)
-
-    def do_retry(): result["action"] = "retry"
-    def do_home():  result["action"] = "home"
-    retry_btn = Button(retry_rect, "Retry", label_font, do_retry)
-    home_btn  = Button(home_rect,  "Home",   label_font, do_home)
-    buttons = [retry_btn, home_btn]
-
-    # Hình nền (tùy chọn)
-    bg_img = _try_load_bg((W, H))
+    surf = screen.copy()  # dim over the last game frame if there is no background
 
-    t = 0.0
-    running = True
-    while running:
-        dt = clock.tick(60) / 1000.0
-        t += dt
-        for event in pg.event.get():
-            if event.type == pg.QUIT:
-                result["quit"] = True
-                return result
-            for b in buttons:
-                b.handle(event)
-            if event.type == pg.KEYDOWN:
-                if event.key == pg.K_SPACE or event.key == pg.K_r:
-                    do_retry()
-                elif event.key == pg.K_h or event.key == pg.K_ESCAPE:
-                    do_home()
-
-        if result["action"] is not None:
-            return result
-
-        # --- Hình nền ---
-        if bg_img:
-            screen.blit(bg_img, (0, 0))
+    # --- Hình nền ---
+    bg_img = _try_load_bg((W, H))
+    if bg_img:
+        surf.blit(bg_img, (0, 0))
     # Lớp phủ làm mờ
-        dim = pg.Surface((W, H), pg.SRCALPHA); dim.fill(COLOR_BG_DIM)
-        screen.blit(dim, (0, 0))
+    dim = pg.Surface((W, H), pg.SRCALPHA); dim.fill(COLOR_BG_DIM)
+    surf.blit(dim, (0, 0))
 
     # Bảng
-        pg.draw.rect(screen, COLOR_PANEL, panel, border_radius=18)
-        pg.draw.rect(screen, COLOR_BORDER, panel, width=2, border_radius=18)
+    pg.draw.rect(surf, COLOR_PANEL, panel, border_radius=18)
+    pg.draw.rect(surf, COLOR_BORDER, panel, width=2, border_radius=18)
 
     # Thanh nổi bật phía trên
-        bar1 = pg.Rect(panel.left+16, panel.top+16, panel.width-32, 6)
-        pg.draw.rect(screen, COLOR_ACCENT, bar1, border_radius=3)
-        pg.draw.rect(screen, COLOR_ACCENT_2, bar1.inflate(18, 0), width=2, border_radius=4)
+    bar1 = pg.Rect(panel.left+16, panel.top+16, panel.width-32, 6)
+    pg.draw.rect(surf, COLOR_ACCENT, bar1, border_radius=3)
+    pg.draw.rect(surf, COLOR_ACCENT_2, bar1.inflate(18, 0), width=2, border_radius=4)
 
     # Tiêu đề
-        title = title_font.render("GAME OVER", True, COLOR_TEXT)
-        screen.blit(title, title.get_rect(midtop=(panel.centerx, panel.top+40)))
+    title = title_font.render("GAME OVER", True, COLOR_TEXT)
+    surf.blit(title, title.get_rect(midtop=(panel.centerx, panel.top+40)))
 
     # Điểm số
-        y = panel.top + 120
-        if total_score is not None:
-            label = label_font.render("Total Score", True, COLOR_SUB)
-            val   = value_font.render(str(total_score), True, COLOR_TEXT)
-            screen.blit(label, label.get_rect(midtop=(panel.centerx, y))); y += 30
-            screen.blit(val, val.get_rect(midtop=(panel.centerx, y))); y += 40
-        if best_score is not None:
-            label = label_font.render("Best", True, COLOR_SUB)
-            val   = value_font.render(str(best_score), True, COLOR_TEXT)
-            screen.blit(label, label.get_rect(midtop=(panel.centerx, y))); y += 30
-            screen.blit(val, val.get_rect(midtop=(panel.centerx, y))); y += 30
+    y = panel.top + 120
+    if total_score is not None:
+        label = label_font.render("Total Score", True, COLOR_SUB)
+        val   = value_font.render(str(total_score), True, COLOR_TEXT)
+        surf.blit(label, label.get_rect(midtop=(panel.centerx, y))); y += 30
+        surf.blit(val, val.get_rect(midtop=(panel.centerx, y))); y += 40
+    if best_score is not None:
+        label = label_font.render("Best", True, COLOR_SUB)
+        val   = value_font.render(str(best_score), True, COLOR_TEXT)
+        surf.blit(label, label.get_rect(midtop=(panel.centerx, y))); y += 30
+        surf.blit(val, val.get_rect(midtop=(panel.centerx, y))); y += 30
 
     # Mẹo
-        if tip:
-            tip_s = small_font.render(tip, True, COLOR_SUB)
-            screen.blit(tip_s, tip_s.get_rect(midbottom=(panel.centerx, panel.bottom-88)))
-
-    # Các nút bấm
-        for b in buttons: b.draw(screen)
-
-    # (Đã xóa) gợi ý phím tắt ở dưới cùng
-        pg.display.flip()
+    if tip:
+        tip_s = small_font.render(tip, True, COLOR_SUB)
+        surf.blit(tip_s, tip_s.get_rect(midbottom=(panel.centerx, panel.bottom-88)))
+    return surf
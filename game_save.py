@@ -1,17 +1,82 @@
 #  filename: game_save.py
 #  Persistent save system for game progress
 
+import atexit
 import json
 import os
 
 SAVE_FILE = "game_save.json"
 
+# Storage backend: "json" (single player, game_save.json) or "sqlite" (many
+# local profiles in save_store.DB_FILE). JUMP_RUSH_PROFILE picks the profile.
+SAVE_BACKEND = os.environ.get("JUMP_RUSH_SAVE_BACKEND", "json")
+PROFILE_NAME = os.environ.get("JUMP_RUSH_PROFILE", "Player")
+
+# Venue score server ("host:port", see score_server.py). Unset: scores stay on this machine.
+SCORE_SERVER = os.environ.get("JUMP_RUSH_SCORE_SERVER")
+
+DEFAULT_AVATARS = ["avatar.png", "Blue Lightning.png", "Clown.png", "Green Eye.png"]  # Default avatars always unlocked
+
+_store = None
+_score_client = None
+
+def _get_store():
+    """Open the SQLite store on first use, importing game_save.json if the database is new."""
+    global _store
+    if _store is None:
+        import save_store
+        is_new = not os.path.exists(save_store.DB_FILE)
+        _store = save_store.SaveStore(save_store.DB_FILE, default_avatars=DEFAULT_AVATARS)
+        if is_new and os.path.exists(SAVE_FILE):
+            try:
+                _store.import_json(SAVE_FILE)
+            except Exception as e:
+                print(f"Error importing {SAVE_FILE}: {e}")
+    return _store
+
+def _use_sqlite():
+    return SAVE_BACKEND == "sqlite"
+
+def _share_score(name, level_num, time_taken, coins=None):
+    """Queue a result for the score server, if one is configured. Never waits on the network."""
+    global _score_client, SCORE_SERVER
+    if not SCORE_SERVER:
+        return
+    if _score_client is None:
+        from score_client import ScoreClient
+        host, _, port = SCORE_SERVER.rpartition(":")
+        try:
+            _score_client = ScoreClient(host or "localhost", int(port))
+        except ValueError:
+            print(f"Error: JUMP_RUSH_SCORE_SERVER should be host:port, not {SCORE_SERVER!r}")
+            SCORE_SERVER = None
+            return
+        atexit.register(_score_client.close)
+    _score_client.submit(name, level_num, time_taken, coins)
+
+def set_active_profile(name):
+    """Switch the player profile used by the save functions"""
+    global PROFILE_NAME
+    PROFILE_NAME = name
+    if _use_sqlite():
+        _get_store().ensure_profile(name)
+    else:
+        data = load_game_data()
+        data["player_name"] = name
+        save_game_data(data)
+
 def load_game_data():
     """Load saved game data or return defaults"""
+    if _use_sqlite():
+        store = _get_store()
+        data = store.load_profile(PROFILE_NAME)
+        data["high_scores"] = store.high_scores()  # shared by every profile in the database
+        return data
+
     default_data = {
         "player_name": "Player",
         "total_coins": 0,
-        "unlocked_avatars": ["avatar.png", "Blue Lightning.png", "Clown.png", "Green Eye.png"],  # Default avatars always unlocked
+        "unlocked_avatars": list(DEFAULT_AVATARS),
         "completed_levels": [],
         "best_times": {},
         "selected_avatar": "avatar.png",
@@ -37,7 +102,20 @@ def load_game_data():
         return default_data
 
 def save_game_data(data):
-    """Save game data to file"""
+    """Save game data to file.
+
+    With the sqlite backend this sets the profile's coins to data["total_coins"]
+    (for spending or resetting them), undoing coins other instances added since
+    data was loaded; changes that leave the coins alone have their own
+    functions (select_avatar, complete_level, set_best_time, ...).
+    """
+    if _use_sqlite():
+        try:
+            _get_store().save_profile(data)
+            return True
+        except Exception as e:
+            print(f"Error saving game data: {e}")
+            return False
     try:
         with open(SAVE_FILE, 'w') as f:
             json.dump(data, f, indent=2)
@@ -48,6 +126,19 @@ def save_game_data(data):
 
 def add_coins(amount):
     """Add coins and check for avatar unlocks"""
+    if _use_sqlite():
+        # Hot path: one atomic increment instead of a full profile load/save.
+        # Returns only the keys callers read: total_coins and new_unlock.
+        store = _get_store()
+        old_coins, new_coins = store.add_coins(PROFILE_NAME, amount)
+        unlocked_avatar = None
+        if old_coins < 15 and new_coins >= 15:
+            unlocked = {"unlocked_avatars": store.load_profile(PROFILE_NAME)["unlocked_avatars"]}
+            unlocked_avatar = unlock_random_avatar(unlocked)
+            if unlocked_avatar:
+                store.unlock_avatar(PROFILE_NAME, unlocked_avatar)
+        return {"total_coins": new_coins, "new_unlock": unlocked_avatar}
+
     data = load_game_data()
     old_coins = data["total_coins"]
     data["total_coins"] += amount
@@ -64,18 +155,10 @@ def add_coins(amount):
 def unlock_random_avatar(data):
     """Unlock a random avatar from available avatars"""
     import random
-    
-    # Get all available avatar files
-    avatar_dir = os.path.join("images", "avatar")
-    all_avatars = []
-    
-    if os.path.isdir(avatar_dir):
-        for fn in os.listdir(avatar_dir):
-            if fn.lower().endswith(('.png', '.jpg', '.jpeg')):
-                all_avatars.append(fn)
-    
+    from avatars import catalogue
+
     # Find avatars not yet unlocked
-    locked_avatars = [av for av in all_avatars if av not in data["unlocked_avatars"]]
+    locked_avatars = [av for av in catalogue().unlockable() if av not in data["unlocked_avatars"]]
     
     if locked_avatars:
         # Unlock a random avatar
@@ -87,12 +170,22 @@ def unlock_random_avatar(data):
 
 def complete_level(level_num, time_taken):
     """Mark a level as completed and update high scores."""
+    if _use_sqlite():
+        # High scores are leaderboard queries over the profiles, so recording
+        # the completion and the time is all that needs writing.
+        store = _get_store()
+        store.complete_level(PROFILE_NAME, level_num)
+        store.set_best_time(PROFILE_NAME, level_num, time_taken)
+        _share_score(PROFILE_NAME, level_num, time_taken, store.get_total_coins(PROFILE_NAME))
+        return load_game_data()
+
     data = load_game_data()
     if level_num not in data["completed_levels"]:
         data["completed_levels"].append(level_num)
     
     update_high_scores(data, level_num, time_taken)
     save_game_data(data)
+    _share_score(data.get("player_name", "Player"), level_num, time_taken, data.get("total_coins", 0))
     return data
 
 def update_high_scores(data, level_num, time_taken):
@@ -123,6 +216,28 @@ def update_high_scores(data, level_num, time_taken):
         time_scores.append({"name": player_name, "time": time_taken})
     data["high_scores"]["times"][level_str] = sorted(time_scores, key=lambda x: x["time"])[:10]
 
+def uses_profiles():
+    """True if the save holds many profiles the player can switch between (the sqlite backend)."""
+    return _use_sqlite()
+
+def get_profile_names():
+    """Names of the profiles saved so far, always including the active one"""
+    if _use_sqlite():
+        names = _get_store().profile_names()
+        return names if PROFILE_NAME in names else sorted(names + [PROFILE_NAME])
+    return [load_game_data().get("player_name", "Player")]
+
+def get_active_profile():
+    if _use_sqlite():
+        return PROFILE_NAME
+    return load_game_data().get("player_name", "Player")
+
+def get_high_scores():
+    """Coin and per-level time leaderboards: {"coins": [...], "times": {level: [...]}}"""
+    if _use_sqlite():
+        return _get_store().high_scores()
+    return load_game_data()["high_scores"]
+
 def get_unlocked_avatars():
     """Get list of unlocked avatar filenames"""
     data = load_game_data()
@@ -130,6 +245,8 @@ def get_unlocked_avatars():
 
 def get_total_coins():
     """Get total coins collected"""
+    if _use_sqlite():
+        return _get_store().get_total_coins(PROFILE_NAME)
     data = load_game_data()
     return data["total_coins"]
 
@@ -151,8 +268,21 @@ def get_selected_avatar():
     # Default to first unlocked avatar
     return data["unlocked_avatars"][0] if data["unlocked_avatars"] else "avatar.png"
 
+def select_avatar(avatar):
+    """Make `avatar` the one the player starts with"""
+    if _use_sqlite():
+        _get_store().select_avatar(PROFILE_NAME, avatar)
+        return
+    data = load_game_data()
+    data["selected_avatar"] = avatar
+    save_game_data(data)
+
 def set_best_time(level_num, time_taken):
-    """Set the best time for a level if it's better than current"""
+    """Set the best time for a level if it's better than current (only locally:
+    complete_level, which follows on a win, sends the result to the score server)"""
+    if _use_sqlite():
+        _get_store().set_best_time(PROFILE_NAME, level_num, time_taken)
+        return
     data = load_game_data()
     if 'best_times' not in data:
         data['best_times'] = {}
@@ -0,0 +1,302 @@
+#  filename: ghosts.py
+#  Ghost race: recorded runs replayed next to the player, dozens at a time
+#
+#  A run is stored as the jump key, one bit per frame, in ghosts/<kind>/:
+#      ghosts/best/     this player's best run on each level (written by the game)
+#      ghosts/friends/  runs copied over from friends
+#      ghosts/top/      leaderboard runs
+#  File names start with the level file's name (level_1_anything.ghost).
+#
+#  Check how fast a race of N ghosts is simulated and drawn:
+#      python ghosts.py level_1.csv [--ghosts 64]
+
+import os
+import struct
+import sys
+import zlib
+from collections import namedtuple
+
+import numpy as np
+import pygame
+
+import asset_cache
+from vec_env import VecJumpEnv, START
+
+GHOST_DIR = "ghosts"
+KINDS = ("best", "friends", "top")
+GHOST_EXT = ".ghost"
+TRACK_DIR = os.path.join(GHOST_DIR, ".tracks")  # simulated runs, so each ghost is only simulated once
+MAX_GHOSTS = 64          # most ghosts raced at once (the best runs are kept)
+GHOST_ALPHA = 110
+TINTS = {"best": (255, 210, 60), "friends": (90, 200, 255), "top": (255, 255, 255)}
+ROTATION_STEP = 15       # degrees between the pre-rotated ghost images
+SPIN = -8.1712           # degrees per frame while jumping, as main.py turns the player
+
+MAGIC = b"JRGHOST1\n"
+# level checksum (level_manifest), frames, won, name length; then the name and the packed inputs
+HEADER = struct.Struct("<IIBH")
+
+Ghost = namedtuple("Ghost", "name kind checksum frames won inputs")  # inputs: uint8 0/1 per frame
+
+
+def save_ghost(path, name, checksum, inputs, won):
+    data = name.encode("utf-8")[:255]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(checksum or 0, len(inputs), bool(won), len(data)))
+        f.write(data)
+        f.write(np.packbits(np.frombuffer(bytes(inputs), dtype=np.uint8).astype(bool)).tobytes())
+    os.replace(tmp, path)
+
+
+def load_ghost(path, kind="best"):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a ghost file")
+        checksum, frames, won, name_len = HEADER.unpack(f.read(HEADER.size))
+        name = f.read(name_len).decode("utf-8", "replace")
+        bits = np.frombuffer(f.read((frames + 7) // 8), dtype=np.uint8)
+    if len(bits) * 8 < frames:
+        raise ValueError(f"{path} is cut short")
+    return Ghost(name, kind, checksum, frames, bool(won), np.unpackbits(bits)[:frames])
+
+
+def best_path(level_file):
+    return os.path.join(GHOST_DIR, "best", _stem(level_file) + GHOST_EXT)
+
+
+def _stem(level_file):
+    return os.path.splitext(os.path.basename(level_file))[0]
+
+
+def find_ghosts(level_file, checksum, limit=MAX_GHOSTS):
+    """The `limit` best runs recorded on this version of the level, from every kind."""
+    stem = _stem(level_file)
+    found = []
+    for kind in KINDS:
+        folder = os.path.join(GHOST_DIR, kind)
+        if not os.path.isdir(folder):
+            continue
+        for fn in sorted(os.listdir(folder)):
+            if not (fn.endswith(GHOST_EXT) and (fn == stem + GHOST_EXT or fn.startswith(stem + "_"))):
+                continue
+            try:
+                ghost = load_ghost(os.path.join(folder, fn), kind)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Warning: skipping ghost {fn}: {e}")
+                continue
+            if checksum is None or ghost.checksum == checksum:  # runs on an edited level won't replay
+                found.append(ghost)
+    found.sort(key=lambda g: (g.won, g.frames), reverse=True)
+    return found[:limit]
+
+
+class Recorder:
+    """The jump key for every frame of the current attempt."""
+
+    def __init__(self):
+        self.inputs = bytearray()
+        self.spoiled = False  # a debug mode was on, so the run can't be replayed
+
+    def clear(self):
+        self.inputs.clear()
+        self.spoiled = False
+
+    def record(self, held):
+        self.inputs.append(1 if held else 0)
+
+    def save_if_best(self, level_file, checksum, name, won):
+        """Keep this attempt as the level's best ghost if it got further than
+        the one saved (a win beats any death). Returns True if it was saved."""
+        if self.spoiled or not self.inputs:
+            return False
+        path = best_path(level_file)
+        try:
+            best = load_ghost(path)
+            if best.checksum == checksum and (best.won, best.frames) >= (won, len(self.inputs)):
+                return False
+        except (OSError, ValueError, struct.error):
+            pass
+        try:
+            save_ghost(path, name, checksum, self.inputs, won)
+        except OSError as e:
+            print(f"Error saving ghost: {e}")
+            return False
+        return True
+
+
+def simulate(level, ghosts, physics=None):
+    """Every ghost's run worked out up front, all of them in lockstep on one
+    VecJumpEnv (one copy of the level's collision data for the whole race).
+
+    Returns one (x, y, turns) per ghost: arrays with entry f the state after
+    f frames, up to and including the frame it died or won on (turns indexes
+    the pre-rotated images, 0 = upright).
+    """
+    n = len(ghosts)
+    frames = max(g.frames for g in ghosts)
+    env = VecJumpEnv(level, n, physics, max_steps=frames + 1)
+    env.reset()
+    held = np.zeros((frames, n), dtype=bool)
+    for i, g in enumerate(ghosts):
+        held[:g.frames, i] = g.inputs
+    xs = np.empty((frames + 1, n), dtype=np.float32)
+    ys = np.empty((frames + 1, n), dtype=np.float32)
+    turns = np.zeros((frames + 1, n), dtype=np.int16)
+    end = np.array([g.frames for g in ghosts])
+    xs[0], ys[0] = START
+    jumping = np.zeros(n, dtype=bool)
+    spin = np.zeros(n)
+    steps = 360 // ROTATION_STEP
+    for f in range(frames):
+        jumping |= held[f]
+        _, _, _, info = env.step(held[f])
+        jumping &= ~env.grounded
+        spin[jumping] += SPIN
+        turns[f + 1] = np.where(jumping, np.round(spin / ROTATION_STEP).astype(np.int64) % steps, 0)
+        finished = info["died"] | info["won"]
+        # the env has already put finished players back at the start: they stay
+        # where they were a frame earlier for the frame they finish on
+        xs[f + 1] = np.where(finished, xs[f], env.x)
+        ys[f + 1] = np.where(finished, ys[f], env.y)
+        end[finished & (end > f + 1)] = f + 1
+        if (end <= f + 1).all():
+            break
+    return [(xs[:e + 1, i].copy(), ys[:e + 1, i].copy(), turns[:e + 1, i].copy()) for i, e in enumerate(end)]
+
+
+def _track_path(ghost, physics=None):
+    key = zlib.crc32(np.ascontiguousarray(ghost.inputs, dtype=np.uint8).tobytes())
+    if physics is not None:
+        key = zlib.crc32(repr(sorted(vars(physics).items())).encode(), key)
+    return os.path.join(TRACK_DIR, f"{ghost.checksum:08x}_{key:08x}_{ghost.frames}.npz")
+
+
+def tracks(level, ghosts, physics=None, cache=True):
+    """simulate(), but each ghost's track is kept in TRACK_DIR, so a ghost is
+    only ever simulated once per version of the level and physics."""
+    found = [None] * len(ghosts)
+    todo = []
+    for i, ghost in enumerate(ghosts):
+        if cache:
+            try:
+                with np.load(_track_path(ghost, physics)) as track:
+                    found[i] = (track["x"], track["y"], track["turns"])
+                continue
+            except (OSError, ValueError, KeyError):
+                pass
+        todo.append(i)
+    if todo:
+        for i, track in zip(todo, simulate(level, [ghosts[i] for i in todo], physics)):
+            found[i] = track
+            if cache:
+                try:
+                    os.makedirs(TRACK_DIR, exist_ok=True)
+                    np.savez(_track_path(ghosts[i], physics), x=track[0], y=track[1], turns=track[2])
+                except OSError as e:
+                    print(f"Warning: could not cache ghost track: {e}")
+    return found
+
+
+class GhostRace:
+    """Draws every ghost on a level each frame from precomputed trajectories.
+
+    Per frame this is a few array operations to find which ghosts are alive
+    and on screen and one Surface.blits() call; the translucent, tinted,
+    rotated images are made once per (kind, angle) and shared by all ghosts.
+    """
+
+    def __init__(self, level, ghosts, image, physics=None, cache=True):
+        self.ghosts = ghosts
+        self.kinds = np.array([KINDS.index(g.kind) for g in ghosts], dtype=np.int64)
+        found = tracks(level, ghosts, physics, cache)
+        self.end = np.array([len(x) - 1 for x, _, _ in found])
+        self.frames = int(self.end.max())
+        # (frames + 1, n), each ghost held at its last position after it finishes
+        self.x = np.empty((self.frames + 1, len(ghosts)), dtype=np.float32)
+        self.y = np.empty_like(self.x)
+        self.turns = np.zeros(self.x.shape, dtype=np.int16)
+        for i, (x, y, turns) in enumerate(found):
+            self.x[:len(x), i], self.x[len(x):, i] = x, x[-1]
+            self.y[:len(y), i], self.y[len(y):, i] = y, y[-1]
+            self.turns[:len(turns), i] = turns
+        self.half = image.get_width() / 2
+        self._source = image
+        self._images = {}  # (kind index, turn, scale) -> (surface, offset to its top-left from the centre)
+        self._base = {(kind, 1): self._tinted(image, TINTS[kind]) for kind in KINDS}
+
+    @staticmethod
+    def _tinted(image, color):
+        img = image.convert_alpha() if pygame.display.get_surface() else image.copy()
+        img.fill(color + (GHOST_ALPHA,), special_flags=pygame.BLEND_RGBA_MULT)
+        return img
+
+    def _image(self, kind, turn, scale=1):
+        key = (kind, turn, scale)
+        entry = self._images.get(key)
+        if entry is None:
+            base = (KINDS[kind], scale)
+            if base not in self._base:
+                self._base[base] = self._tinted(asset_cache.rescale(self._source, scale), TINTS[KINDS[kind]])
+            img = self._base[base]
+            if turn:
+                img = pygame.transform.rotozoom(img, turn * ROTATION_STEP, 1)
+            entry = self._images[key] = (img, (-img.get_width() / 2, -img.get_height() / 2))
+        return entry
+
+    def draw(self, surf, frame, scroll, scale=1):
+        """Draw the ghosts as they were `frame` frames into their runs, with the level scrolled by `scroll`
+        (on a surface `scale` times the screen's size, with ghosts as large)."""
+        if frame > self.frames:
+            return 0
+        cx = self.x[frame] + self.half - scroll
+        cy = self.y[frame] + self.half
+        show = np.flatnonzero((frame <= self.end) & (cx > -self.half) & (cx < surf.get_width() / scale + self.half))
+        if not len(show):
+            return 0
+        image = self._image
+        seq = []
+        for kind, turn, x, y in zip(self.kinds[show].tolist(), self.turns[frame, show].tolist(),
+                                    cx[show].tolist(), cy[show].tolist()):
+            img, (ox, oy) = image(kind, turn, scale)
+            seq.append((img, (x * scale + ox, y * scale + oy)))
+        surf.blits(seq, doreturn=False)
+        return len(seq)
+
+
+def main(argv=None):
+    import argparse
+    import time
+    from vec_env import game_physics, load_grid
+    parser = argparse.ArgumentParser(description="Time a ghost race with random runs")
+    parser.add_argument("level")
+    parser.add_argument("--ghosts", type=int, default=MAX_GHOSTS)
+    parser.add_argument("--jump", type=float, default=0.08, help="chance of holding jump each frame")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    grid = load_grid(args.level)
+    frames = int(grid.shape[1] * 32 / game_physics().speed)
+    rng = np.random.default_rng(0)
+    ghosts = [Ghost(f"bot {i}", KINDS[i % len(KINDS)], 0, frames, False,
+                    (rng.random(frames) < args.jump).astype(np.uint8)) for i in range(args.ghosts)]
+    image = pygame.Surface((20, 20), pygame.SRCALPHA)
+    image.fill((200, 60, 200, 255))
+    t = time.perf_counter()
+    race = GhostRace(grid, ghosts, image, cache=False)
+    setup = time.perf_counter() - t
+    t = time.perf_counter()
+    drawn = 0
+    for f in range(race.frames + 1):
+        drawn += race.draw(screen, f, race.x[f].min() - START[0])
+    per_frame = (time.perf_counter() - t) / (race.frames + 1)
+    print(f"{args.ghosts} ghosts, {race.frames} frames: simulated in {setup:.2f}s, "
+          f"{per_frame * 1000:.3f} ms per frame drawing {drawn / (race.frames + 1):.1f} on average")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
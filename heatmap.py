@@ -0,0 +1,124 @@
+#  filename: heatmap.py
+#  Where players die: death and coin heatmaps from telemetry.bin, drawn over a level preview
+#
+#      python heatmap.py level_1.csv [--log telemetry.bin] [--level 0] [-o level_1_heatmap.png]
+
+import os
+import re
+import sys
+
+import numpy as np
+import pygame
+
+from telemetry import TELEMETRY_FILE, MAGIC, DEATH, COIN, WIN
+from vec_env import load_grid, EMPTY, SOLID, SPIKE, COIN as COIN_TILE, ORB, END
+
+# telemetry.RECORD as a NumPy record
+RECORD_DTYPE = np.dtype([("event", "u1"), ("level", "u1"), ("column", "<u4"),
+                         ("y", "<i2"), ("frame", "<u4"), ("attempt", "<u4")])
+CHUNK = 1 << 20       # records aggregated at a time
+TILE_SIZE = 32
+PLAYER_HALF = 10
+CELL = 8              # preview pixels per tile
+BAR_HEIGHT = 60       # per-column bar chart under the preview, one for deaths and one for coins
+PALETTE = np.zeros((256, 3), dtype=np.uint8)
+PALETTE[[EMPTY, SOLID, SPIKE, COIN_TILE, ORB, END]] = [
+    (24, 26, 34), (110, 116, 130), (170, 90, 90), (240, 200, 40), (240, 240, 110), (60, 200, 90)]
+DEATH_COLOR = np.array((255, 40, 40))
+COIN_COLOR = np.array((250, 210, 50))
+
+
+def load_records(path=TELEMETRY_FILE):
+    """Every record in the log as a structured array. It is memory-mapped, so
+    the file is paged in as it is read instead of loaded up front."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a telemetry file")
+    count = (os.path.getsize(path) - len(MAGIC)) // RECORD_DTYPE.itemsize  # a torn last record is dropped
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=len(MAGIC), shape=(count,))
+
+
+def aggregate(records, level, shape):
+    """Per-cell (rows, cols) counts of deaths and of coin pickups on one level, and the number of wins."""
+    rows, cols = shape
+    deaths = np.zeros(rows * cols, dtype=np.int64)
+    coins = np.zeros(rows * cols, dtype=np.int64)
+    wins = 0
+    for start in range(0, len(records), CHUNK):
+        chunk = records[start:start + CHUNK]
+        chunk = chunk[chunk["level"] == level]
+        # the player's centre, clamped so falls off the bottom land on the last row
+        r = np.clip((chunk["y"].astype(np.int64) + PLAYER_HALF) // TILE_SIZE, 0, rows - 1)
+        c = np.minimum(chunk["column"].astype(np.int64), cols - 1)
+        cell = r * cols + c
+        event = chunk["event"]
+        deaths += np.bincount(cell[event == DEATH], minlength=rows * cols)
+        coins += np.bincount(cell[event == COIN], minlength=rows * cols)
+        wins += int(np.count_nonzero(event == WIN))
+    return deaths.reshape(shape), coins.reshape(shape), wins
+
+
+def _bars(counts, color):
+    """BAR_HEIGHT x (cols * CELL) RGB bar chart of per-column counts."""
+    heights = np.ceil(counts / max(counts.max(), 1) * BAR_HEIGHT).astype(np.int64)
+    filled = np.arange(BAR_HEIGHT)[:, None] >= BAR_HEIGHT - heights[None, :]
+    img = np.where(filled[:, :, None], color, 16).astype(np.uint8)
+    return np.repeat(img, CELL, axis=1)
+
+
+def render(grid, deaths, coins):
+    """RGB image (height, width, 3): the level with deaths glowing red, then
+    per-column bars of deaths and of coin pickups."""
+    level = PALETTE[grid].astype(np.float64)
+    heat = np.sqrt(deaths / max(deaths.max(), 1))[:, :, None]  # sqrt: rare deaths stay visible
+    level = level * (1 - 0.85 * heat) + DEATH_COLOR * 0.85 * heat
+    level = np.repeat(np.repeat(level.astype(np.uint8), CELL, axis=0), CELL, axis=1)
+    gap = np.zeros((4, level.shape[1], 3), dtype=np.uint8)
+    return np.concatenate((level, gap, _bars(deaths.sum(axis=0), DEATH_COLOR), gap,
+                           _bars(coins.sum(axis=0), COIN_COLOR)))
+
+
+def save_image(img, path):
+    pygame.image.save(pygame.surfarray.make_surface(img.swapaxes(0, 1)), path)
+
+
+def main(argv=None):
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Render death and coin heatmaps for a level from telemetry")
+    parser.add_argument("level_file", help="the level the records are for (.csv or .cols)")
+    parser.add_argument("--log", default=TELEMETRY_FILE)
+    parser.add_argument("--level", type=int, default=None,
+                        help="level index in the records (default: from the file name, level_1 -> 0)")
+    parser.add_argument("-o", "--output", default=None, help="default: <level>_heatmap.png")
+    args = parser.parse_args(argv)
+    level = args.level
+    if level is None:
+        match = re.search(r"level_(\d+)", os.path.basename(args.level_file))
+        if not match:
+            parser.error("can't tell the level index from the file name, pass --level")
+        level = int(match.group(1)) - 1
+    output = args.output or os.path.splitext(os.path.basename(args.level_file))[0] + "_heatmap.png"
+
+    t = time.perf_counter()
+    try:
+        grid = load_grid(args.level_file)
+        records = load_records(args.log)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    deaths, coins, wins = aggregate(records, level, grid.shape)
+    save_image(render(grid, deaths, coins), output)
+    print(f"{len(records):,} records, level {level}: {deaths.sum():,} deaths, {coins.sum():,} coins, "
+          f"{wins:,} wins -> {output} in {time.perf_counter() - t:.2f}s")
+    per_column = deaths.sum(axis=0)
+    for col in np.argsort(per_column)[::-1][:5]:
+        if per_column[col]:
+            print(f"  column {col}: {per_column[col]:,} deaths")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
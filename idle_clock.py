@@ -0,0 +1,68 @@
+#  filename: idle_clock.py
+#  Event-driven frame pacing for menu screens
+
+import os
+import time
+
+import pygame as pg
+
+from latency import FramePacer
+
+# set JUMP_RUSH_MENU_STATS=1 to print CPU usage of each menu screen when it closes
+PRINT_STATS = os.environ.get("JUMP_RUSH_MENU_STATS") == "1"
+
+
+class IdleClock:
+    """Drop-in for `clock.tick(fps)` + `pygame.event.get()` in menu loops.
+
+    While something is animating (or hovered) it ticks at `fps` like before.
+    When nothing is, it blocks in `pygame.event.wait` until input arrives or
+    `idle_timeout` ms pass, so an untouched menu uses next to no CPU.
+    """
+
+    def __init__(self, fps=60, idle_timeout=250, name="menu", precise=False):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.name = name
+        self.pacer = FramePacer(fps, precise)  # precise: sleep-then-spin pacing (see latency.py)
+        self.frames = 0        # loop iterations at frame rate
+        self.wakeups = 0       # loop iterations after blocking
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    def tick(self, active=False, poll=None):
+        """Wait for the next loop iteration and return the pending events.
+
+        poll, if given, is called repeatedly while an active frame waits
+        (LatencyMeter.poll stamps input as it arrives).
+        """
+        if active:
+            self.frames += 1
+            self.pacer.wait(poll)
+            return pg.event.get()
+        self.wakeups += 1
+        first = pg.event.wait(self.idle_timeout)
+        # keep the pacer's notion of "last frame" current so the first active
+        # frame after idling doesn't see a huge dt
+        self.pacer.resync()
+        if first.type == pg.NOEVENT:
+            return []
+        return [first] + pg.event.get()
+
+    def stats(self):
+        """Wall time, CPU time and CPU share since this clock was created."""
+        wall = time.perf_counter() - self._wall0
+        cpu = time.process_time() - self._cpu0
+        return {
+            "screen": self.name,
+            "wall_s": round(wall, 3),
+            "cpu_s": round(cpu, 3),
+            "cpu_pct": round(100.0 * cpu / wall, 1) if wall > 0 else 0.0,
+            "active_frames": self.frames,
+            "idle_wakeups": self.wakeups,
+        }
+
+    def close(self):
+        """Call when the screen exits; prints stats if JUMP_RUSH_MENU_STATS=1."""
+        if PRINT_STATS:
+            print(f"[menu stats] {self.stats()}")
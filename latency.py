@@ -0,0 +1,117 @@
+#  filename: latency.py
+#  Frame pacing and input-to-present latency
+#
+#  FramePacer waits for the next frame, either with pygame's clock.tick or,
+#  in low-latency mode, by sleeping until just before the frame is due and
+#  spinning the rest (clock.tick can oversleep by a millisecond or more).
+#  LatencyMeter stamps every input event when the loop first sees it and
+#  measures how long it took until a frame showing its effect was presented.
+
+import time
+from collections import deque
+
+import pygame as pg
+
+SPIN_MS = 2.0  # precise pacing sleeps until this close to the deadline, then spins
+POLL_MS = 1.0  # while measuring, the input queue is checked this often during the wait
+INPUT_EVENTS = (pg.KEYDOWN, pg.KEYUP, pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP,
+                pg.JOYBUTTONDOWN, pg.JOYBUTTONUP)
+
+
+class FramePacer:
+    """Waits so frames start `fps` times a second.
+
+    Not precise: clock.tick(fps), as the loops always did. Precise: frames
+    start on a fixed grid, reached by sleeping to SPIN_MS before it and
+    spinning the rest. A frame that falls more than one period behind
+    starts a new grid instead of rushing to catch up.
+    """
+
+    def __init__(self, fps=60, precise=False):
+        self.fps = fps
+        self.precise = precise
+        self.clock = pg.time.Clock()
+        self.deadline = None  # perf_counter() time the next frame is due
+
+    def resync(self):
+        """Forget the schedule (after the loop slept on something else)."""
+        self.deadline = None
+        self.clock.tick()
+
+    def wait(self, poll=None):
+        """Wait until the next frame is due, calling poll() about every POLL_MS on the way."""
+        if not self.precise and poll is None:
+            self.clock.tick(self.fps)
+            return
+        period = 1.0 / self.fps
+        now = time.perf_counter()
+        if self.deadline is None or now > self.deadline + period:
+            self.deadline = now
+        spin = SPIN_MS / 1000 if self.precise else 0.0
+        while True:
+            if poll is not None:
+                poll()
+            left = self.deadline - time.perf_counter()
+            if left <= 0:
+                break
+            if left > spin:
+                time.sleep(min(left - spin, POLL_MS / 1000) if poll is not None else left - spin)
+        # precise keeps the grid, otherwise the period counts from now like clock.tick
+        self.deadline = (self.deadline if self.precise else time.perf_counter()) + period
+        self.clock.tick()
+
+
+class LatencyMeter:
+    """Input-to-present latency over the last `window` input events, and the
+    intervals between presented frames.
+
+    Events are stamped when they come off the queue; poll() takes input off
+    it while the loop waits, so the stamp is within POLL_MS of the event
+    arriving rather than when the next frame starts.
+    """
+
+    def __init__(self, window=240):
+        self.held = []  # (time, event) taken off the queue by poll()
+        self.stamps = []  # times of the input events not yet presented
+        self.samples = deque(maxlen=window)  # input-to-present, ms
+        self.intervals = deque(maxlen=window)  # between presented frames, ms
+        self.frames = 0  # frames presented
+        self._last_present = None
+
+    def poll(self):
+        now = time.perf_counter()
+        self.held.extend((now, event) for event in pg.event.get(INPUT_EVENTS))
+
+    def take(self, events):
+        """The frame's events: those poll() held back, then `events`; stamps all the input among them."""
+        now = time.perf_counter()
+        self.stamps.extend(t for t, _ in self.held)
+        self.stamps.extend(now for event in events if event.type in INPUT_EVENTS)
+        events = [event for _, event in self.held] + list(events)
+        self.held = []
+        return events
+
+    def resync(self):
+        """Don't count the gap before the next presented frame (the loop switched screens or idled)."""
+        self._last_present = None
+
+    def presented(self):
+        """Call right after the display was updated."""
+        now = time.perf_counter()
+        self.samples.extend((now - t) * 1000 for t in self.stamps)
+        self.stamps = []
+        if self._last_present is not None:
+            self.intervals.append((now - self._last_present) * 1000)
+        self._last_present = now
+        self.frames += 1
+
+    def summary(self):
+        text = "no input yet"
+        if self.samples:
+            text = (f"input to present {sum(self.samples) / len(self.samples):.1f} ms avg,"
+                    f" {max(self.samples):.1f} ms max ({len(self.samples)} events)")
+        if self.intervals:
+            mean = sum(self.intervals) / len(self.intervals)
+            jitter = max(abs(i - mean) for i in self.intervals)
+            text += f"; frames {mean:.2f} ms apart, ±{jitter:.2f} ms"
+        return text
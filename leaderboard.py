@@ -0,0 +1,204 @@
+#  filename: leaderboard.py
+#  Merge many game_save.json files (e.g. collected at an event) into one leaderboard
+#
+#      python leaderboard.py saves/ more_saves/ other_save.json [-o leaderboard.json] [--top 10]
+
+import heapq
+import json
+import os
+import sys
+from itertools import islice
+
+LEADERBOARD_FILE = "leaderboard.json"
+TOP_K = 10
+BATCH = 256  # saves handed to the pool at a time; bounds how many paths and results are in flight
+
+
+class _Entry:
+    """Heap item that sorts worst first, so heap[0] is the one to drop."""
+    __slots__ = ("rank", "name")
+
+    def __init__(self, rank, name):
+        self.rank = rank
+        self.name = name
+
+    def __lt__(self, other):
+        return self.rank > other.rank
+
+
+class TopK:
+    """The k best distinct names seen so far, for a stream of (name, score).
+
+    `rank(score, name)` orders entries, lowest first; it includes the name so
+    ties come out the same whatever order the saves are read in. Holds at most
+    k entries no matter how long the stream is: a name that drops out was
+    beaten by k others, so none of its later, worse scores could get back in,
+    and a better one is simply pushed again.
+    """
+
+    def __init__(self, k, rank):
+        self.k = k
+        self.rank = rank
+        self.heap = []  # _Entry, worst at heap[0]
+        self.scores = {}  # name -> score, only for names in the heap
+
+    def add(self, name, score):
+        entry = _Entry(self.rank(score, name), name)
+        current = self.scores.get(name)
+        if current is not None:
+            if not entry.rank < self.rank(current, name):
+                return
+            # rare (one name in many saves): replace it and re-heapify k items
+            self.heap = [e for e in self.heap if e.name != name] + [entry]
+            heapq.heapify(self.heap)
+        elif len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry.rank < self.heap[0].rank:
+            dropped = heapq.heapreplace(self.heap, entry)
+            del self.scores[dropped.name]
+        else:
+            return
+        self.scores[name] = score
+
+    def ranked(self):
+        """[(name, score)], best first."""
+        return sorted(self.scores.items(), key=lambda item: self.rank(item[1], item[0]))
+
+
+def _most(score, name):
+    return -score, name
+
+
+def _fastest(score, name):
+    return score, name
+
+
+def save_paths(paths):
+    """Yield every .json file under the given files and directories, lazily."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(".json"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def read_save(path):
+    """Reduce one save file to ([(name, coins)], [(level, name, time)]), or None if unreadable.
+
+    Runs in the worker processes, so only this small summary travels back,
+    never the whole save.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        name = data.get("player_name", "Player")
+        coins = [(name, int(data.get("total_coins", 0)))]
+        times = [(str(lvl), name, float(t)) for lvl, t in data.get("best_times", {}).items()]
+        # high scores can carry other players' names (saves merged before)
+        high_scores = data.get("high_scores", {})
+        coins += [(e["name"], int(e["coins"])) for e in high_scores.get("coins", [])]
+        for lvl, entries in high_scores.get("times", {}).items():
+            times += [(str(lvl), e["name"], float(e["time"])) for e in entries]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+        return path, None, str(e)
+    return path, (coins, times), None
+
+
+class LeaderboardMerger:
+    """Folds save summaries into a top-k coins table and a top-k table per level."""
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.coins = TopK(k, _most)
+        self.times = {}  # level -> TopK
+        self.sources = 0
+        self.errors = 0
+
+    def add(self, summary):
+        coins, times = summary
+        self.sources += 1
+        for name, value in coins:
+            self.coins.add(name, value)
+        for lvl, name, value in times:
+            table = self.times.get(lvl)
+            if table is None:
+                table = self.times[lvl] = TopK(self.k, _fastest)
+            table.add(name, value)
+
+    def result(self):
+        """The merged board, in the same layout as a save's high_scores."""
+        return {
+            "sources": self.sources,
+            "errors": self.errors,
+            "coins": [{"name": n, "coins": c} for n, c in self.coins.ranked()],
+            "times": {lvl: [{"name": n, "time": t} for n, t in self.times[lvl].ranked()]
+                      for lvl in sorted(self.times, key=lambda lvl: int(lvl) if lvl.isdigit() else lvl)},
+        }
+
+
+def merge(paths, k=TOP_K, jobs=None):
+    """Merge every save under `paths`; jobs=1 parses in this process, otherwise a pool."""
+    merger = LeaderboardMerger(k)
+    todo = save_paths(paths)
+
+    def fold(results):
+        for path, summary, error in results:
+            if summary is None:
+                merger.errors += 1
+                print(f"Warning: skipping {path}: {error}")
+            else:
+                merger.add(summary)
+
+    if jobs == 1:
+        fold(map(read_save, todo))
+        return merger.result()
+    import multiprocessing
+    with multiprocessing.Pool(jobs) as pool:
+        while True:
+            batch = list(islice(todo, BATCH))
+            if not batch:
+                break
+            fold(pool.imap_unordered(read_save, batch, chunksize=16))
+    return merger.result()
+
+
+def load_leaderboard(path=LEADERBOARD_FILE):
+    """The merged board written by this tool, or None if there is none (what the menu shows)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error loading leaderboard: {e}")
+        return None
+
+
+def main(argv=None):
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Merge game_save.json files into one leaderboard")
+    parser.add_argument("paths", nargs="+", help="save files, or directories to search for *.json")
+    parser.add_argument("-o", "--output", default=LEADERBOARD_FILE, help="default: %(default)s")
+    parser.add_argument("--top", type=int, default=TOP_K, help="entries kept per table (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU, 1: none)")
+    args = parser.parse_args(argv)
+    t = time.perf_counter()
+    board = merge(args.paths, args.top, args.jobs)
+    try:
+        with open(args.output, 'w') as f:
+            json.dump(board, f, indent=2)
+    except OSError as e:
+        print(f"Error saving leaderboard: {e}")
+        return 1
+    print(f"Merged {board['sources']} saves ({board['errors']} unreadable) into {args.output} "
+          f"in {time.perf_counter() - t:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
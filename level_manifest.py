@@ -0,0 +1,183 @@
+#  filename: level_manifest.py
+#  The level list, plus per-level metadata worked out once and kept in levels.json
+#
+#      python level_manifest.py [--rebuild]
+#
+#  LEVELS is the one place levels are listed. load_manifest() adds each level's
+#  size, tile counts, content checksum, menu thumbnail and a pre-rendered
+#  preview, and only re-reads level files that changed since levels.json was
+#  written, so the menu, the loader and the progress bar never parse a level
+#  just to learn about it.
+
+import json
+import os
+import sys
+import zlib
+
+import pygame
+
+from level_stream import open_columns
+
+MANIFEST_FILE = "levels.json"
+PREVIEW_DIR = os.path.join("images", "previews")
+PREVIEW_CELL = 2  # preview pixels per tile
+
+# display name, level file, folder of background images (the first one is the menu thumbnail)
+LEVELS = [
+    {"name": "The Beginning", "file": "level_1.csv", "background": "images/background/level 1"},
+    {"name": "Forest Frolic", "file": "level_2.csv", "background": "images/background/level 2"},
+    {"name": "Spike Gauntlet", "file": "level_3.csv", "background": "images/background/level 3"},
+    {"name": "Coin Craze", "file": "level_4.csv", "background": "images/background/level 4"},
+    {"name": " Final Challenge", "file": "level_5.csv", "background": "images/background/level 5"},
+]
+# menu entry after the last level; unlocked by finishing level 5, has no end, so no best time
+ENDLESS = {"name": "Endless", "background": "images/background/level 5", "endless": True}
+
+# tokens counted and drawn in the preview (anything else in a cell is ignored, as init_level does)
+PREVIEW_COLORS = {
+    "0": (110, 116, 130),
+    "Spike": (170, 90, 90),
+    "Coin": (240, 200, 40),
+    "Orb": (240, 240, 110),
+    "T": (80, 86, 100),
+    "End": (60, 200, 90),
+}
+PREVIEW_BACKGROUND = (24, 26, 34)
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _checksum(path):
+    """Content checksum (mtimes don't survive copying into a bundle)."""
+    with open(path, 'rb') as f:
+        return zlib.crc32(f.read())
+
+
+def _thumbnail(folder):
+    """First image in a background folder (what load_backgrounds shows for the level), or None."""
+    if not os.path.isdir(folder):
+        return None
+    files = sorted(f for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f)))
+    return os.path.join(folder, files[0]) if files else None
+
+
+def preview_path(level_file):
+    return os.path.join(PREVIEW_DIR, os.path.splitext(os.path.basename(level_file))[0] + ".png")
+
+
+def scan_level(path, preview=None):
+    """Size and tile counts of one level file (.csv or .cols), drawing its
+    preview to `preview` on the way if given."""
+    columns = list(open_columns(path))
+    rows = max((len(col) for col in columns), default=0)
+    counts = dict.fromkeys(PREVIEW_COLORS, 0)
+    img = pygame.Surface((max(len(columns), 1) * PREVIEW_CELL, max(rows, 1) * PREVIEW_CELL))
+    img.fill(PREVIEW_BACKGROUND)
+    for x, col in enumerate(columns):
+        for y, token in enumerate(col):
+            color = PREVIEW_COLORS.get(token)
+            if color is not None:
+                counts[token] += 1
+                img.fill(color, (x * PREVIEW_CELL, y * PREVIEW_CELL, PREVIEW_CELL, PREVIEW_CELL))
+    if preview:
+        os.makedirs(os.path.dirname(preview), exist_ok=True)
+        pygame.image.save(img, preview)
+    return {"rows": rows, "cols": len(columns), "counts": counts, "coins": counts["Coin"]}
+
+
+def _read(path):
+    try:
+        with open(path, 'r') as f:
+            return {entry["file"]: entry for entry in json.load(f)["levels"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def load_manifest(path=MANIFEST_FILE, rebuild=False):
+    """One dict per LEVELS entry: name, file, background, thumbnail, rows, cols,
+    counts, coins, checksum, preview.
+
+    Entries in `path` are reused while the level file's mtime and size are
+    unchanged, or its checksum is; only the other files are read again, and
+    the file is rewritten only if something changed.
+    """
+    known = {} if rebuild else _read(path)
+    entries = []
+    changed = False
+    for spec in LEVELS:
+        level_file = spec["file"]
+        entry = dict(known.get(level_file, {}))
+        preview = preview_path(level_file)
+        try:
+            stamp = _stamp(level_file)
+            if entry.get("stamp") != stamp or not os.path.exists(entry.get("preview") or ""):
+                checksum = _checksum(level_file)
+                if entry.get("checksum") != checksum or not os.path.exists(entry.get("preview") or ""):
+                    entry.update(scan_level(level_file, preview), checksum=checksum, preview=preview)
+                entry["stamp"] = stamp
+                changed = True
+        except (OSError, ValueError, pygame.error) as e:
+            print(f"Warning: could not read level {level_file}: {e}")
+            entry = {"rows": 0, "cols": 0, "counts": {}, "coins": 0, "checksum": None, "preview": None}
+        thumbnail = entry.get("thumbnail")
+        if entry.get("background") != spec["background"] or not (thumbnail and os.path.isfile(thumbnail)):
+            entry["thumbnail"] = _thumbnail(spec["background"])
+            changed = True
+        entry.update(spec)
+        entries.append(entry)
+    if changed:
+        try:
+            with open(path, 'w') as f:
+                json.dump({"levels": entries}, f, indent=1)
+        except OSError as e:
+            print(f"Warning: could not save {path}: {e}")
+    return entries
+
+
+_manifest = None
+
+
+def manifest():
+    """The level entries, loaded (and refreshed where needed) on first use."""
+    global _manifest
+    if _manifest is None:
+        _manifest = load_manifest()
+    return _manifest
+
+
+def refresh():
+    """Re-check the level entries after a level file was edited (only the
+    changed file is read again); updates the list manifest() returned in place."""
+    entries = load_manifest()
+    if _manifest is None:
+        return entries
+    _manifest[:] = entries
+    return _manifest
+
+
+def menu_entries():
+    """The start menu's levels: every level, then endless mode."""
+    thumbnail = next((e["thumbnail"] for e in manifest() if e["background"] == ENDLESS["background"]), None)
+    endless = dict(ENDLESS, thumbnail=thumbnail or _thumbnail(ENDLESS["background"]))
+    return manifest() + [endless]
+
+
+def main(argv=None):
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Refresh levels.json and the level previews")
+    parser.add_argument("--rebuild", action="store_true", help="re-read every level, changed or not")
+    args = parser.parse_args(argv)
+    t = time.perf_counter()
+    for entry in load_manifest(rebuild=args.rebuild):
+        counts = ", ".join(f"{n} {tok}" for tok, n in entry["counts"].items() if n)
+        print(f"{entry['file']}: {entry['cols']}x{entry['rows']} tiles ({counts})")
+    print(f"{MANIFEST_FILE} up to date in {time.perf_counter() - t:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
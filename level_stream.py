@@ -0,0 +1,137 @@
+#  filename: level_stream.py
+#  Streaming level mode: tiles exist only in a window of columns around the camera
+#
+#  Convert a CSV level to the compact column format:
+#      python level_stream.py level_1.csv level_1.cols [--repeat N]
+
+import csv
+import sys
+
+COLUMN_EXT = ".cols"
+MAGIC = "JRCOLS1"
+EMPTY_TOKENS = ("", "-1")
+EMPTY_CHAR = "."
+# one character per token; index in this string = index in the header's token list
+TOKEN_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+
+class ColumnFile:
+    """Reads a .cols level one column at a time.
+
+    Layout: a header line `JRCOLS1 <height> <token>,<token>,...` followed by one
+    line per level column, top row first, with one character per cell ("." for
+    empty, otherwise the token at that position in TOKEN_CHARS). Only the
+    current line is ever held in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'r', newline='') as f:
+            header = f.readline().rstrip("\r\n")
+        magic, height, tokens = header.split(" ", 2)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a column level file")
+        self.height = int(height)
+        self.tokens = tokens.split(",") if tokens else []
+        self._decode = {TOKEN_CHARS[i]: tok for i, tok in enumerate(self.tokens)}
+
+    def __iter__(self):
+        decode = self._decode
+        with open(self.path, 'r', newline='') as f:
+            f.readline()
+            for line in f:
+                yield [decode.get(ch, "") for ch in line.rstrip("\r\n")]
+
+
+class CsvColumns:
+    """Column iterator over an ordinary level_N.csv (rows may be ragged).
+
+    CSV is row-major, so the text is read up front; only the tiles are streamed.
+    """
+
+    def __init__(self, path):
+        with open(path, newline='') as csvfile:
+            self.rows = list(csv.reader(csvfile, delimiter=',', quotechar='"'))
+        self.height = len(self.rows)
+
+    def __iter__(self):
+        width = max((len(row) for row in self.rows), default=0)
+        for i in range(width):
+            yield [row[i] if i < len(row) else "" for row in self.rows]
+
+
+def open_columns(path):
+    return ColumnFile(path) if path.endswith(COLUMN_EXT) else CsvColumns(path)
+
+
+class LevelStreamer:
+    """Spawns level columns just ahead of the camera and retires them behind it.
+
+    Tiles go into a TileLayers exactly as init_level would put them, but only
+    for `view_width` plus `margin` columns on each side, so the number of live
+    sprites depends on the screen width and not on the level length.
+    """
+
+    def __init__(self, columns, layers, view_width, margin=2):
+        self.columns = iter(columns)
+        self.layers = layers
+        self.view_width = view_width
+        self.margin = margin
+        self.next_col = 0  # next level column to spawn
+        self.finished = False  # every column has been read
+
+    def update(self):
+        """Call once per frame after the map has scrolled."""
+        ts = self.layers.tile_size
+        scroll = self.layers.scroll
+        right = scroll + self.view_width + self.margin * ts
+        while not self.finished and self.next_col * ts < right:
+            column = next(self.columns, None)
+            if column is None:
+                self.finished = True
+                break
+            x = self.next_col * ts - scroll
+            for row, token in enumerate(column):
+                if token not in EMPTY_TOKENS:
+                    self.layers.spawn(token, (x, row * ts))
+            self.next_col += 1
+        self.layers.retire_before(scroll // ts - self.margin)
+
+
+def convert(csv_path, out_path, repeat=1):
+    """Write a CSV level as a .cols file (optionally repeated `repeat` times end to end)."""
+    src = CsvColumns(csv_path)
+    tokens = []
+    columns = []
+    for column in src:
+        for tok in column:
+            if tok not in EMPTY_TOKENS and tok not in tokens:
+                tokens.append(tok)
+        columns.append(column)
+    if len(tokens) > len(TOKEN_CHARS):
+        raise ValueError(f"too many distinct tokens ({len(tokens)})")
+    if any("," in tok for tok in tokens):
+        raise ValueError("tokens may not contain commas")
+    encode = {tok: TOKEN_CHARS[i] for i, tok in enumerate(tokens)}
+    with open(out_path, 'w', newline='') as f:
+        f.write(f"{MAGIC} {src.height} {','.join(tokens)}\n")
+        for _ in range(repeat):
+            for column in columns:
+                f.write("".join(encode.get(tok, EMPTY_CHAR) for tok in column) + "\n")
+    return len(columns) * repeat
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert a CSV level to the streaming column format")
+    parser.add_argument("csv", help="level_N.csv to read")
+    parser.add_argument("out", help=f"output file (*{COLUMN_EXT})")
+    parser.add_argument("--repeat", type=int, default=1, help="repeat the level N times (for long test levels)")
+    args = parser.parse_args(argv)
+    n = convert(args.csv, args.out, args.repeat)
+    print(f"Wrote {n} columns to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
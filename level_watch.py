@@ -0,0 +1,66 @@
+#  filename: level_watch.py
+#  Dev mode: notice edits to the level being played and report which cells changed
+
+import os
+import time
+
+
+def diff_grids(old, new):
+    """(row, col, old_token, new_token) for every cell that differs.
+
+    Rows may be ragged or change length; a missing cell counts as "".
+    """
+    changes = []
+    for r in range(max(len(old), len(new))):
+        old_row = old[r] if r < len(old) else []
+        new_row = new[r] if r < len(new) else []
+        for c in range(max(len(old_row), len(new_row))):
+            a = old_row[c] if c < len(old_row) else ""
+            b = new_row[c] if c < len(new_row) else ""
+            if a != b:
+                changes.append((r, c, a, b))
+    return changes
+
+
+class LevelWatcher:
+    """Polls a level file's mtime and diffs it against the grid that is loaded.
+
+    `load` turns a path into a grid (main.py passes block_map). The file is
+    stat'ed at most every `interval` seconds, and only read when its mtime or
+    size changed, so leaving this on costs next to nothing.
+    """
+
+    def __init__(self, path, grid, load, interval=0.25):
+        self.path = path
+        self.grid = grid
+        self.load = load
+        self.interval = interval
+        self._stamp = self._stat()
+        self._next = 0.0
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self):
+        """Changed cells since the last successful poll ([] if none)."""
+        now = time.perf_counter()
+        if now < self._next:
+            return []
+        self._next = now + self.interval
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return []
+        try:
+            grid = self.load(self.path)
+        except (OSError, ValueError) as e:
+            # probably caught the editor mid-save; try again next poll
+            print(f"Warning: could not reload {self.path}: {e}")
+            return []
+        self._stamp = stamp
+        changes = diff_grids(self.grid, grid)
+        self.grid = grid
+        return changes
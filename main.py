@@ -4,9 +4,11 @@
 
 import csv
 import os
+import math
 import random
-from start_menu import run_start_menu  # Jump Rush menu import
-from congratulations_menu import run_congratulations  # Congratulations screen import
+import sys
+from start_menu import StartMenu  # Jump Rush menu
+from congratulations_menu import Congratulations  # Congratulations screen
 from game_save import load_game_data, save_game_data, add_coins, complete_level, get_total_coins, get_selected_avatar, set_best_time, get_best_times  # Save system
 
 # import the pygame module
@@ -15,23 +17,36 @@ import pygame
 # will make it easier to use pygame functions
 from pygame.math import Vector2
 from pygame.draw import rect
-from game_over_menu import run_game_over  # Game Over UI
+from game_over_menu import GameOver  # Game Over UI
+from scenes import Scene, SceneManager
+from latency import LatencyMeter
+from viewport import Viewport
 import time
+import collision
+import telemetry
+import ghosts
+import asset_cache
+import avatars
+import level_manifest
+import memwatch
+from atlas import load_atlas
+from audio import AudioManager
+from level_stream import LevelStreamer, open_columns, COLUMN_EXT
+from endless import ChunkPool, EndlessColumns
+from physics import (GRAVITY_BASE, JUMP_BASE, ORB_JUMP, GAME_SPEED, PLAYER_SPEED, TILE_SIZE, PLAYER_SIZE,
+                     SPIKE_HITBOX, game_physics)
+from level_watch import LevelWatcher
+from checkpoint import Checkpoints, Snapshot
+from quality import QualityController, QUALITY_CHOICES
+from settings import get_setting, set_setting
+from collision import TileLayers, register_tile, SOLID, HAZARD, PICKUP, TRIGGER, GOAL, DECOR
 
 # initializes the pygame module
 pygame.init()
 
-# creates a screen variable of size 800 x 600
-screen = pygame.display.set_mode([800, 600])
-
-# controls the main game while loop
-done = False
-
-# controls whether or not to start the game from the main menu
-start = False
-
-# sets the frame rate of the program
-clock = pygame.time.Clock()
+# opens the window; everything draws on screen, 800 x 600 whatever the window size (see viewport.py)
+viewport = Viewport()
+screen = viewport.surface
 
 """
 CONSTANTS
@@ -49,26 +64,46 @@ e.g.
 >>6
 """
 color = lambda: tuple([random.randint(0, 255) for i in range(3)])  # lambda function for random color, not a constant.
-GRAVITY = Vector2(0, 0.86)  # Vector2 is a pygame
-# tile size (width and height of map tiles / sprites)
-TILE_SIZE = 32
+# movement numbers (GRAVITY_BASE, JUMP_BASE, GAME_SPEED, PLAYER_SPEED, TILE_SIZE, ...) are
+# in physics.py, shared with the endless-mode chunk check and the bot environment
+GRAVITY = Vector2(0, GRAVITY_BASE)  # Vector2 is a pygame
 TILE_HALF = TILE_SIZE // 2
-# player visual size (smaller than tile if desired)
-PLAYER_SIZE = 20
 PLAYER_HALF = PLAYER_SIZE // 2
 # Debug / tuning flags
 DEBUG_EASY_MODE = False  # toggled by pressing E
 DEBUG_NOCLIP = False     # toggled by pressing G (full noclip)
 DEBUG_INVINCIBLE = False  # toggled by V (test mode: no damage at all)
 DEBUG_PASS_SPIKES = False  # toggled by X (ignore spike deaths only)
-GRAVITY_BASE = GRAVITY.y
-JUMP_BASE = 13.5  # was 10, slight increase for clearing 2-tile spike gaps
+DEBUG_HOT_RELOAD = False  # toggled by R (apply edits to the level file without restarting)
+DEBUG_MEMORY = False  # toggled by M (report memory growth on every reset, see memwatch.py)
+DEBUG_LATENCY = False  # toggled by K (report input-to-present latency, see latency.py)
+LATENCY_REPORT_FRAMES = 300  # frames between latency reports
+# practice mode, toggled by P: C drops a checkpoint, Backspace removes the last one,
+# dying respawns at the newest one. Nothing (coins, times, completion) is saved.
+PRACTICE_MODE = False
 EASY_GRAVITY = 0.3
 EASY_JUMP = 12
-# game speed scaling: values < 1.0 slow the game, values > 1.0 speed it up
-GAME_SPEED = 0.7
-# base horizontal speed for the player (will be multiplied by GAME_SPEED)
-PLAYER_SPEED = 6
+# build tiles column by column around the camera instead of all up front
+# (always on for .cols levels, see level_stream.py)
+STREAM_LEVELS = False
+# seed for the endless mode chunk pool (None: a new pool every session)
+ENDLESS_SEED = None
+# log deaths, coin pickups and wins to telemetry.TELEMETRY_FILE (heatmap.py draws them)
+TELEMETRY = True
+# JUMP_RUSH_SOAK=<resets>: instead of the game, restart levels that many times headless (each
+# restart plays SOAK_FRAMES frames and opens a menu screen) and check memory stays flat, i.e.
+# grows by at most SOAK_LIMIT bytes per reset over the second half of the run (the first half
+# absorbs whatever is allocated once, so the verdict doesn't depend on the run length)
+SOAK_RESETS = int(os.environ.get("JUMP_RUSH_SOAK", "0"))
+SOAK_FRAMES = 30
+SOAK_LIMIT = 256
+SOAK_MIN_CYCLES = 4  # shorter runs can't tell one-off allocations from growth
+# ghost race, toggled by H: replay the recorded runs in ghosts/ (see ghosts.py) next to the player
+GHOST_RACE = get_setting("ghosts", False)
+# low-latency input (L): precise frame pacing, and a jump tapped between two
+# frames still counts even if it was released before the keys were read
+LOW_LATENCY = get_setting("low_latency", False)
+JUMP_KEYS = (pygame.K_UP, pygame.K_SPACE)
 
 """
 Main player class
@@ -83,7 +118,7 @@ class Player(pygame.sprite.Sprite):
     def __init__(self, image, platforms, pos, *groups):
         """
         :param image: block face avatar
-        :param platforms: obstacles such as coins, blocks, spikes, and orbs
+        :param platforms: TileLayers holding the obstacles (coins, blocks, spikes, orbs) by collision layer
         :param pos: starting position
         :param groups: takes any number of sprite groups.
         """
@@ -93,19 +128,25 @@ class Player(pygame.sprite.Sprite):
         self.died = False  # player died?
         self.win = False  # player beat level?
         # scale player separately from tile size so we can make the player smaller
-        self.image = pygame.transform.smoothscale(image, (PLAYER_SIZE, PLAYER_SIZE))
+        if image.get_size() != (PLAYER_SIZE, PLAYER_SIZE):
+            image = pygame.transform.smoothscale(image, (PLAYER_SIZE, PLAYER_SIZE))
+        self.image = image
         self.rect = self.image.get_rect(center=pos)  # get rect gets a Rect object from the image
+        self.mask = pygame.mask.from_surface(self.image)  # for pixel-exact hazard tests
         self.jump_amount = JUMP_BASE  # jump strength
         self.particles = []  # player trail
         self.isjump = False  # is the player jumping?
         self.vel = Vector2(0, 0)  # velocity starts at zero
 
-    def draw_particle_trail(self, x, y, color=(255, 255, 255)):
-        """draws a trail of particle-rects in a line at random positions behind the player"""
+    def draw_particle_trail(self, x, y, color=(255, 255, 255), limit=None, scale=1):
+        """draws a trail of particle-rects in a line at random positions behind the player
+        (at most `limit` of them, the newest), `scale` times larger on alpha_surf"""
 
         self.particles.append(
                 [[x - 5, y - 8], [random.randint(0, 25) / 10 - 1, random.choice([0, 0])],
                  random.randint(5, 8)])
+        if limit is not None:
+            del self.particles[:-limit]
 
         for particle in self.particles:
             particle[0][0] += particle[1][0]
@@ -113,81 +154,19 @@ class Player(pygame.sprite.Sprite):
             particle[2] -= 0.5
             particle[1][0] -= 0.4
             rect(alpha_surf, color,
-                 ([int(particle[0][0]), int(particle[0][1])], [int(particle[2]) for i in range(2)]))
+                 ([int(particle[0][0] * scale), int(particle[0][1] * scale)], [int(particle[2] * scale) for i in range(2)]))
             if particle[2] <= 0:
                 self.particles.remove(particle)
 
     def collide(self, yvel, platforms):
-        global coins, level_coins, DEBUG_NOCLIP
-
         # If noclip debugging is enabled, skip all collision handling so the
         # player can pass through objects for map testing.
         if DEBUG_NOCLIP:
             return
 
-        for p in platforms:
-            if pygame.sprite.collide_rect(self, p):
-                """pygame sprite builtin collision method,
-                sees if player is colliding with any obstacles"""
-                if isinstance(p, Orb) and (keys[pygame.K_UP] or keys[pygame.K_SPACE]):
-                    pygame.draw.circle(alpha_surf, (255, 255, 0), p.rect.center, 18)
-                    screen.blit(pygame.image.load("images/editor-0.9s-47px.gif"), p.rect.center)
-                    self.jump_amount = 12  # gives a little boost when hit orb
-                    self.jump()
-                    self.jump_amount = 10  # return jump_amount to normal
-
-                if isinstance(p, End):
-                    self.win = True
-
-                if isinstance(p, Spike):
-                    # If player is invincible, full noclip, or configured to pass spikes,
-                    # ignore spike deaths. Otherwise check effective spike rect.
-                    if DEBUG_NOCLIP or DEBUG_INVINCIBLE or DEBUG_PASS_SPIKES:
-                        pass
-                    else:
-                        # shrink spike effective rect (top part only)
-                        spike_effective = p.rect.inflate(-14, -8).copy()
-                        spike_effective.bottom = p.rect.bottom - 6
-                        if self.rect.colliderect(spike_effective):
-                            self.died = True
-
-                if isinstance(p, Coin):
-                    # Update persistent coin count
-                    save_data = add_coins(1)
-                    global coins, new_avatar_unlocked
-                    coins = save_data["total_coins"]
-                    level_coins += 1
-                    
-                    # Check if avatar was unlocked
-                    if save_data.get("new_unlock"):
-                        new_avatar_unlocked = save_data["new_unlock"]
-
-                    # erases a coin
-                    p.rect.x = 0
-                    p.rect.y = 0
-
-                if isinstance(p, Platform):  # these are the blocks (may be confusing due to self.platforms)
-
-                    if yvel > 0:
-                        """if player is going down(yvel is +)"""
-                        self.rect.bottom = p.rect.top  # dont let the player go through the ground
-                        self.vel.y = 0  # rest y velocity because player is on ground
-
-                        # set self.onGround to true because player collided with the ground
-                        self.onGround = True
-
-                        # reset jump
-                        self.isjump = False
-                    elif yvel < 0:
-                        """if yvel is (-),player collided while jumping"""
-                        self.rect.top = p.rect.bottom  # player top is set the bottom of block like it hits it head
-                    else:
-                        """otherwise, if player collides with a block, he/she dies."""
-                        self.vel.x = 0
-                        self.rect.right = p.rect.left  # dont let player go through walls
-                        if not DEBUG_NOCLIP:
-                            if not DEBUG_INVINCIBLE:
-                                self.died = True
+        # each layer's handler (see "Collision handlers" below) deals with the tiles
+        # of that layer the player overlaps
+        platforms.collide(self, yvel)
 
     def jump(self):
         self.vel.y = -self.jump_amount  # players vertical velocity is negative so ^
@@ -198,6 +177,7 @@ class Player(pygame.sprite.Sprite):
             if self.onGround:
                 """if player wants to jump and player is on the ground: only then is jump allowed"""
                 self.jump()
+                audio.play("jump")
 
         if not self.onGround:  # only accelerate with gravity if in the air
             self.vel += GRAVITY  # Gravity falls
@@ -205,17 +185,18 @@ class Player(pygame.sprite.Sprite):
             # max falling speed
             if self.vel.y > 100: self.vel.y = 100
 
-        # do x-axis collisions
+        # do x-axis collisions (tiles that scrolled into the player last frame)
         self.collide(0, self.platforms)
 
-        # increment in y direction
-        self.rect.top += self.vel.y
-
         # assuming player in the air, and if not it will be set to inversed after collide
         self.onGround = False
 
-        # do y-axis collisions
-        self.collide(self.vel.y, self.platforms)
+        # move in y direction while the map scrolls by vel.x, sweeping the player
+        # through the tile grid so big steps can't tunnel through blocks or spikes
+        if DEBUG_NOCLIP:
+            self.rect.top += self.vel.y
+        else:
+            self.platforms.sweep(self, round(self.vel.x), self.vel.y)
 
         # Kill the player if they fall off the bottom of the visible playfield.
         if self.rect.top > screen.get_height():
@@ -287,6 +268,85 @@ class End(Draw):
         super().__init__(image, pos, *groups)
 
 
+"""
+Collision handlers, one per layer (called by TileLayers.collide for each overlapping tile)
+"""
+
+
+@collision.handler(TRIGGER)
+def hit_orb(player, p, yvel):
+    if jump_held:
+        k = alpha_surf.get_width() // screen.get_width()  # the trail layer is native size in native mode
+        pygame.draw.circle(alpha_surf, (255, 255, 0), (p.rect.centerx * k, p.rect.centery * k), 18 * k)
+        screen.blit(pygame.image.load("images/editor-0.9s-47px.gif"), p.rect.center)
+        player.jump_amount = ORB_JUMP  # gives a little boost when hit orb
+        player.jump()
+        audio.play("orb")
+        player.jump_amount = 10  # return jump_amount to normal
+
+
+@collision.handler(GOAL)
+def hit_end(player, p, yvel):
+    player.win = True
+
+
+@collision.handler(HAZARD)
+def hit_spike(player, p, yvel):
+    # If player is invincible, full noclip, or configured to pass spikes,
+    # ignore spike deaths. (TileLayers has already checked the spike's cached
+    # hitbox and mask before calling this.)
+    if DEBUG_NOCLIP or DEBUG_INVINCIBLE or DEBUG_PASS_SPIKES:
+        return
+    player.died = True
+
+
+@collision.handler(PICKUP)
+def hit_coin(player, p, yvel):
+    global coins, level_coins, new_avatar_unlocked
+    level_coins += 1
+    if not PRACTICE_MODE:
+        # Update persistent coin count
+        save_data = add_coins(1)
+        coins = save_data["total_coins"]
+
+        # Check if avatar was unlocked
+        if save_data.get("new_unlock"):
+            new_avatar_unlocked = save_data["new_unlock"]
+        log_event(telemetry.COIN)  # practice pickups are put back on respawn, so not counted
+
+    audio.play("coin")
+
+    # collected: drop the coin from its layer (and from drawing); a practice
+    # respawn puts back the ones taken after the checkpoint
+    taken_coins.append((p, p.rect.x + layers.scroll))
+    p.kill()
+
+
+@collision.handler(SOLID)
+def hit_block(player, p, yvel):
+    # these are the blocks (may be confusing due to self.platforms)
+    if yvel > 0:
+        """if player is going down(yvel is +)"""
+        player.rect.bottom = p.rect.top  # dont let the player go through the ground
+        player.vel.y = 0  # rest y velocity because player is on ground
+
+        # set self.onGround to true because player collided with the ground
+        player.onGround = True
+
+        # reset jump
+        player.isjump = False
+    elif yvel < 0:
+        """if yvel is (-),player collided while jumping"""
+        player.rect.top = p.rect.bottom  # player top is set the bottom of block like it hits it head
+    else:
+        """otherwise, if player collides with a block, he/she dies."""
+        player.vel.x = 0
+        player.rect.right = p.rect.left  # dont let player go through walls
+        if not DEBUG_NOCLIP:
+            if not DEBUG_INVINCIBLE:
+                player.died = True
+
+
 """
 Functions
 """
@@ -294,37 +354,19 @@ Functions
 
 def init_level(map):
     """this is similar to 2d lists. it goes through a list of lists, and creates instances of certain obstacles
-    depending on the item in the list"""
+    depending on the item in the list (see the register_tile calls for the token -> tile table)"""
     x = 0
     y = 0
 
     for row in map:
         for col in row:
-
-            if col == "0":
-                Platform(block, (x, y), elements)
-
-            if col == "Coin":
-                Coin(coin, (x, y), elements)
-
-            if col == "Spike":
-                Spike(spike, (x, y), elements)
-            if col == "Orb":
-                orbs.append([x, y])
-
-                Orb(orb, (x, y), elements)
-
-            if col == "T":
-                Trick(trick, (x, y), elements)
-
-            if col == "End":
-                End(avatar, (x, y), elements)
+            layers.spawn(col, (x, y))
             x += TILE_SIZE
         y += TILE_SIZE
         x = 0
 
 
-def blitRotate(surf, image, pos, originpos: tuple, angle: float):
+def blitRotate(surf, image, pos, originpos: tuple, angle: float, step=0):
     """
     rotate the player
     :param surf: Surface
@@ -332,7 +374,10 @@ def blitRotate(surf, image, pos, originpos: tuple, angle: float):
     :param pos: position of image
     :param originpos: x, y of the origin to rotate about
     :param angle: angle to rotate
+    :param step: snap the angle to multiples of this (degrees) and reuse rotated images; 0 rotates exactly
     """
+    if step:
+        angle = round(angle / step) * step % 360
     # calcaulate the axis aligned bounding box of the rotated image
     w, h = image.get_size()
     box = [Vector2(p) for p in [(0, 0), (w, 0), (w, -h), (0, -h)]]
@@ -350,7 +395,15 @@ def blitRotate(surf, image, pos, originpos: tuple, angle: float):
     origin = (pos[0] - originpos[0] + min_box[0] - pivot_move[0], pos[1] - originpos[1] - max_box[1] + pivot_move[1])
 
     # get a rotated image
-    rotated_image = pygame.transform.rotozoom(image, angle, 1)
+    if step:
+        if _rotations.get("image") is not image:
+            _rotations.clear()
+            _rotations["image"] = image
+        rotated_image = _rotations.get(angle)
+        if rotated_image is None:
+            rotated_image = _rotations[angle] = pygame.transform.rotozoom(image, angle, 1)
+    else:
+        rotated_image = pygame.transform.rotozoom(image, angle, 1)
 
     # rotate and blit the image
     surf.blit(rotated_image, origin)
@@ -358,130 +411,105 @@ def blitRotate(surf, image, pos, originpos: tuple, angle: float):
 
 def won_screen():
     """show this screen when beating a level"""
-    global attempts, level, fill, start, done, start_time
+    global attempts
     attempts = 0
     player_sprite.clear(player.image, screen)
     
     # Calculate time taken
     time_taken = time.time() - start_time
     
-    # Save best time
-    set_best_time(level + 1, time_taken)
+    if not PRACTICE_MODE:
+        # Save best time
+        set_best_time(level + 1, time_taken)
 
-    # Mark level as completed (pass time_taken required by save system)
-    complete_level(level + 1, time_taken)  # level is 0-indexed, save as 1-indexed
+        # Mark level as completed (pass time_taken required by save system)
+        complete_level(level + 1, time_taken)  # level is 0-indexed, save as 1-indexed
     
     # Show congratulations screen
-    choice = run_congratulations(screen, 
-                               level_completed=level + 1,  # level is 0-indexed, display as 1-indexed
-                               coins_collected=level_coins, 
-                               total_coins=coins,
-                               new_avatar_unlocked=new_avatar_unlocked)
-    
+    scenes.switch("congratulations",
+                  level_completed=level + 1,  # level is 0-indexed, display as 1-indexed
+                  coins_collected=level_coins,
+                  total_coins=coins,
+                  new_avatar_unlocked=new_avatar_unlocked)
+
+
+def on_congratulations(choice):
+    """the congratulations screen closed: next level, retry, home or quit"""
+    global level
     if choice.get('action') == 'quit':
-        done = True
-        return
+        scenes.quit()
     elif choice.get('action') == 'next_level':
         # Move to next level
         level += 1
         if level >= len(levels):
             # All levels completed! Could show final congratulations
             level = 0  # Loop back to first level for now
-        reset()
+        play()
     elif choice.get('action') == 'retry':
         # Retry current level
-        reset()
+        play()
     elif choice.get('action') == 'home':
         # Return to start menu
-        try:
-            global avatar
-            _menu = run_start_menu(screen)
-            if _menu.get("quit"):
-                done = True
-                return
-            else:
-                chosen_avatar_path = _menu.get("avatar_path")
-                if chosen_avatar_path:
-                    try:
-                        avatar = pygame.image.load(chosen_avatar_path).convert_alpha()
-                    except Exception:
-                        pass # keep current avatar
-                else:
-                    selected_avatar = get_selected_avatar()
-                    try:
-                        avatar_path = os.path.join("images", "avatar", selected_avatar)
-                        if not os.path.exists(avatar_path):
-                            avatar_path = os.path.join("images", selected_avatar)
-                        avatar = pygame.image.load(avatar_path).convert_alpha()
-                    except Exception:
-                        avatar = pygame.image.load(os.path.join("images", "avatar.png")).convert_alpha()
-                start = True
-                # Keep current level, just reset
-                reset()
-        except Exception as e:
-            print(f"Error returning to menu: {e}")
-            done = True
+        scenes.switch("menu")
 
 
 def death_screen():
     """Game Over modal with Retry/Home"""
-    global attempts, fill, start, done, screen, level
+    global attempts, fill
+    audio.play("death")
+    attempts += 1
     # Reset any fill/overlay used by previous UI if exists
     fill = 0
     # Prepare scores if available (safe)
     total_score = globals().get('score', None)
     best_score  = globals().get('best', None)
     # Show modal
+    scenes.switch("game_over", total_score=total_score, best_score=best_score)
 
-    choice = run_game_over(screen, total_score=total_score, best_score=best_score)
-    if choice.get("quit"):
-        done = True
-        return
+
+def on_game_over(choice):
+    """the Game Over modal closed: retry, or go back to the start menu"""
     action = choice.get("action")
     if action == "retry":
-        start = True
-        reset()
-        return
-    if action == "home":
-        # Return to start menu, then reset/start
-        try:
-            global avatar
-            _menu = run_start_menu(screen)
-            if _menu.get("quit"):
-                done = True
-                return
-            else:
-                # Get selected level from menu (1-indexed, convert to 0-indexed)
-                chosen_level = _menu.get("level", level + 1)
-                level = max(0, min(chosen_level - 1, len(levels) - 1))
-                # Reload avatar if selected in menu
-                chosen_avatar_path = _menu.get("avatar_path")
-                if chosen_avatar_path:
-                    try:
-                        avatar = pygame.image.load(chosen_avatar_path).convert_alpha()
-                    except Exception:
-                        pass  # keep current avatar
-                else:
-                    selected_avatar = get_selected_avatar()
-                    try:
-                        avatar_path = os.path.join("images", "avatar", selected_avatar)
-                        if not os.path.exists(avatar_path):
-                            avatar_path = os.path.join("images", selected_avatar)
-                        avatar = pygame.image.load(avatar_path).convert_alpha()
-                    except Exception:
-                        avatar = pygame.image.load(os.path.join("images", "avatar.png")).convert_alpha()
-                start = True
-                reset()
-        except Exception:
-            # If start menu fails, fall back to retry
-            pass
+        play()
+    elif action == "home":
+        scenes.switch("menu")
+
+
+def on_menu(choice):
+    """the start menu closed: play the level picked there, or quit"""
+    global level, avatar, coins, ghost_race_level
+    if choice.get("quit"):
+        scenes.quit()
         return
+    coins = get_total_coins()  # the menu may have switched profiles
+    # Get selected level from menu (1-indexed, convert to 0-indexed)
+    chosen_level = choice.get("level", level + 1)
+    level = max(0, min(chosen_level - 1, ENDLESS_LEVEL))
+    # Load avatar from avatar_path or selected avatar from save file
+    avatar = avatar_from_menu(choice)
+    ghost_race_level = None  # the ghosts look like the avatar and win on its End tile
+    play()
+
+
+def play():
+    """(re)start the current level and hand the screen to the game"""
+    reset()
+    scenes.switch("game")
+
 
 def eval_outcome(won: bool, died: bool):
     """simple function to run the win or die screen after checking won or died"""
+    if won or died:
+        log_event(telemetry.WIN if won else telemetry.DEATH)
+        if telemetry_log is not None:
+            telemetry_log.flush()  # hands the buffer to the writer thread
+        save_ghost(won)
     if won:
         won_screen()
     if died:
+        if PRACTICE_MODE and restore_checkpoint():
+            return
         death_screen()
 
 
@@ -498,84 +526,273 @@ def block_map(level_num):
     return lvl
 
 
-def start_screen():
-    """main menu. option to switch level, and controls guide, and game overview."""
-    global level
-    if not start:
-        screen.fill(BLACK)
-        if pygame.key.get_pressed()[pygame.K_1]:
-            level = 0
-        if pygame.key.get_pressed()[pygame.K_2]:
-            level = 1
-        if pygame.key.get_pressed()[pygame.K_3]:
-            level = min(2, len(levels) - 1)
-        if pygame.key.get_pressed()[pygame.K_4]:
-            level = min(3, len(levels) - 1)
-        if pygame.key.get_pressed()[pygame.K_5]:
-            level = min(4, len(levels) - 1)
-        if pygame.key.get_pressed()[pygame.K_6]:
-            level = min(5, len(levels) - 1)
-
-        welcome = font.render(f"Welcome to Pydash. choose level({level + 1}) by keypad", True, WHITE)
-
-        controls = font.render("Controls: jump: Space/Up exit: Esc", True, GREEN)
-
-        screen.blits([[welcome, (100, 100)], [controls, (100, 400)], [tip, (100, 500)]])
-
-        level_memo = font.render(f"Level {level + 1}.", True, (255, 255, 0))
-        screen.blit(level_memo, (100, 200))
-
-
 def reset():
     """resets the sprite groups, music, etc. for death and new level"""
-    global player, elements, player_sprite, level, level_coins, new_avatar_unlocked, start_time
+    global resets
+    unload_level()
+    load_level()
+    resets += 1
+    if memory_watch is not None:
+        memory_watch.sample(f"reset {resets}")
+        print("\n".join(memory_watch.report()))
+
+
+def unload_level():
+    """drop everything the current attempt built (tiles, player, trail, checkpoints,
+    taken coins, the recorded inputs) so none of it outlives the attempt"""
+    global streamer, watcher
+    layers.clear()
+    player.kill()
+    player.particles.clear()
+    player_sprite.empty()
+    alpha_surf.fill((0, 0, 0, 0))
+    streamer = None
+    watcher = None
+    checkpoints.clear()
+    taken_coins.clear()
+    recorder.clear()
+
+
+def load_level():
+    """build the current level and a new player for a fresh attempt"""
+    global player, streamer, watcher, level_coins, new_avatar_unlocked, start_time, level_frame, scaled_level
+    if scaled_level != level:
+        viewport.clear_scaled()  # the last level's images at native scale (a retry keeps them)
+        scaled_level = level
     level_coins = 0  # reset coins for new level
+    level_frame = 0
     new_avatar_unlocked = None  # reset avatar unlock status
     start_time = time.time()  # Record start time for level
+    load_ghost_race()
+
+    # switches track only when the level's track differs, otherwise rewinds it
+    audio.play_level_music(level)
+    player = Player(player_image(), layers, (150, 150), player_sprite)
+    if level == ENDLESS_LEVEL:
+        streamer = LevelStreamer(EndlessColumns(endless_pool()), layers, screen.get_width())
+        streamer.update()
+    elif STREAM_LEVELS or levels[level].endswith(COLUMN_EXT):
+        streamer = LevelStreamer(open_columns(levels[level]), layers, screen.get_width())
+        streamer.update()
+    else:
+        grid = block_map(level_num=levels[level])
+        init_level(grid)
+        watcher = LevelWatcher(levels[level], grid, block_map)
+
+
+def soak(n):
+    """JUMP_RUSH_SOAK: n resets cycling through every level and the menu screens, with a
+    memory report every tenth of the way. Samples are only taken after whole cycles (the same
+    level is loaded each time), so n is rounded up to one. Returns 1 if memory grew past
+    SOAK_LIMIT per reset between the half-way sample and the end, 2 if n is under
+    SOAK_MIN_CYCLES cycles"""
+    global DEBUG_INVINCIBLE, PRACTICE_MODE, telemetry_log
+    DEBUG_INVINCIBLE = True  # deaths would open the Game Over screen and wait for input
+    PRACTICE_MODE = True  # keep the coins it picks up out of the save
+    if telemetry_log is not None:
+        telemetry_log.close()  # and its restarts out of the telemetry
+        telemetry_log = None
+    screens = [("game_over", {}), ("congratulations", {"level_completed": 1}), ("menu", {})]
+    game = scenes.scenes["game"]
+
+    def attempt(i):
+        global level
+        level = i % (ENDLESS_LEVEL + 1)
+        reset()
+        for frame in range(SOAK_FRAMES):
+            game.update()
+            game.draw(screen)
+        name, kwargs = screens[i % len(screens)]
+        scene = scenes.scenes[name]
+        scene.enter(screen, **kwargs)  # open the screen, draw it and close it again
+        scene.draw(screen)
+        scene.exit()
+
+    # one cycle over every level and screen first, so the caches filled on first use
+    # (fonts, backgrounds, the endless pool, music) are in the baseline
+    cycle = math.lcm(ENDLESS_LEVEL + 1, len(screens))
+    if n < SOAK_MIN_CYCLES * cycle:
+        print(f"Error: a soak needs at least {SOAK_MIN_CYCLES * cycle} resets ({SOAK_MIN_CYCLES} cycles of {cycle})")
+        return 2
+    n = -(-n // cycle) * cycle
+    step = max(n // 10 // cycle, 1) * cycle
+    half = n // cycle // 2 * cycle
+    watch = memwatch.MemoryWatch()  # before the warm-up: the level it leaves loaded must be traced too
+    for i in range(cycle):
+        attempt(i + 1)
+    watch.sample("warm-up")
+    began = time.perf_counter()
+    for i in range(1, n + 1):
+        attempt(i)
+        if i % step == 0 or i == half or i == n:
+            sample = watch.sample(f"reset {i}")
+            if i == half:
+                mid = sample
+            if i % step == 0 or i == n:
+                print("\n".join(watch.report()))
+    size, objects = watch.growth()
+    late_size, late_objects = watch.growth(mid)
+    per_reset = late_size / (n - half)
+    print(f"Soak: {n} resets in {time.perf_counter() - began:.1f}s, {size / 1024:+.1f} KB traced, "
+          f"{objects:+d} objects; second half {late_size / 1024:+.1f} KB ({per_reset:+.1f} B per reset), "
+          f"{late_objects:+d} objects")
+    watch.stop()
+    if per_reset > SOAK_LIMIT:
+        print(f"Error: memory grows by {per_reset:.0f} B per reset (limit {SOAK_LIMIT})")
+        return 1
+    return 0
+
+
+def endless_pool():
+    """chunks for endless mode, generated and jump-checked the first time it is played"""
+    global _endless_pool
+    if _endless_pool is None:
+        _endless_pool = ChunkPool(game_physics(), ENDLESS_SEED)
+    return _endless_pool
+
+
+def hot_reload():
+    """rebuild only the cells that changed in the level file, leaving the camera where it is"""
+    t = time.perf_counter()
+    changes = watcher.poll()
+    if not changes:
+        return
+    for row, col, old, new in changes:
+        for sprite in layers.at(col, row):
+            layers.remove(sprite)
+        layers.spawn(new, (col * TILE_SIZE - layers.scroll, row * TILE_SIZE))
+    # coins taken so far and the practice checkpoints point at the old level's sprites
+    if len(checkpoints):
+        print("Practice checkpoints cleared (the level changed)")
+    checkpoints.clear()
+    taken_coins.clear()
+    level_manifest.refresh()  # new size, coin count and checksum for the reloaded file
+    print(f"Reloaded {watcher.path}: {len(changes)} cells in {(time.perf_counter() - t) * 1000:.1f} ms")
+
+
+def load_ghost_race():
+    """ghosts for the current level, simulated once per level (again after a new best run)"""
+    global ghost_race, ghost_race_level
+    if not GHOST_RACE or level >= len(levels):
+        ghost_race = ghost_race_level = None
+        return
+    if ghost_race_level == level:
+        return
+    ghost_race_level = level
+    found = ghosts.find_ghosts(levels[level], level_info[level]["checksum"])
+    # the End tile is the avatar image, so the ghosts' wins depend on its size
+    physics = game_physics(end_size=avatar.get_size())
+    ghost_race = ghosts.GhostRace(levels[level], found, player_image(), physics) if found else None
+
+
+def save_ghost(won):
+    """keep the attempt that just ended as the level's best ghost if it got further than the saved one"""
+    global ghost_race_level
+    if PRACTICE_MODE or level >= len(levels):
+        return
+    name = load_game_data().get("player_name", "Player")
+    if recorder.save_if_best(levels[level], level_info[level]["checksum"], name, won):
+        ghost_race_level = None  # race the new best from the next attempt on
+
 
-    if level == 1:
-        pygame.mixer.music.load(os.path.join("music", "castle-town.mp3"))
-    pygame.mixer_music.play()
-    player_sprite = pygame.sprite.Group()
-    elements = pygame.sprite.Group()
-    player = Player(avatar, elements, (150, 150), player_sprite)
-    init_level(
-            block_map(
-                    level_num=levels[level]))
+def log_event(event):
+    """one telemetry record at the player's current level column"""
+    if telemetry_log is not None:
+        column = (player.rect.centerx + layers.scroll) // TILE_SIZE
+        telemetry_log.record(event, level, column, player.rect.y, level_frame, attempts)
+
+
+def place_checkpoint():
+    """practice mode: snapshot the run as it is now"""
+    if streamer is not None:
+        print("Warning: practice checkpoints need a fully loaded level (not streamed or endless)")
+        return
+    checkpoints.place(Snapshot(player.rect.x, player.rect.y, player.vel.x, player.vel.y, player.onGround,
+                               layers.scroll, len(taken_coins), level_coins, time.time() - start_time,
+                               fill, angle))
+
+
+def restore_checkpoint():
+    """respawn at the newest practice checkpoint, False if there is none. Moves the camera
+    back with one scroll (the same work as any frame) and puts back the coins taken
+    since; the level is not re-read and no tiles are rebuilt"""
+    global level_coins, start_time, fill, angle
+    snap = checkpoints.last()
+    if snap is None:
+        return False
+    layers.scroll_by(snap.scroll - layers.scroll)
+    for sprite, left in taken_coins[snap.taken:]:
+        layers.revive(sprite, left)
+    del taken_coins[snap.taken:]
+    player.rect.topleft = (snap.x, snap.y)
+    player.vel.update(snap.vel_x, snap.vel_y)
+    player.onGround = snap.on_ground
+    player.died = player.win = False
+    player.isjump = False
+    level_coins = snap.coins
+    start_time = time.time() - snap.elapsed
+    fill = snap.fill
+    angle = snap.angle
+    audio.play("death")
+    return True
+
+
+def draw_checkpoints(surf, scale=1):
+    """practice mode label and a diamond where each checkpoint was placed"""
+    surf.blit(hud_font(scale).render("Practice", True, GREEN), (10 * scale, surf.get_height() - 30 * scale))
+    for snap in checkpoints:
+        x = snap.x + snap.scroll - layers.scroll + PLAYER_HALF
+        y = snap.y + PLAYER_HALF
+        if -PLAYER_SIZE < x < surf.get_width() / scale + PLAYER_SIZE:
+            points = [(x, y - 8), (x + 6, y), (x, y + 8), (x - 6, y)]
+            pygame.draw.polygon(surf, GREEN, [(px * scale, py * scale) for px, py in points])
 
 
 def move_map():
-    """moves obstacles along the screen"""
-    for sprite in elements:
-        sprite.rect.x -= CameraX
+    """moves obstacles along the screen (in whole pixels, as the player's sweep assumes)"""
+    layers.scroll_by(round(CameraX))
+    if streamer is not None:
+        streamer.update()  # spawn columns coming on screen, retire those that left it
+
 
+def hud_font(scale=1):
+    """the HUD font, `scale` times its size (made once per scale)"""
+    if scale not in _hud_fonts:
+        _hud_fonts[scale] = pygame.font.SysFont("lucidaconsole", 20 * scale)
+    return _hud_fonts[scale]
 
-def draw_stats(surf, money=0):
+
+def draw_stats(surf, money=0, scale=1, images=None):
     """
     draws progress bar for level, number of attempts, displays coins collected, and progressively changes progress bar
-    colors
+    colors (`scale` times larger, with images from the ScaledSet `images` if given)
     """
     global fill
     progress_colors = [pygame.Color("red"), pygame.Color("orange"), pygame.Color("yellow"), pygame.Color("lightgreen"),
                        pygame.Color("green")]
 
-    tries = font.render(f" Attempt {str(attempts)}", True, WHITE)
+    tries = hud_font(scale).render(f" Attempt {str(attempts)}", True, WHITE)
     BAR_LENGTH = 600
     BAR_HEIGHT = 10
     for i in range(1, money):
-        screen.blit(coin, (BAR_LENGTH, 25))
-    fill += 0.5
-    outline_rect = pygame.Rect(0, 0, BAR_LENGTH, BAR_HEIGHT)
-    fill_rect = pygame.Rect(0, 0, fill, BAR_HEIGHT)
+        surf.blit(images.get(coin) if images else coin, (BAR_LENGTH * scale, 25 * scale))
+    if level < len(levels) and level_info[level]["cols"]:
+        # how far through the level the player is, from its length in the manifest
+        travelled = (player.rect.centerx + layers.scroll) / (level_info[level]["cols"] * TILE_SIZE)
+        fill = BAR_LENGTH * max(0.0, min(travelled, 1.0))
+    else:
+        fill += 0.5
+    outline_rect = pygame.Rect(0, 0, BAR_LENGTH * scale, BAR_HEIGHT * scale)
+    fill_rect = pygame.Rect(0, 0, fill * scale, BAR_HEIGHT * scale)
     # avoid out-of-range by clamping the index
     max_idx = len(progress_colors) - 1
     idx = int(fill / 100)
     if idx < 0: idx = 0
     if idx > max_idx: idx = max_idx
     col = progress_colors[idx]
-    rect(surf, col, fill_rect, 0, 4)
-    rect(surf, WHITE, outline_rect, 3, 4)
-    screen.blit(tries, (BAR_LENGTH, 0))
+    rect(surf, col, fill_rect, 0, 4 * scale)
+    rect(surf, WHITE, outline_rect, 3 * scale, 4 * scale)
+    surf.blit(tries, (BAR_LENGTH * scale, 0))
 
 def draw_leaderboard_widget(surf):
     """Draw a small leaderboard widget in top right corner during gameplay"""
@@ -611,43 +828,6 @@ def draw_leaderboard_widget(surf):
         item_rect = item_surf.get_rect(topleft=(box_rect.left + 10, y_start + i * 15))
         surf.blit(item_surf, item_rect)
 
-def wait_for_key():
-    """separate game loop for waiting for a key press while still running game loop
-    """
-    global level, start
-    waiting = True
-    # --- video/display safety guard ---
-    global screen, done
-    if not pygame.get_init():
-        pygame.init()
-    if not pygame.display.get_init():
-        pygame.display.init()
-        try:
-            screen  # ensure exists
-        except NameError:
-            try:
-                WIDTH, HEIGHT
-            except NameError:
-                WIDTH, HEIGHT = 1280, 720
-            screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    while waiting:
-        clock.tick(60)
-        pygame.display.flip()
-
-        if not start:
-            start_screen()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                done = True; waiting = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    start = True
-                    waiting = False
-                if event.key == pygame.K_ESCAPE:
-                    done = True; waiting = False
-
-
 def coin_count(coins):
     """counts coins"""
     if coins >= 3: 
@@ -656,6 +836,68 @@ def coin_count(coins):
     return coins
 
 
+def load_avatar(path):
+    """load an avatar image and remember where it came from, so the player can use
+    the pre-scaled copy from the atlas or the asset cache"""
+    global current_avatar_path, player_avatar
+    img = pygame.image.load(path).convert_alpha()
+    current_avatar_path = path
+    try:
+        player_avatar = avatars.catalogue().image(path, (PLAYER_SIZE, PLAYER_SIZE))
+    except (pygame.error, OSError):
+        player_avatar = img
+    return img
+
+
+def avatar_from_menu(menu):
+    """load the avatar picked in the start menu, else the one selected in the save, else the default"""
+    path = menu.get("avatar_path") or avatars.avatar_path(get_selected_avatar())
+    try:
+        return load_avatar(path)
+    except Exception:
+        return load_avatar(avatars.avatar_path(avatars.DEFAULT_AVATAR))
+
+
+def player_image():
+    """the current avatar for the player sprite (PLAYER_SIZE copy from the atlas if packed)"""
+    if atlas is not None and current_avatar_path and current_avatar_path in atlas:
+        img = atlas.get(current_avatar_path)
+        asset_cache.remember(img, current_avatar_path, alpha=True)  # native mode scales it from the file
+        return img
+    return player_avatar
+
+
+def load_tile_image(filename):
+    """a TILE_SIZE tile image: a subsurface of the atlas, or the pre-scaled copy from the asset cache"""
+    path = os.path.join("images", filename)
+    if atlas is not None and path in atlas:
+        img = atlas.get(path)
+        asset_cache.remember(img, path, alpha=True)  # native mode scales it from the file
+        return img
+    return asset_cache.load_scaled(path, (TILE_SIZE, TILE_SIZE), alpha=True)
+
+
+def startup_images(tiles, folder="images/background", default_path=os.path.join("images", "bg.png")):
+    """(path, size, alpha) for the tiles and backgrounds loaded at startup, so
+    asset_cache.warm can scale whichever aren't cached yet all at once"""
+    items = [(os.path.join("images", fn), (TILE_SIZE, TILE_SIZE), True) for fn in tiles
+             if atlas is None or os.path.join("images", fn) not in atlas]
+    paths = [default_path]
+    if os.path.isdir(folder):
+        entries = sorted(os.listdir(folder))
+        level_dirs = [os.path.join(folder, e) for e in entries if os.path.isdir(os.path.join(folder, e))]
+        if level_dirs:
+            # load_backgrounds uses the first image of each level folder
+            for d in level_dirs:
+                imgs = sorted(f for f in os.listdir(d) if os.path.isfile(os.path.join(d, f)))
+                paths += [os.path.join(d, imgs[0])] if imgs else []
+        else:
+            paths += [os.path.join(folder, f) for f in entries if os.path.isfile(os.path.join(folder, f))]
+    items += [(p, screen.get_size(), False) for p in paths]
+    k = viewport.native_scale  # native mode: the copies it draws with too
+    return items + [(p, (w * k, h * k), alpha) for p, (w, h), alpha in items] if k > 1 else items
+
+
 def resize(img, size=(TILE_SIZE, TILE_SIZE)):
     """resize images
     :param img: image to resize
@@ -674,9 +916,12 @@ def resize(img, size=(TILE_SIZE, TILE_SIZE)):
 Global variables
 """
 font = pygame.font.SysFont("lucidaconsole", 20)
+_hud_fonts = {1: font}  # scale -> font (see hud_font)
 
 # square block face is main character the icon of the window is the block face
-avatar = pygame.image.load(os.path.join("images", "avatar.png")).convert_alpha()  # load the main character
+current_avatar_path = None  # file the current avatar came from (set by load_avatar)
+player_avatar = None  # PLAYER_SIZE copy of it (set by load_avatar)
+avatar = load_avatar(avatars.avatar_path(avatars.DEFAULT_AVATAR))  # load the main character
 # Prefer a project logo at images/logo/logo.png. If not present, try the original jpeg, else use avatar.
 logo_png = os.path.join("images", "logo", "logo.png")
 logo_jpeg = os.path.join("images", "logo", "8BD04758-5515-4BA2-986B-ADB32483A7BC_4_5005_c.jpeg")
@@ -695,28 +940,44 @@ else:
     pygame.display.set_icon(avatar)
 #  this surface has an alpha value with the colors, so the player trail will fade away using opacity
 alpha_surf = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+_rotations = {}  # snapped angle -> rotated player image (see blitRotate), plus the source "image"
+# rendering quality: "auto" adapts to the measured frame time, Q cycles through the choices
+quality = QualityController(get_setting("quality", "auto"))
 
 # sprite groups
 player_sprite = pygame.sprite.Group()
-elements = pygame.sprite.Group()
-
-# images
-spike = pygame.image.load(os.path.join("images", "obj-spike.png"))
-spike = resize(spike, (TILE_SIZE, TILE_SIZE))
-coin = pygame.image.load(os.path.join("images", "coin.png"))
-coin = pygame.transform.smoothscale(coin, (TILE_SIZE, TILE_SIZE))
-block = pygame.image.load(os.path.join("images", "block_1.png"))
-block = pygame.transform.smoothscale(block, (TILE_SIZE, TILE_SIZE))
-orb = pygame.image.load((os.path.join("images", "orb-yellow.png")))
-orb = pygame.transform.smoothscale(orb, (TILE_SIZE, TILE_SIZE))
-trick = pygame.image.load((os.path.join("images", "obj-breakable.png")))
-trick = pygame.transform.smoothscale(trick, (TILE_SIZE, TILE_SIZE))
+layers = TileLayers(TILE_SIZE)  # tiles by collision layer
+streamer = None  # LevelStreamer when the level is streamed
+watcher = None  # LevelWatcher for the loaded level file (used when DEBUG_HOT_RELOAD is on)
+elements = layers.all  # every tile, for scrolling and drawing
+
+# images (one pre-scaled atlas when built with `python atlas.py`, else one file each)
+atlas = load_atlas(TILE_SIZE, PLAYER_SIZE)
+# first launch: smoothscale everything not in images/.cache yet on all cores; later launches only read it
+asset_cache.warm(startup_images(["obj-spike.png", "coin.png", "block_1.png", "orb-yellow.png", "obj-breakable.png"]))
+spike = load_tile_image("obj-spike.png")
+coin = load_tile_image("coin.png")
+block = load_tile_image("block_1.png")
+orb = load_tile_image("orb-yellow.png")
+trick = load_tile_image("obj-breakable.png")
+
+# level tokens -> tile class, collision layer and image. Add new tile types here.
+register_tile("0", Platform, SOLID, lambda: block)
+register_tile("Coin", Coin, PICKUP, lambda: coin)
+# spikes only hurt inside the shrunk hitbox (trimmed sides, top part only) and
+# only where the spike image is opaque
+register_tile("Spike", Spike, HAZARD, lambda: spike,
+              hitbox=SPIKE_HITBOX, use_mask=True)
+register_tile("Orb", Orb, TRIGGER, lambda: orb)
+register_tile("T", Trick, DECOR, lambda: trick)
+register_tile("End", End, GOAL, lambda: avatar)
 
 #  ints
 fill = 0
 num = 0
 CameraX = 0
 attempts = 0
+level_frame = 0  # frames since the level (re)started
 coins = get_total_coins()  # Load total coins from save file
 level_coins = 0  # coins collected in current level
 new_avatar_unlocked = None  # track if avatar was unlocked this level
@@ -726,12 +987,22 @@ start_time = 0  # Track level start time
 level_start_time = 0
 
 # list
-particles = []
-orbs = []
+taken_coins = []  # (coin sprite, level x) in the order they were collected this run
+checkpoints = Checkpoints()
+telemetry_log = telemetry.TelemetryLog() if TELEMETRY else None
+resets = 0  # level (re)starts this session
+memory_watch = None  # memwatch.MemoryWatch while DEBUG_MEMORY is on
+recorder = ghosts.Recorder()  # the jump key each frame of this attempt, saved as a ghost if it's the best
+ghost_race = None  # ghosts.GhostRace for the current level
+ghost_race_level = None  # level ghost_race was loaded for
+scaled_level = None  # level the viewport's native-scale images were made for
 win_cubes = []
 
 # initialize level with
-levels = ["level_1.csv", "level_2.csv", "level_3.csv", "level_4.csv", "level_5.csv"]
+level_info = level_manifest.manifest()  # size, coin count, ... of each level (see level_manifest.py)
+levels = [info["file"] for info in level_info]
+ENDLESS_LEVEL = len(levels)  # menu entry after the last level: endless mode (see endless.py)
+_endless_pool = None
 level_list = block_map(levels[level])
 level_width = (len(level_list[0]) * TILE_SIZE)
 level_height = len(level_list) * TILE_SIZE
@@ -743,9 +1014,9 @@ pygame.display.set_caption('Pydash: Geometry Dash in Python')
 # initialize the font variable to draw text later
 text = font.render('image', False, (255, 255, 0))
 
-# music
-music = pygame.mixer_music.load(os.path.join("music", "bossfight-Vextron.mp3"))
-pygame.mixer_music.play()
+# music and sound effects (everything is loaded here, not when a level starts)
+audio = AudioManager(preload_music=True)  # level changes switch to decoded tracks, no file loads
+audio.play_music(audio.track_for(0))
 
 # bg image
 # Backgrounds: load per-level backgrounds from images/background, fallback to images/bg.png
@@ -771,9 +1042,7 @@ def load_backgrounds(folder="images/background", default_path=os.path.join("imag
                         for fn in imgs:
                             fpath = os.path.join(dpath, fn)
                             try:
-                                img = pygame.image.load(fpath).convert()
-                                img = pygame.transform.smoothscale(img, screen.get_size())
-                                loaded = img
+                                loaded = asset_cache.load_scaled(fpath, screen.get_size())
                                 break
                             except Exception:
                                 continue
@@ -789,17 +1058,14 @@ def load_backgrounds(folder="images/background", default_path=os.path.join("imag
                 files = sorted([f for f in entries if os.path.isfile(os.path.join(folder, f))])
                 for fn in files:
                     try:
-                        img = pygame.image.load(os.path.join(folder, fn)).convert()
-                        img = pygame.transform.smoothscale(img, screen.get_size())
-                        bgs.append(img)
+                        bgs.append(asset_cache.load_scaled(os.path.join(folder, fn), screen.get_size()))
                     except Exception:
                         pass
     except Exception:
         pass
     # load default as separate surface for fallback
     try:
-        default_bg = pygame.image.load(default_path).convert()
-        default_bg = pygame.transform.smoothscale(default_bg, screen.get_size())
+        default_bg = asset_cache.load_scaled(default_path, screen.get_size())
     except Exception:
         # create a plain surface if default missing
         default_bg = pygame.Surface(screen.get_size())
@@ -810,120 +1076,119 @@ def load_backgrounds(folder="images/background", default_path=os.path.join("imag
 backgrounds, default_bg = load_backgrounds()
 
 # create object of player class
-player = Player(avatar, elements, (150, 150), player_sprite)
+player = Player(player_image(), layers, (150, 150), player_sprite)
 
-# show tip on start and on death
-tip = font.render("tip: tap and hold for the first few seconds of the level", True, BLUE)
 
-# -------------------- Jump Rush Start Menu Integration --------------------
-import sys, pygame
-pygame.display.set_caption("Jump Rush — Menu")
+class Game(Scene):
+    """the level being played: physics and drawing every frame, debug keys from the events"""
 
-_stages = [f"Level {i}" for i in range(1, len(levels) + 1)]
+    tapped = False  # a jump key went down this frame (only kept in low-latency mode)
 
-_menu = run_start_menu(screen, stages=_stages)
-
-if _menu.get("quit"):
-    pass; sys.exit()
-
-# Get selected level from menu (1-indexed, convert to 0-indexed)
-chosen_level = _menu.get("level", 1)
-level = max(0, min(chosen_level - 1, len(levels) - 1))
-
-# Load avatar from avatar_path or selected avatar from save file
-chosen_avatar_path = _menu.get("avatar_path")
-if chosen_avatar_path:
-    try:
-        avatar = pygame.image.load(chosen_avatar_path).convert_alpha()
-    except Exception:
-        # fallback to default if load fails
-        avatar = pygame.image.load(os.path.join("images", "avatar.png")).convert_alpha()
-else:
-    # Load selected avatar from save file
-    selected_avatar = get_selected_avatar()
-    try:
-        # Try images/avatar/ directory first
-        avatar_path = os.path.join("images", "avatar", selected_avatar)
-        if not os.path.exists(avatar_path):
-            # Fallback to images/ directory
-            avatar_path = os.path.join("images", selected_avatar)
-        avatar = pygame.image.load(avatar_path).convert_alpha()
-    except Exception:
-        # Ultimate fallback
-        avatar = pygame.image.load(os.path.join("images", "avatar.png")).convert_alpha()
-
-# Example of swapping avatar if you have assets:
-# if chosen_char == "Slime":
-#     avatar = pygame.image.load(os.path.join("images", "slime.png")).convert_alpha()
-
-start = True
-reset()
-# --------------------------------------------------------------------------
-while not done:
-    keys = pygame.key.get_pressed()
-    # Handle debug toggles (once per keydown, so we rely on event loop below to flip states)
-    # Apply easy mode values
-    if DEBUG_EASY_MODE:
-        GRAVITY.y = EASY_GRAVITY * GAME_SPEED
-        player.jump_amount = EASY_JUMP * GAME_SPEED
-    else:
-        GRAVITY.y = GRAVITY_BASE * GAME_SPEED
-        player.jump_amount = JUMP_BASE * GAME_SPEED
-
-    if not start:
-        wait_for_key()
-        reset()
-
-        start = True
-
-    # horizontal speed scaled by GAME_SPEED
-    player.vel.x = PLAYER_SPEED * GAME_SPEED
-
-    eval_outcome(player.win, player.died)
-    if keys[pygame.K_UP] or keys[pygame.K_SPACE]:
-        player.isjump = True
-
-    # Reduce the alpha of all pixels on this surface each frame.
-    # Control the fade2 speed with the alpha value.
-
-    alpha_surf.fill((255, 255, 255, 1), special_flags=pygame.BLEND_RGBA_MULT)
-
-    player_sprite.update()
-    CameraX = player.vel.x  # for moving obstacles (already scaled by GAME_SPEED)
-    move_map()  # apply CameraX to all elements
-
-    # Choose per-level background if available, otherwise fallback to default
-    try:
-        # Force level 1 (index 0) to use the default background
-        if level == 0:
+    def update(self):
+        global keys, jump_held, CameraX, level_frame
+        keys = pygame.key.get_pressed()
+        jump_held = keys[pygame.K_UP] or keys[pygame.K_SPACE] or self.tapped
+        self.tapped = False
+        # Handle debug toggles (once per keydown, so we rely on handle() to flip states)
+        # Apply easy mode values
+        if DEBUG_EASY_MODE:
+            GRAVITY.y = EASY_GRAVITY * GAME_SPEED
+            player.jump_amount = EASY_JUMP * GAME_SPEED
+        else:
+            GRAVITY.y = GRAVITY_BASE * GAME_SPEED
+            player.jump_amount = JUMP_BASE * GAME_SPEED
+
+        # horizontal speed scaled by GAME_SPEED
+        player.vel.x = PLAYER_SPEED * GAME_SPEED
+
+        eval_outcome(player.win, player.died)
+        if scenes.switching:
+            return  # won or died: the next screen takes over
+        if jump_held:
+            player.isjump = True
+        recorder.record(jump_held)
+        if DEBUG_EASY_MODE or DEBUG_NOCLIP or DEBUG_INVINCIBLE or DEBUG_PASS_SPIKES or DEBUG_HOT_RELOAD:
+            recorder.spoiled = True  # a ghost of this run wouldn't replay the same
+
+        # Reduce the alpha of all pixels on this surface each frame.
+        # Control the fade2 speed with the alpha value.
+
+        tier = quality.tier
+        if tier["trail"] == "fade":
+            alpha_surf.fill((255, 255, 255, 1), special_flags=pygame.BLEND_RGBA_MULT)
+        elif tier["trail"] == "clear":
+            alpha_surf.fill((0, 0, 0, 0))
+
+        player_sprite.update()
+        level_frame += 1
+        CameraX = player.vel.x  # for moving obstacles (already scaled by GAME_SPEED)
+        move_map()  # apply CameraX to all elements
+        if DEBUG_HOT_RELOAD and watcher is not None:
+            hot_reload()
+
+    def draw(self, screen):
+        global angle, alpha_surf
+        tier = quality.tier
+        # native mode: draw straight into the window, k times larger, with images pre-scaled for k
+        k = viewport.native_scale
+        images = None
+        if k > 1:
+            screen = viewport.native_target()
+            images = viewport.scaled(k)
+        if alpha_surf.get_size() != screen.get_size():
+            alpha_surf = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        # Choose per-level background if available, otherwise fallback to default
+        try:
+            # Force level 1 (index 0) to use the default background
+            if level == 0:
+                bg_to_draw = default_bg
+            else:
+                bg_to_draw = backgrounds[level] if 0 <= level < len(backgrounds) else default_bg
+        except Exception:
             bg_to_draw = default_bg
+        screen.blit(images.get(bg_to_draw) if images else bg_to_draw, (0, 0))  # Clear the screen(with the bg)
+
+        if tier["trail"]:
+            player.draw_particle_trail(player.rect.left - 1, player.rect.bottom + 2,
+                                       WHITE, limit=tier["particles"], scale=k)
+            screen.blit(alpha_surf, (0, 0))  # Blit the alpha_surf onto the screen.
+        draw_stats(screen, coin_count(coins), k, images)
+        if ghost_race is not None and not PRACTICE_MODE:
+            ghost_race.draw(screen, level_frame, layers.scroll, k)
+
+        avatar_img = images.get(player.image) if images else player.image
+        if player.isjump:
+            # rotate the player by an angle and blit it if player is jumping
+            angle -= 8.1712  # this may be the angle needed to do a 360 deg turn in the length covered in one jump by player
+            blitRotate(screen, avatar_img, (player.rect.centerx * k, player.rect.centery * k),
+                       (PLAYER_HALF * k, PLAYER_HALF * k), angle, step=tier["rotation_step"])
+        elif images:
+            screen.blit(avatar_img, (player.rect.x * k, player.rect.y * k))
         else:
-            bg_to_draw = backgrounds[level] if 0 <= level < len(backgrounds) else default_bg
-    except Exception:
-        bg_to_draw = default_bg
-    screen.blit(bg_to_draw, (0, 0))  # Clear the screen(with the bg)
-
-    player.draw_particle_trail(player.rect.left - 1, player.rect.bottom + 2,
-                               WHITE)
-    screen.blit(alpha_surf, (0, 0))  # Blit the alpha_surf onto the screen.
-    draw_stats(screen, coin_count(coins))
-
-    if player.isjump:
-        # rotate the player by an angle and blit it if player is jumping
-        angle -= 8.1712  # this may be the angle needed to do a 360 deg turn in the length covered in one jump by player
-        blitRotate(screen, player.image, player.rect.center, (PLAYER_HALF, PLAYER_HALF), angle)
-    else:
-        # if player.isjump is false, then just blit it normally (by using Group().draw() for sprites)
-        player_sprite.draw(screen)  # draw player sprite group
-    elements.draw(screen)  # draw all other obstacles
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            done = True
+            # if player.isjump is false, then just blit it normally (by using Group().draw() for sprites)
+            player_sprite.draw(screen)  # draw player sprite group
+        layers.draw(screen, k, images.get if images else None)  # draw all other obstacles (only the columns on screen)
+        if PRACTICE_MODE:
+            draw_checkpoints(screen, k)
+        return True
+
+    def end_frame(self, work_ms):
+        if quality.frame(work_ms):
+            print(f"Quality: {quality.name} (frames took {quality.last_ms:.1f} ms)")
+        meter = scenes.latency
+        if meter is not None and meter.frames >= LATENCY_REPORT_FRAMES:
+            print(f"Latency{' (low-latency mode)' if LOW_LATENCY else ''}: {meter.summary()}")
+            meter.frames = 0
+
+    def handle(self, event):
+        global DEBUG_EASY_MODE, DEBUG_NOCLIP, DEBUG_PASS_SPIKES, DEBUG_INVINCIBLE, DEBUG_HOT_RELOAD, DEBUG_MEMORY
+        global PRACTICE_MODE, GHOST_RACE, memory_watch, level, DEBUG_LATENCY, LOW_LATENCY
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
+            if event.key in JUMP_KEYS and LOW_LATENCY:
+                self.tapped = True
+            elif event.key == pygame.K_ESCAPE:
                 """User friendly exit"""
-                done = True
+                scenes.quit()
             elif event.key == pygame.K_e:
                 DEBUG_EASY_MODE = not DEBUG_EASY_MODE
             elif event.key == pygame.K_g:
@@ -935,6 +1200,55 @@ while not done:
             elif event.key == pygame.K_v:
                 # Toggle invincibility
                 DEBUG_INVINCIBLE = not DEBUG_INVINCIBLE
+            elif event.key == pygame.K_q:
+                # Cycle the quality setting (auto, high, medium, low) and remember it
+                choice = QUALITY_CHOICES[(QUALITY_CHOICES.index(quality.override) + 1) % len(QUALITY_CHOICES)]
+                quality.set_override(choice)
+                set_setting("quality", choice)
+                print(f"Quality: {choice} ({quality.name})")
+            elif event.key == pygame.K_p:
+                # Toggle practice mode; leaving it restarts the level for a real run
+                PRACTICE_MODE = not PRACTICE_MODE
+                print(f"Practice mode {'on' if PRACTICE_MODE else 'off'}")
+                if PRACTICE_MODE:
+                    checkpoints.clear()
+                else:
+                    reset()
+            elif event.key == pygame.K_h:
+                # Toggle the ghost race and remember it
+                GHOST_RACE = not GHOST_RACE
+                set_setting("ghosts", GHOST_RACE)
+                print(f"Ghost race {'on' if GHOST_RACE else 'off'}")
+                load_ghost_race()
+            elif event.key == pygame.K_c and PRACTICE_MODE:
+                place_checkpoint()
+            elif event.key == pygame.K_BACKSPACE and PRACTICE_MODE:
+                checkpoints.remove_last()
+            elif event.key == pygame.K_r:
+                # Toggle hot reload of the level file
+                DEBUG_HOT_RELOAD = not DEBUG_HOT_RELOAD
+                print(f"Level hot reload {'on' if DEBUG_HOT_RELOAD else 'off'}")
+            elif event.key == pygame.K_m:
+                # Toggle memory watching: every reset reports what grew since the last one
+                DEBUG_MEMORY = not DEBUG_MEMORY
+                print(f"Memory watch {'on' if DEBUG_MEMORY else 'off'}")
+                if DEBUG_MEMORY:
+                    memory_watch = memwatch.MemoryWatch()
+                    memory_watch.sample(f"reset {resets}")
+                else:
+                    memory_watch.stop()
+                    memory_watch = None
+            elif event.key == pygame.K_l:
+                # Toggle low-latency input and remember it
+                LOW_LATENCY = not LOW_LATENCY
+                set_setting("low_latency", LOW_LATENCY)
+                scenes.set_precise(LOW_LATENCY)
+                print(f"Low-latency input {'on' if LOW_LATENCY else 'off'}")
+            elif event.key == pygame.K_k:
+                # Toggle latency measurement: a report every LATENCY_REPORT_FRAMES frames
+                DEBUG_LATENCY = not DEBUG_LATENCY
+                scenes.latency = LatencyMeter() if DEBUG_LATENCY else None
+                print(f"Latency measurement {'on' if DEBUG_LATENCY else 'off'}")
             elif event.key == pygame.K_F1:
                 level = 0
                 reset()
@@ -962,6 +1276,18 @@ while not done:
 
                 player.jump_amount -= 1
 
-    pygame.display.flip()
-    clock.tick(60)
-pygame.quit()
\ No newline at end of file
+
+# the start menu, the game and the screens between attempts, all run by one loop (see scenes.py)
+scenes = SceneManager(viewport, precise=LOW_LATENCY)
+scenes.add("menu", StartMenu(on_menu))
+scenes.add("game", Game())
+scenes.add("game_over", GameOver(on_game_over))
+scenes.add("congratulations", Congratulations(on_congratulations))
+
+if SOAK_RESETS:
+    sys.exit(soak(SOAK_RESETS))
+
+scenes.run("menu")
+if telemetry_log is not None:
+    telemetry_log.close()
+pygame.quit()
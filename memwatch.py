@@ -0,0 +1,87 @@
+#  filename: memwatch.py
+#  Memory growth between samples: tracemalloc totals, the lines that allocated
+#  the growth, and live object counts by type
+#
+#  main.py takes a sample on every level reset when memory watching is on (M),
+#  and JUMP_RUSH_SOAK=<resets> runs that many resets headless and reports
+#  whether memory stayed flat.
+
+import gc
+import tracemalloc
+from collections import Counter, namedtuple
+
+TRACE_FRAMES = 1  # stack depth kept per allocation (1 is enough to name the line)
+TOP_LINES = 5  # source lines listed in a report
+TOP_TYPES = 5  # object types listed in a report
+# ignore the samples kept here, tracemalloc's own allocations and the import system
+IGNORE = (tracemalloc.Filter(False, __file__),
+          tracemalloc.Filter(False, tracemalloc.__file__),
+          tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+          tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+          tracemalloc.Filter(False, "<unknown>"))
+
+Sample = namedtuple("Sample", "label traced objects snapshot")
+
+
+def object_counts():
+    """Live gc-tracked objects by type name (after a full collection)."""
+    gc.collect()
+    counts = Counter()
+    for o in gc.get_objects():
+        counts[type(o).__name__] += 1  # counted here so the Counter is allocated in this file (see IGNORE)
+    return counts
+
+
+class MemoryWatch:
+    """Samples taken at comparable points (say, right after a reset), each
+    compared with the previous one or with the first (the only ones kept).
+
+    Starts tracemalloc if nothing else has; stop() only stops it in that case.
+    """
+
+    def __init__(self, frames=TRACE_FRAMES):
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start(frames)
+        self.samples = []
+        self.sample("start")  # the first filtering compiles IGNORE's patterns: keep that out of the samples
+        self.samples = []
+
+    def stop(self):
+        if self.started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.samples = []
+
+    def sample(self, label=""):
+        """Record the traced size and object counts now; returns the Sample."""
+        counts = object_counts()
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORE)
+        s = Sample(label, sum(stat.size for stat in snapshot.statistics("filename")), counts, snapshot)
+        # reports compare with the first or the previous sample, so only those are kept
+        self.samples = self.samples[:1] + self.samples[1:][-1:] + [s]
+        return s
+
+    def growth(self, since=0):
+        """(bytes, objects) gained from sample `since` (an index into the kept samples, or a
+        Sample returned by sample()) to the latest one."""
+        first = since if isinstance(since, Sample) else self.samples[since]
+        last = self.samples[-1]
+        return last.traced - first.traced, sum(last.objects.values()) - sum(first.objects.values())
+
+    def report(self, since=-2):
+        """Lines describing the growth from sample `since` to the latest one."""
+        if len(self.samples) < 2:
+            return [f"{self.samples[-1].label}: {self.samples[-1].traced / 1024:.1f} KB traced (first sample)"]
+        first, last = self.samples[since], self.samples[-1]
+        size, objects = self.growth(since)
+        lines = [f"{last.label}: {size / 1024:+.1f} KB traced, {objects:+d} objects since {first.label}"]
+        types = (last.objects - first.objects).most_common(TOP_TYPES)
+        if types:
+            lines.append("  objects: " + ", ".join(f"{name} +{n}" for name, n in types))
+        if first.snapshot is not None:
+            for stat in last.snapshot.compare_to(first.snapshot, "lineno")[:TOP_LINES]:
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    lines.append(f"  {frame.filename}:{frame.lineno}: {stat.size_diff / 1024:+.1f} KB"
+                                 f" ({stat.count_diff:+d} blocks)")
+        return lines
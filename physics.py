@@ -0,0 +1,46 @@
+#  filename: physics.py
+#  The numbers the player moves with, shared by the game, the endless-mode
+#  jumpability check (endless.py) and the bot environment (vec_env.py)
+
+GRAVITY_BASE = 0.86  # added to the vertical speed every frame (times GAME_SPEED)
+JUMP_BASE = 13.5  # was 10, slight increase for clearing 2-tile spike gaps
+ORB_JUMP = 12  # jump strength when bouncing off an orb
+# game speed scaling: values < 1.0 slow the game, values > 1.0 speed it up
+GAME_SPEED = 0.7
+# base horizontal speed for the player (will be multiplied by GAME_SPEED)
+PLAYER_SPEED = 6
+# tile size (width and height of map tiles / sprites)
+TILE_SIZE = 32
+# player size (smaller than a tile)
+PLAYER_SIZE = 20
+# the part of a spike tile that can kill (x, y, w, h within the tile)
+SPIKE_HITBOX = (7, 2, TILE_SIZE - 14, TILE_SIZE - 8)
+
+
+class Physics:
+    """The per-frame numbers Player.update moves with, for the jumpability check.
+
+    Pass the values the game actually runs at (GRAVITY and JUMP_BASE already
+    scaled by GAME_SPEED, and the horizontal speed in whole pixels, which is how
+    the map scrolls); game_physics() gives those. `end_size` is the (w, h) the
+    End tile reaches from its cell's top-left: the game draws it as the avatar
+    image, unscaled, so it is the avatar's size (None: the default avatar's).
+    """
+
+    def __init__(self, gravity, jump, speed, orb_jump=ORB_JUMP, tile=TILE_SIZE, player=PLAYER_SIZE,
+                 spike_hitbox=SPIKE_HITBOX, max_fall=100, end_size=None):
+        self.gravity = gravity
+        self.jump = jump
+        self.speed = speed
+        self.orb_jump = orb_jump
+        self.tile = tile
+        self.player = player
+        self.spike_hitbox = spike_hitbox
+        self.max_fall = max_fall
+        self.end_size = end_size
+
+
+def game_physics(end_size=None):
+    """The numbers main.py runs at (GRAVITY_BASE, JUMP_BASE and PLAYER_SPEED scaled by GAME_SPEED)."""
+    return Physics(GRAVITY_BASE * GAME_SPEED, JUMP_BASE * GAME_SPEED, round(PLAYER_SPEED * GAME_SPEED),
+                   end_size=end_size)
@@ -0,0 +1,88 @@
+#  filename: quality.py
+#  Rendering quality tiers and the frame-time controller that picks one
+
+from collections import deque
+
+# cheapest first. trail: "fade" keeps last frame's trail and fades it (a full
+# screen alpha multiply, by far the most expensive thing drawn), "clear" wipes
+# the trail layer instead (looks the same: the fade leaves alpha at 1/255),
+# None skips the trail layer altogether. particles caps the trail length
+# (None = no cap). rotation_step snaps the jump spin to this many degrees so
+# rotated player images can be cached (0 = exact angle, rotated every frame).
+TIERS = [
+    {"name": "low", "trail": None, "particles": 0, "rotation_step": 15},
+    {"name": "medium", "trail": "clear", "particles": 8, "rotation_step": 5},
+    {"name": "high", "trail": "fade", "particles": None, "rotation_step": 0},
+]
+TIER_NAMES = [tier["name"] for tier in TIERS]
+QUALITY_CHOICES = ["auto"] + TIER_NAMES[::-1]
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class QualityController:
+    """Steps the tier down when the rolling frame time misses the budget and
+    back up when there is headroom.
+
+    Feed it the time spent on each frame's work (not the time clock.tick
+    sleeps). Decisions are made on a full window of frames; after a step up
+    that has to be undone, the next step up waits twice as long, so a machine
+    sitting right at the edge settles instead of flickering between tiers.
+    `override` is "auto" or a tier name.
+    """
+
+    def __init__(self, override="auto", budget_ms=FRAME_BUDGET_MS, window=60, headroom=0.6):
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.samples = deque(maxlen=window)
+        self.level = len(TIERS) - 1
+        self.up_wait = window * 2  # frames of headroom needed before stepping up
+        self.calm = 0  # consecutive frames with headroom
+        self.stepped_up = False  # last change was a step up
+        self.last_ms = 0.0  # rolling average behind the last decision
+        self.override = "auto"
+        self.set_override(override)
+
+    @property
+    def tier(self):
+        return TIERS[self.level]
+
+    @property
+    def name(self):
+        return self.tier["name"]
+
+    def set_override(self, value):
+        """Pin a tier by name, or hand control back to the controller with "auto"."""
+        if value != "auto" and value not in TIER_NAMES:
+            print(f"Warning: unknown quality '{value}', using auto")
+            value = "auto"
+        self.override = value
+        if value != "auto":
+            self.level = TIER_NAMES.index(value)
+        self.samples.clear()
+        self.calm = 0
+
+    def frame(self, work_ms):
+        """Record one frame; returns True if the tier changed."""
+        if self.override != "auto":
+            return False
+        self.samples.append(work_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return False
+        avg = self.last_ms = sum(self.samples) / len(self.samples)
+        if avg > self.budget_ms and self.level > 0:
+            if self.stepped_up:
+                self.up_wait = min(self.up_wait * 2, 60 * 60)
+            self._step(-1)
+            return True
+        self.calm = self.calm + 1 if avg < self.budget_ms * self.headroom else 0
+        if self.calm >= self.up_wait and self.level < len(TIERS) - 1:
+            self._step(+1)
+            return True
+        return False
+
+    def _step(self, direction):
+        self.level += direction
+        self.stepped_up = direction > 0
+        self.samples.clear()
+        self.calm = 0
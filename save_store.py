@@ -0,0 +1,270 @@
+#  filename: save_store.py
+#  Optional SQLite backend for game_save: many local profiles in one database
+
+import json
+import os
+import sqlite3
+import sys
+
+DB_FILE = "game_save.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name            TEXT PRIMARY KEY,
+    total_coins     INTEGER NOT NULL DEFAULT 0,
+    selected_avatar TEXT
+);
+CREATE TABLE IF NOT EXISTS unlocked_avatars (
+    profile TEXT NOT NULL REFERENCES profiles(name),
+    avatar  TEXT NOT NULL,
+    PRIMARY KEY (profile, avatar)
+);
+CREATE TABLE IF NOT EXISTS completed_levels (
+    profile TEXT NOT NULL REFERENCES profiles(name),
+    level   INTEGER NOT NULL,
+    PRIMARY KEY (profile, level)
+);
+CREATE TABLE IF NOT EXISTS best_times (
+    profile TEXT NOT NULL REFERENCES profiles(name),
+    level   INTEGER NOT NULL,
+    time    REAL NOT NULL,
+    PRIMARY KEY (profile, level)
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_coins ON profiles (total_coins DESC);
+CREATE INDEX IF NOT EXISTS idx_best_times_level ON best_times (level, time);
+"""
+
+# sqlite3 keeps a per-connection cache of compiled statements keyed by the SQL
+# text, so reusing these exact strings means they are prepared only once.
+SQL_ENSURE_PROFILE = "INSERT OR IGNORE INTO profiles (name, selected_avatar) VALUES (?, ?)"
+SQL_GET_COINS = "SELECT total_coins FROM profiles WHERE name = ?"
+SQL_ADD_COINS = "UPDATE profiles SET total_coins = total_coins + ? WHERE name = ?"
+SQL_SET_COINS = "UPDATE profiles SET total_coins = ? WHERE name = ?"
+SQL_MAX_COINS = "UPDATE profiles SET total_coins = MAX(total_coins, ?) WHERE name = ?"
+SQL_UNLOCK_AVATAR = "INSERT OR IGNORE INTO unlocked_avatars (profile, avatar) VALUES (?, ?)"
+SQL_COMPLETE_LEVEL = "INSERT OR IGNORE INTO completed_levels (profile, level) VALUES (?, ?)"
+SQL_SET_BEST_TIME = """
+INSERT INTO best_times (profile, level, time) VALUES (?, ?, ?)
+ON CONFLICT (profile, level) DO UPDATE SET time = MIN(time, excluded.time)
+"""
+SQL_SELECT_AVATAR = "UPDATE profiles SET selected_avatar = ? WHERE name = ?"
+SQL_TOP_COINS = "SELECT name, total_coins FROM profiles ORDER BY total_coins DESC LIMIT ?"
+SQL_TOP_TIMES = "SELECT profile, time FROM best_times WHERE level = ? ORDER BY time LIMIT ?"
+SQL_TIMED_LEVELS = "SELECT DISTINCT level FROM best_times ORDER BY level"
+SQL_PROFILE_NAMES = "SELECT name FROM profiles ORDER BY name"
+
+
+class SaveStore:
+    """SQLite-backed save data for any number of player profiles.
+
+    The database runs in WAL mode so several game instances can read while one
+    writes. Every write is a single short transaction that changes only the
+    affected rows (coins are incremented, best times keep the minimum), so
+    concurrent instances never overwrite each other's progress. Reads never
+    take the write lock: a profile that doesn't exist yet reads as a new one
+    and is only created by the first write.
+    """
+
+    def __init__(self, path=DB_FILE, default_avatars=()):
+        self.path = path
+        self.default_avatars = list(default_avatars)
+        # isolation_level=None: we issue BEGIN IMMEDIATE ourselves so the write
+        # lock is taken up front instead of failing halfway through a transaction
+        self.conn = sqlite3.connect(path, timeout=10.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=10000")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self):
+        return _Transaction(self.conn)
+
+    def _ensure_profile(self, name):
+        """Create the profile with the default avatars (call inside a transaction)."""
+        cur = self.conn.execute(SQL_ENSURE_PROFILE, (name, self.default_avatars[0] if self.default_avatars else None))
+        if cur.rowcount:
+            for av in self.default_avatars:
+                self.conn.execute(SQL_UNLOCK_AVATAR, (name, av))
+
+    def ensure_profile(self, name):
+        with self._write():
+            self._ensure_profile(name)
+
+    # -------------------- Hot paths --------------------
+
+    def add_coins(self, name, amount):
+        """Atomically add coins to a profile. Returns (old_total, new_total)."""
+        with self._write():
+            self._ensure_profile(name)
+            (old,) = self.conn.execute(SQL_GET_COINS, (name,)).fetchone()
+            self.conn.execute(SQL_ADD_COINS, (amount, name))
+        return old, old + amount
+
+    def unlock_avatar(self, name, avatar):
+        with self._write():
+            self._ensure_profile(name)
+            self.conn.execute(SQL_UNLOCK_AVATAR, (name, avatar))
+
+    def complete_level(self, name, level_num):
+        with self._write():
+            self._ensure_profile(name)
+            self.conn.execute(SQL_COMPLETE_LEVEL, (name, level_num))
+
+    def set_best_time(self, name, level_num, time_taken):
+        with self._write():
+            self._ensure_profile(name)
+            self.conn.execute(SQL_SET_BEST_TIME, (name, level_num, time_taken))
+
+    def select_avatar(self, name, avatar):
+        with self._write():
+            self._ensure_profile(name)
+            self.conn.execute(SQL_SELECT_AVATAR, (avatar, name))
+
+    # -------------------- Reads --------------------
+
+    def get_total_coins(self, name):
+        row = self.conn.execute(SQL_GET_COINS, (name,)).fetchone()
+        return row[0] if row else 0
+
+    def profile_names(self):
+        return [name for (name,) in self.conn.execute(SQL_PROFILE_NAMES)]
+
+    def top_coins(self, limit=10):
+        """Coin leaderboard across all profiles (served by idx_profiles_coins)."""
+        return [{"name": n, "coins": c} for n, c in self.conn.execute(SQL_TOP_COINS, (limit,))]
+
+    def top_times(self, level_num, limit=10):
+        """Fastest times for one level (served by idx_best_times_level)."""
+        return [{"name": n, "time": t} for n, t in self.conn.execute(SQL_TOP_TIMES, (int(level_num), limit))]
+
+    def high_scores(self, limit=10):
+        """Both leaderboards, in the layout of game_save.json's high_scores."""
+        return {
+            "coins": self.top_coins(limit),
+            "times": {str(lvl): self.top_times(lvl, limit) for (lvl,) in self.conn.execute(SQL_TIMED_LEVELS)},
+        }
+
+    def load_profile(self, name):
+        """Return a profile in the same dict layout as game_save.json, without
+        high_scores (the leaderboards are shared by every profile: see high_scores()).
+
+        Read-only: a profile that doesn't exist yet comes back as a new one.
+        """
+        c = self.conn
+        row = c.execute("SELECT total_coins, selected_avatar FROM profiles WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return {
+                "player_name": name,
+                "total_coins": 0,
+                "unlocked_avatars": list(self.default_avatars),
+                "completed_levels": [],
+                "best_times": {},
+                "selected_avatar": self.default_avatars[0] if self.default_avatars else None,
+            }
+        coins, selected = row
+        avatars = [r[0] for r in c.execute("SELECT avatar FROM unlocked_avatars WHERE profile = ? ORDER BY rowid", (name,))]
+        levels = [r[0] for r in c.execute("SELECT level FROM completed_levels WHERE profile = ? ORDER BY level", (name,))]
+        best_times = {str(lvl): t for lvl, t in c.execute("SELECT level, time FROM best_times WHERE profile = ?", (name,))}
+        return {
+            "player_name": name,
+            "total_coins": coins,
+            "unlocked_avatars": avatars,
+            "completed_levels": levels,
+            "best_times": best_times,
+            "selected_avatar": selected,
+        }
+
+    # -------------------- Bulk writes / import --------------------
+
+    def save_profile(self, data):
+        """Write a game_save-style dict to its profile.
+
+        Coins are set to the total given, as the JSON save does, so spending
+        or resetting them sticks; that also undoes coins other instances added
+        after `data` was read, so only the spend/reset path should save a whole
+        profile (add_coins, select_avatar, ... change one thing safely). Best times keep the minimum and avatars
+        and levels are unioned, so a stale snapshot can't undo those.
+        """
+        name = data.get("player_name", "Player")
+        with self._write():
+            self._merge_profile(name, data, SQL_SET_COINS)
+
+    def _merge_profile(self, name, data, coins_sql=SQL_MAX_COINS):
+        c = self.conn
+        self._ensure_profile(name)
+        c.execute(coins_sql, (int(data.get("total_coins", 0)), name))
+        for av in data.get("unlocked_avatars", []):
+            c.execute(SQL_UNLOCK_AVATAR, (name, av))
+        for lvl in data.get("completed_levels", []):
+            c.execute(SQL_COMPLETE_LEVEL, (name, int(lvl)))
+        for lvl, t in data.get("best_times", {}).items():
+            c.execute(SQL_SET_BEST_TIME, (name, int(lvl), float(t)))
+        if data.get("selected_avatar"):
+            c.execute(SQL_SELECT_AVATAR, (data["selected_avatar"], name))
+
+    def import_json(self, path):
+        """Import a game_save.json file, including the other names in its high scores."""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        name = data.get("player_name", "Player")
+        high_scores = data.get("high_scores", {})
+        with self._write():
+            self._merge_profile(name, data)
+            for entry in high_scores.get("coins", []):
+                self._ensure_profile(entry["name"])
+                self.conn.execute(SQL_MAX_COINS, (int(entry["coins"]), entry["name"]))
+            for lvl, entries in high_scores.get("times", {}).items():
+                for entry in entries:
+                    self._ensure_profile(entry["name"])
+                    self.conn.execute(SQL_SET_BEST_TIME, (entry["name"], int(lvl), float(entry["time"])))
+        return name
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolling back on error."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+
+def main(argv=None):
+    """Import JSON saves: python save_store.py [--db game_save.db] game_save.json ..."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Import game_save.json files into the SQLite save store")
+    parser.add_argument("saves", nargs="+", help="game_save.json files to import")
+    parser.add_argument("--db", default=DB_FILE, help="database file (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    from game_save import DEFAULT_AVATARS
+    store = SaveStore(args.db, default_avatars=DEFAULT_AVATARS)
+    try:
+        for path in args.saves:
+            if not os.path.isfile(path):
+                print(f"Skipping {path}: not a file")
+                continue
+            try:
+                name = store.import_json(path)
+                print(f"Imported {path} as profile '{name}'")
+            except Exception as e:
+                print(f"Error importing {path}: {e}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
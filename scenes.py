@@ -0,0 +1,169 @@
+#  filename: scenes.py
+#  One loop for every screen: the Scene base class and the SceneManager that runs them
+#
+#  The start menu, the game, Game Over and the congratulations screen are
+#  scenes. A scene prepares its fonts and images the first time they are
+#  needed and keeps them, so a transition only changes which scene the loop
+#  calls next; no screen runs a loop of its own.
+
+import time
+
+import pygame
+
+from idle_clock import IdleClock
+
+
+class Scene:
+    """A screen run by SceneManager.
+
+    Every frame the manager hands the scene its events (handle), then calls
+    update and draw and presents what draw returned. A scene that only
+    changes on input returns False from active() while idle, and the loop
+    sleeps until the next event instead of running at `fps`.
+    """
+
+    fps = 60
+
+    def __init__(self, on_result=None):
+        self.on_result = on_result  # called with the scene's outcome, see finish()
+
+    def active(self):
+        """True to run at `fps`, False to sleep until input arrives."""
+        return True
+
+    def enter(self, screen, **kwargs):
+        """Called each time the scene becomes current, with the arguments given to switch()."""
+
+    def exit(self):
+        """Called when another scene takes over."""
+
+    def handle(self, event):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self, screen):
+        """Draw the frame. Return True to flip the whole display, a list of rects
+        to update only those, or None if nothing changed."""
+        return True
+
+    def end_frame(self, work_ms):
+        """Called once the frame is presented, with the time it took (not counting the pacing sleep)."""
+
+    def finish(self, result):
+        """Report what the player chose here (a dict) to whoever made the scene."""
+        if self.on_result is not None:
+            self.on_result(result)
+
+
+class SceneManager:
+    """Runs the current scene, one frame per loop, until quit() or a window close.
+
+    switch() takes effect between frames: the scene that asked for it gets no
+    more events, update or draw calls that frame, like a menu returning. The
+    events left in that frame's batch go to the next scene, first thing.
+    """
+
+    def __init__(self, viewport, precise=False):
+        self.viewport = viewport  # the window; scenes draw on its logical surface
+        self.screen = viewport.surface
+        self.precise = precise  # sleep-then-spin frame pacing, see set_precise()
+        self.latency = None  # a LatencyMeter while input latency is being measured
+        self.scenes = {}  # name -> Scene
+        self.current = None
+        self.current_name = None
+        self.running = False
+        self._next = None  # (name, kwargs) of a pending switch
+        self._held = []  # events after the one that switched, for the next scene
+        self._clock = None  # IdleClock of the current visit
+
+    def add(self, name, scene):
+        self.scenes[name] = scene
+        return scene
+
+    def switch(self, name, **kwargs):
+        """Make `name` the current scene from the next frame on; kwargs go to its enter()."""
+        self._next = (name, kwargs)
+
+    def quit(self):
+        self.running = False
+
+    def set_precise(self, precise):
+        """Pace frames precisely (latency.FramePacer) from now on, in every scene."""
+        self.precise = precise
+        if self._clock is not None:
+            self._clock.pacer.precise = precise
+
+    @property
+    def switching(self):
+        """True once switch() was called this frame (the rest of the frame is skipped)."""
+        return self._next is not None
+
+    def _enter_next(self):
+        name, kwargs = self._next
+        self._next = None
+        if self.current is not None:
+            self.current.exit()
+            self._clock.close()
+        self.viewport.capture()  # the next scene may open over the last frame
+        self.current_name, self.current = name, self.scenes[name]
+        self._clock = IdleClock(self.current.fps, name=name, precise=self.precise)
+        if self.latency is not None:
+            self.latency.resync()
+        self.current.enter(self.screen, **kwargs)
+
+    def step(self):
+        """Run one frame: pace, events, update, draw, present.
+
+        Events are read after the wait and right before update, so the keys
+        update() samples are as fresh as they can be.
+        """
+        entered = self._next is not None
+        if entered:
+            self._enter_next()
+        scene = self.current
+        meter = self.latency
+        # a scene that was just entered is drawn at once, even if it is idle
+        active = entered or scene.active()
+        if meter is not None and not active:
+            meter.resync()
+        events = self._clock.tick(active=active, poll=meter.poll if meter is not None else None)
+        frame_start = time.perf_counter()
+        if meter is not None:
+            events = meter.take(events)
+        if self._held:
+            events = self._held + events
+            self._held = []
+        for i, event in enumerate(events):
+            if event.type == pygame.QUIT:
+                self.quit()
+            elif not self.viewport.handle(event):
+                scene.handle(event)
+            if self.switching or not self.running:
+                if self.running:
+                    self._held = events[i + 1:]
+                return
+        scene.update()
+        if self.switching or not self.running:
+            return
+        shown = scene.draw(self.screen)
+        if self.viewport.dirty:
+            shown = True  # the window changed: show all of the frame again
+        if shown:
+            self.viewport.present(shown)
+        if shown and meter is not None:
+            meter.presented()
+        scene.end_frame((time.perf_counter() - frame_start) * 1000)
+
+    def run(self, name=None, **kwargs):
+        """Loop until quit(), starting with scene `name` if given."""
+        if name is not None:
+            self.switch(name, **kwargs)
+        self.running = True
+        while self.running:
+            self.step()
+        if self.current is not None:
+            self.current.exit()
+            self._clock.close()
+            self.current = self.current_name = None
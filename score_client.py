@@ -0,0 +1,138 @@
+#  filename: score_client.py
+#  Game side of score_server.py: hands scores to a background thread so nothing waits on the network
+
+import json
+import queue
+import socket
+import threading
+import time
+
+MAX_QUEUE = 1000      # scores waiting to be sent; more than this and new ones are dropped
+MAX_BATCH = 100       # scores sent in one request
+TIMEOUT = 3.0         # seconds for connecting and for each reply
+BACKOFF_MIN = 0.5     # seconds before the first retry, doubled per failure up to BACKOFF_MAX
+BACKOFF_MAX = 30.0
+
+_STOP = object()
+
+
+class ScoreClient:
+    """Sends scores to a score server from a daemon thread.
+
+    submit() puts the score on a queue and returns straight away. The thread
+    sends whatever has queued up as one batch over a single connection that it
+    keeps open; if the server can't be reached it keeps the batch (new scores
+    join it), closes the connection and retries, waiting twice as long after
+    each failure.
+    """
+
+    def __init__(self, host, port, timeout=TIMEOUT):
+        self.address = (host, port)
+        self.timeout = timeout
+        self.queue = queue.Queue(MAX_QUEUE)
+        self.sent = 0
+        self._sock = None
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name="score-client", daemon=True)
+        self._thread.start()
+
+    def submit(self, name, level, time_taken, coins=None):
+        """Queue a level time (and the player's coin total, if given). Never blocks."""
+        try:
+            self.queue.put_nowait((name, str(level), float(time_taken), coins))
+        except queue.Full:
+            print(f"Warning: score queue full, not sending {name}'s time for level {level}")
+
+    def close(self, timeout=1.0):
+        """Try to send what is queued for up to `timeout` seconds, then stop."""
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    # -------------------- background thread --------------------
+
+    def _run(self):
+        times = {}  # (name, level) -> best time not yet sent
+        coins = {}  # name -> highest total not yet sent
+        backoff = BACKOFF_MIN
+        retry_at = 0.0
+        stopping = False
+        while True:
+            # nothing pending: sleep until a score arrives; pending: until the retry is due
+            wait = max(retry_at - time.monotonic(), 0.0) if times or coins else None
+            try:
+                item = self.queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    name, level, t, total = item
+                    times[name, level] = min(t, times.get((name, level), t))
+                    if total is not None:
+                        coins[name] = max(total, coins.get(name, total))
+                if len(times) >= MAX_BATCH:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if (times or coins) and (stopping or time.monotonic() >= retry_at):
+                try:
+                    self._send(times, coins)
+                    self.sent += len(times)
+                    times.clear()
+                    coins.clear()
+                    backoff = BACKOFF_MIN
+                except (OSError, ValueError) as e:
+                    self._disconnect()
+                    if stopping:
+                        print(f"Warning: could not send {len(times)} scores: {e}")
+                        return
+                    retry_at = time.monotonic() + backoff
+                    backoff = min(backoff * 2, BACKOFF_MAX)
+            if stopping and self.queue.empty():
+                self._disconnect()
+                return
+
+    def _send(self, times, coins):
+        if self._sock is None:
+            self._sock = socket.create_connection(self.address, timeout=self.timeout)
+            self._file = self._sock.makefile("rwb")
+        request = {
+            "op": "submit",
+            "scores": [{"name": n, "level": lvl, "time": t} for (n, lvl), t in times.items()],
+            "coins": [{"name": n, "coins": c} for n, c in coins.items()],
+        }
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        reply = self._file.readline()
+        if not reply:
+            raise ConnectionError("server closed the connection")
+        reply = json.loads(reply)
+        if not reply.get("ok"):
+            # the server understood and refused: sending it again won't help
+            print(f"Warning: score server rejected scores: {reply.get('error')}")
+
+    def _disconnect(self):
+        for closable in (self._file, self._sock):
+            if closable is not None:
+                try:
+                    closable.close()
+                except OSError:
+                    pass
+        self._sock = self._file = None
+
+
+def fetch_top(host, port, level=None, k=10, timeout=TIMEOUT):
+    """Blocking top-k query (coins if `level` is None) for tools and scoreboards, not the game loop."""
+    with socket.create_connection((host, port), timeout=timeout) as sock, sock.makefile("rwb") as f:
+        f.write(json.dumps({"op": "top", "level": level, "k": k}).encode() + b"\n")
+        f.flush()
+        reply = json.loads(f.readline() or b"{}")
+    if not reply.get("ok"):
+        raise ValueError(reply.get("error", "no reply"))
+    return reply["coins"] if level is None else reply["times"]
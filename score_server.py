@@ -0,0 +1,157 @@
+#  filename: score_server.py
+#  Venue leaderboard: a small asyncio server that game clients send their times to
+#
+#      python score_server.py [--host 127.0.0.1] [--port 8765] [--output leaderboard.json]
+#
+#  Protocol: one JSON object per line, one reply line per request.
+#      {"op": "submit", "scores": [{"name", "level", "time"}, ...], "coins": [{"name", "coins"}, ...]}
+#          -> {"ok": true, "accepted": <entries>}
+#      {"op": "top", "level": "1", "k": 10}  -> {"ok": true, "times": [{"name", "time"}, ...]}
+#      {"op": "top", "k": 10}                -> {"ok": true, "coins": [{"name", "coins"}, ...]}
+#  Errors come back as {"ok": false, "error": "..."} and keep the connection open.
+
+import asyncio
+import json
+import signal
+import sys
+import time
+
+from leaderboard import LeaderboardMerger
+
+DEFAULT_PORT = 8765
+KEEP = 100             # entries kept per table; "top" queries are capped at this
+MAX_LINE = 1 << 20     # longest request line (a big batch), in bytes
+FLUSH_INTERVAL = 5.0   # seconds between writes of the output file while scores come in
+
+
+class ScoreServer:
+    """Best time per player per level and most coins per player, top KEEP of each.
+
+    Tables are leaderboard.py's bounded heaps, so memory stays the same however
+    many scores are submitted. With `output`, the board is written there (in
+    leaderboard.json layout, so the start menu can show it) every
+    FLUSH_INTERVAL seconds while it changes, and on close.
+    """
+
+    def __init__(self, keep=KEEP, output=None):
+        self.board = LeaderboardMerger(keep)
+        self.keep = keep
+        self.output = output
+        self.dirty = False
+        self.server = None
+        self._flusher = None
+        self._writers = set()  # open connections, closed on shutdown
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+        if self.output:
+            self._flusher = asyncio.ensure_future(self._flush_loop())
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+        self.server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self.server.wait_closed()
+        self.flush()
+
+    async def handle(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                writer.write(json.dumps(self.request(line)).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def request(self, line):
+        """Answer one request line (a dict to send back)."""
+        try:
+            req = json.loads(line)
+            op = req.get("op")
+            if op == "submit":
+                return {"ok": True, "accepted": self.submit(req.get("scores", []), req.get("coins", []))}
+            if op == "top":
+                k = max(0, min(int(req.get("k", 10)), self.keep))
+                if req.get("level") is None:
+                    return {"ok": True, "coins": self.board.result()["coins"][:k]}
+                return {"ok": True, "times": self.board.result()["times"].get(str(req["level"]), [])[:k]}
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        except KeyError as e:
+            return {"ok": False, "error": f"missing field {e}"}
+        except (ValueError, TypeError, AttributeError) as e:
+            return {"ok": False, "error": str(e)}
+
+    def submit(self, scores, coins):
+        # validate the whole batch before any of it goes in
+        times = [(str(s["level"]), str(s["name"]), float(s["time"])) for s in scores]
+        totals = [(str(c["name"]), int(c["coins"])) for c in coins]
+        self.board.add((totals, times))
+        self.dirty = True
+        return len(times) + len(totals)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        if not (self.output and self.dirty):
+            return
+        try:
+            with open(self.output, 'w') as f:
+                json.dump(self.board.result(), f, indent=2)
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving leaderboard: {e}")
+
+
+async def serve(host, port, output):
+    scores = ScoreServer(output=output)
+    await scores.start(host, port)
+    print(f"Score server listening on {host}:{scores.port}")
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows: Ctrl+C only
+    try:
+        await stop.wait()
+    finally:
+        await scores.close()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the venue leaderboard server")
+    parser.add_argument("--host", default="127.0.0.1", help="0.0.0.0 to accept other machines")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--output", default=None, help="keep this leaderboard file up to date (e.g. leaderboard.json)")
+    args = parser.parse_args(argv)
+    t = time.perf_counter()
+    try:
+        asyncio.run(serve(args.host, args.port, args.output))
+    except KeyboardInterrupt:
+        pass
+    print(f"Score server stopped after {time.perf_counter() - t:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
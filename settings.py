@@ -0,0 +1,38 @@
+#  filename: settings.py
+#  Per-install settings (kept out of the save file, they belong to the machine, not the player)
+
+import json
+import os
+
+SETTINGS_FILE = "settings.json"
+
+DEFAULT_SETTINGS = {
+    "quality": "auto",  # "auto" or a tier name from quality.py
+}
+
+
+def load_settings():
+    """Settings merged over the defaults; a missing or broken file gives the defaults."""
+    settings = dict(DEFAULT_SETTINGS)
+    if not os.path.exists(SETTINGS_FILE):
+        return settings
+    try:
+        with open(SETTINGS_FILE, 'r') as f:
+            settings.update(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"Error loading settings: {e}")
+    return settings
+
+
+def get_setting(key, default=None):
+    return load_settings().get(key, default)
+
+
+def set_setting(key, value):
+    settings = load_settings()
+    settings[key] = value
+    try:
+        with open(SETTINGS_FILE, 'w') as f:
+            json.dump(settings, f, indent=2)
+    except OSError as e:
+        print(f"Error saving settings: {e}")
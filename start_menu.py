@@ -1,7 +1,12 @@
 import pygame as pg
 import math, os, random
 from typing import List, Optional, Tuple, Dict
+import game_save
 from game_save import get_unlocked_avatars, is_level_unlocked
+from scenes import Scene
+import asset_cache
+from avatars import catalogue, DEFAULT_AVATAR
+from level_manifest import menu_entries
 
 # --- Theme ---
 COLOR_BG_DARK   = (10, 12, 18)
@@ -20,13 +25,18 @@ BG_CANDIDATES = [
 # UI/game speed for menu animations: values <1.0 slow animations
 UI_GAME_SPEED = 0.7
 
-LEVEL_DATA = [
-    {"name": "The Beginning", "image": "images/background/level 1/20251019_210725_0002.png"},
-    {"name": "Forest Frolic", "image": "images/background/level 2/20251019_211837_0002.png"},
-    {"name": "Spike Gauntlet", "image": "images/background/level 3/20251020_092559_0002.png"},
-    {"name": "Coin Craze", "image": "images/background/level 4/20251020_085609_0002.png"},
-    {"name": " Final Challenge", "image": "images/background/level 5/20251020_090246_0002.png"},
-]
+# levels come from level_manifest.LEVELS, with endless mode last
+LEVEL_DATA = menu_entries()
+
+_fonts: Dict[Tuple[str, int, bool], pg.font.Font] = {}
+
+
+def _sys_font(name: str, size: int, bold: bool = False) -> pg.font.Font:
+    """System fonts are looked up once and shared by every widget and visit."""
+    key = (name, size, bold)
+    if key not in _fonts:
+        _fonts[key] = pg.font.SysFont(name, size, bold=bold)
+    return _fonts[key]
 
 # -------------------- UI Primitives --------------------
 
@@ -43,12 +53,21 @@ class LevelButton:
         
         level_info = LEVEL_DATA[self.level_num - 1]
         self.image = None
-        if os.path.exists(level_info["image"]):
+        if level_info["thumbnail"]:
             try:
-                img = pg.image.load(level_info["image"]).convert()
-                self.image = pg.transform.smoothscale(img, (rect.width - 20, rect.height - 40))
-            except pg.error:
+                self.image = asset_cache.load_scaled(level_info["thumbnail"], (rect.width - 20, rect.height - 40))
+            except (pg.error, OSError):
                 print(f"Warning: Could not load image for level {self.level_num}")
+        # the level's layout along the bottom of the thumbnail (drawn by level_manifest)
+        self.preview = None
+        if self.image and level_info.get("preview"):
+            try:
+                preview = pg.image.load(level_info["preview"]).convert()
+                w = self.image.get_width()
+                h = max(1, min(self.image.get_height() // 3, preview.get_height() * w // preview.get_width()))
+                self.preview = pg.transform.scale(preview, (w, h))
+            except (pg.error, OSError, ZeroDivisionError):
+                pass
 
     def handle(self, event):
         if event.type == pg.MOUSEMOTION:
@@ -85,6 +104,8 @@ class LevelButton:
         if self.image:
             img_rect = self.image.get_rect(center=(self.rect.centerx, self.rect.centery - 10))
             surf.blit(self.image, img_rect)
+            if self.preview:
+                surf.blit(self.preview, self.preview.get_rect(bottomleft=img_rect.bottomleft))
 
         # Draw level name
         name_surf = self.font.render(name, True, text_color)
@@ -92,7 +113,7 @@ class LevelButton:
         surf.blit(name_surf, name_rect)
 
         if not self.unlocked:
-            lock_font = pg.font.SysFont("Arial", 72)
+            lock_font = _sys_font("Arial", 72)
             lock_surf = lock_font.render("🔒", True, (0, 0, 0, 150))
             lock_rect = lock_surf.get_rect(center=self.rect.center)
             surf.blit(lock_surf, lock_rect)
@@ -112,6 +133,7 @@ class Button:
         self.accent_color = accent_color
         self.hover = False
         self.pressed = False
+        self.image = None  # image_path scaled to fit, loaded on the first draw
 
     def handle(self, event):
         if event.type == pg.MOUSEMOTION:
@@ -135,10 +157,11 @@ class Button:
 
         if self.image_path:
             try:
-                img = pg.image.load(self.image_path).convert_alpha()
-                img = pg.transform.smoothscale(img, (self.rect.width - 20, self.rect.height - 20))
-                img_rect = img.get_rect(center=self.rect.center)
-                surf.blit(img, img_rect)
+                if self.image is None:
+                    img = pg.image.load(self.image_path).convert_alpha()
+                    self.image = pg.transform.smoothscale(img, (self.rect.width - 20, self.rect.height - 20))
+                img_rect = self.image.get_rect(center=self.rect.center)
+                surf.blit(self.image, img_rect)
             except Exception:
                 # fallback to text
                 txt_surf = self.font.render(self.text, True, fg)
@@ -150,13 +173,15 @@ class Button:
             surf.blit(txt_surf, txt_rect)
 
 class Picker:
-    def __init__(self, title: str, items: List[str], size: Tuple[int,int]):
+    def __init__(self, title: str, items: List[str], size: Tuple[int,int], on_pick=None, avatars=True):
         self.title = title
         self.items = items
         self.idx = 0
         self.size = size
-        self.font_title = pg.font.SysFont("arial", 40, bold=True)
-        self.font_hint = pg.font.SysFont("arial", 20)
+        self.on_pick = on_pick  # called with the value confirmed with ENTER/SPACE
+        self.avatars = avatars  # items are avatar files, shown with their picture
+        self.font_title = _sys_font("arial", 40, bold=True)
+        self.font_hint = _sys_font("arial", 20)
 
     @property
     def value(self):
@@ -198,26 +223,20 @@ class Picker:
         pg.draw.polygon(surf, COLOR_TEXT_MAIN, [(bx-16, by), (bx, by-14), (bx, by+14)])
 
         sel = self.value
-        avatar_dir = os.path.join("images", "avatar")
-        candidate = os.path.join(avatar_dir, sel)
-        if not os.path.isfile(candidate):
-            candidate = os.path.join("images", sel)
-        if os.path.isfile(candidate):
+        thumb = None
+        if self.avatars:
             try:
-                thumb = pg.image.load(candidate).convert_alpha()
-                thumb_size = int(min(card_w, card_h) * 0.5)
-                thumb = pg.transform.smoothscale(thumb, (thumb_size, thumb_size))
-                thumb_rect = thumb.get_rect(center=(card.centerx, card.centery - 20))
-                surf.blit(thumb, thumb_rect)
+                thumb = catalogue().thumbnail(sel, int(min(card_w, card_h) * 0.5))
             except Exception:
-                pass
+                thumb = None
+        if thumb is not None:
+            surf.blit(thumb, thumb.get_rect(center=(card.centerx, card.centery - 20)))
 
-        base, ext = os.path.splitext(sel)
-        display_name = base
+        display_name = os.path.splitext(sel)[0] if self.avatars else sel
         if len(display_name) > 24:
             display_name = display_name[:21] + "..."
             
-        fname_font = pg.font.SysFont("arial", 24, bold=True)
+        fname_font = _sys_font("arial", 24, bold=True)
         fname_text = fname_font.render(display_name, True, COLOR_TEXT_MAIN)
         fname_rect = fname_text.get_rect(midtop=(card.centerx, card.bottom - 50))
         surf.blit(fname_text, fname_rect)
@@ -238,34 +257,123 @@ def try_load_bg(size: Tuple[int,int]) -> Optional[pg.Surface]:
             return img
     return None
 
-def run_start_menu(screen: pg.Surface,
-                   stages: Optional[List[str]] = None) -> Dict[str, object]:
-    pg.display.set_caption("Jump Rush — Start Menu")
-    clock = pg.time.Clock()
-    W, H = screen.get_size()
-
-    selected_level = 1
-    open_picker: Optional[Picker] = None
-
-    try:
-        title_font = pg.font.Font("PUSAB_.ttf", 72)
-        btn_font = pg.font.Font("PUSAB_.ttf", 28)
-        name_font = pg.font.Font("PUSAB_.ttf", 18)
-    except pg.error:
-        print("Warning: PUSAB_.ttf font not found. Falling back to system fonts.")
-        title_font = pg.font.SysFont("arial", 72, bold=True)
-        btn_font = pg.font.SysFont("arial", 28, bold=True)
-        name_font = pg.font.SysFont("arial", 18, bold=True)
-
-    result = {"start": False, "level": selected_level, "quit": False, "avatar_path": None}
+class StartMenu(Scene):
+    """Title screen: pick a level (or endless), an avatar, or look at the leaderboard.
+    Finishes with {'start': True, 'level': n, 'avatar_path': path or None} or {'quit': True}.
+
+    Fonts, buttons, level thumbnails and the background are loaded on the first
+    visit and reused on every later one.
+    """
+
+    def __init__(self, on_result=None):
+        super().__init__(on_result)
+        self.size = None
+        self.open_picker = None  # Picker, or the leaderboard dict, drawn over the menu
+        self.avatar_path = None  # avatar confirmed in the picker during this visit
+        self.needs_draw = True  # redraw only after input, or every frame while something is hovered
+
+    def _load(self, size):
+        W, H = self.size = size
+        try:
+            self.title_font = pg.font.Font("PUSAB_.ttf", 72)
+            self.btn_font = pg.font.Font("PUSAB_.ttf", 28)
+            self.name_font = pg.font.Font("PUSAB_.ttf", 18)
+        except pg.error:
+            print("Warning: PUSAB_.ttf font not found. Falling back to system fonts.")
+            self.title_font = pg.font.SysFont("arial", 72, bold=True)
+            self.btn_font = pg.font.SysFont("arial", 28, bold=True)
+            self.name_font = pg.font.SysFont("arial", 18, bold=True)
+        self.close_font = _sys_font("arial", 24, bold=True)
+
+        level_btn_w, level_btn_h = 160, 140
+        levels_per_row = 3
+        level_gap = 30
+        self.level_buttons = []
+
+        n_levels = len(LEVEL_DATA)
+        rows = (n_levels + levels_per_row - 1) // levels_per_row
+        level_y = int(H * 0.25)
+        # scale any thumbnails missing from the asset cache together before the buttons load them
+        asset_cache.warm([(info["thumbnail"], (level_btn_w - 20, level_btn_h - 40), False)
+                          for info in LEVEL_DATA if info["thumbnail"]])
+
+        for row in range(rows):
+            # how many items in this row
+            start_idx = row * levels_per_row
+            remaining = n_levels - start_idx
+            items_in_row = min(levels_per_row, remaining)
+
+            # center this row
+            row_total_w = items_in_row * level_btn_w + (items_in_row - 1) * level_gap
+            row_start_x = (W - row_total_w) // 2
+
+            for col in range(items_in_row):
+                i = start_idx + col
+                level_num = i + 1
+                x = row_start_x + col * (level_btn_w + level_gap)
+                y = level_y + row * (level_btn_h + level_gap)
+                self.level_buttons.append(
+                    LevelButton(pg.Rect(x, y, level_btn_w, level_btn_h),
+                               level_num, self.name_font, self.on_select_level)
+                )
+
+        # compute responsive sizes/positions so buttons won't overlap
+        btn_w, btn_h = int(W * 0.33), 60
+        gap = 24
+        # position near bottom with some padding
+        # move buttons a bit lower so they don't overlap level thumbnails
+        y_pos = H - btn_h - 30
+        total_w = btn_w * 2 + gap
+        start_x = (W - total_w) // 2
+
+        self.buttons = [
+            Button(pg.Rect(start_x, y_pos, btn_w, btn_h), "Select Avatar", self.btn_font, self.on_pick_avatar),
+            Button(pg.Rect(start_x + btn_w + gap, y_pos, btn_w, btn_h), "Quit", self.btn_font, self.on_quit),
+        ]
+
+        # Separate leaderboard button in top right, square
+        self.leaderboard_btn = Button(pg.Rect(W - 60, 10, 50, 50), "", self.btn_font, self.on_show_leaderboard,
+                                      image_path="images/bxh.png")
+        # with the sqlite save, the profile playing, top left; click to switch
+        self.profile_btn = None
+        if game_save.uses_profiles():
+            self.profile_btn = Button(pg.Rect(10, 10, 220, 50), "", self.name_font, self.on_pick_profile)
+
+        self.bg_img = try_load_bg((W, H))
+        self.title_s = self.title_font.render("JUMP RUSH", True, COLOR_TEXT_MAIN)
+        self.level_title = self.btn_font.render("Select a Level", True, COLOR_TEXT_SUB)
+
+    def enter(self, screen: pg.Surface):
+        pg.display.set_caption("Jump Rush — Start Menu")
+        if screen.get_size() != self.size:
+            self._load(screen.get_size())
+        for b in self.buttons + self.level_buttons + self._corner_buttons():
+            b.hover = b.pressed = False
+        if self.profile_btn:
+            self.profile_btn.text = game_save.get_active_profile()
+        self.open_picker = None
+        self.avatar_path = None
+        self.needs_draw = True
+
+    def _corner_buttons(self):
+        return [self.leaderboard_btn] + ([self.profile_btn] if self.profile_btn else [])
+
+    def active(self):
+        return any(b.hover for b in self.buttons + self._corner_buttons()) \
+            or any(lb.hover for lb in self.level_buttons)
+
+    def _leaderboard_card(self):
+        W, H = self.size
+        card_size = min(int(W * 0.6), int(H * 0.6))  # Larger size
+        return pg.Rect(W - card_size - 10, 10, card_size, card_size)  # Top right
 
-    def draw_leaderboard(data):
+    def draw_leaderboard(self, screen, data):
+        W, H = self.size
         overlay = pg.Surface((W, H), pg.SRCALPHA)
         overlay.fill((0, 0, 0, 128))
         screen.blit(overlay, (0, 0))
 
-        card_size = min(int(W * 0.6), int(H * 0.6))  # Larger size
-        card = pg.Rect(W - card_size - 10, 10, card_size, card_size)  # Top right
+        card = self._leaderboard_card()
         pg.draw.rect(screen, (26, 28, 36), card, border_radius=16)
         pg.draw.rect(screen, COLOR_BORDER, card, width=2, border_radius=16)
 
@@ -273,199 +381,151 @@ def run_start_menu(screen: pg.Surface,
         close_btn_rect = pg.Rect(card.right - 50, card.top + 10, 40, 40)
         pg.draw.rect(screen, (200, 50, 50), close_btn_rect, border_radius=8)
         pg.draw.rect(screen, (255, 100, 100), close_btn_rect, width=2, border_radius=8)
-        close_text = pg.font.SysFont("arial", 24, bold=True).render("X", True, (255, 255, 255))
+        close_text = self.close_font.render("X", True, (255, 255, 255))
         close_text_rect = close_text.get_rect(center=close_btn_rect.center)
         screen.blit(close_text, close_text_rect)
 
         title = data.get("title", "Leaderboard")
-        title_s = btn_font.render(title, True, COLOR_TEXT_MAIN)
+        title_s = self.btn_font.render(title, True, COLOR_TEXT_MAIN)
         title_r = title_s.get_rect(center=(card.centerx, card.top + 50))
         screen.blit(title_s, title_r)
 
         items = data.get("items", [])
         y_start = title_r.bottom + 20
         for i, item in enumerate(items):
-            item_s = name_font.render(item, True, COLOR_TEXT_SUB)
+            item_s = self.name_font.render(item, True, COLOR_TEXT_SUB)
             item_r = item_s.get_rect(topleft=(card.left + 20, y_start + i * 25))
             screen.blit(item_s, item_r)
 
         # Add BHX at bottom
-        bhx_text = name_font.render("BHX", True, COLOR_TEXT_SUB)
+        bhx_text = self.name_font.render("BHX", True, COLOR_TEXT_SUB)
         bhx_rect = bhx_text.get_rect(center=(card.centerx, card.bottom - 20))
         screen.blit(bhx_text, bhx_rect)
 
-    def on_start():
-        result["start"] = True
-
-    def on_select_level(level_num):
-        nonlocal selected_level
-        selected_level = level_num
-        result["level"] = level_num
-        on_start()
-
-    def on_pick_avatar():
-        nonlocal open_picker
-        unlocked_avatars = get_unlocked_avatars()
-        avatar_files = []
-        avatar_dir = os.path.join("images", "avatar")
-        for avatar_name in unlocked_avatars:
-            avatar_path = os.path.join(avatar_dir, avatar_name)
-            if os.path.exists(avatar_path):
-                avatar_files.append(avatar_name)
-            elif os.path.exists(os.path.join("images", avatar_name)):
-                avatar_files.append(avatar_name)
-        if not avatar_files:
-            avatar_files = ["avatar.png"]
-        open_picker = Picker("Select Avatar", avatar_files, (W, H))
-        open_picker.idx = 0
+    def on_select_level(self, level_num):
+        self.finish({"start": True, "level": level_num, "quit": False, "avatar_path": self.avatar_path})
+
+    def on_quit(self):
+        self.finish({"start": False, "quit": True})
 
-    def on_show_leaderboard():
-        nonlocal open_picker
-        import game_save
+    def on_pick_avatar(self):
+        avatar_files = [name for name in get_unlocked_avatars() if name in catalogue()]
+        if not avatar_files:
+            avatar_files = [DEFAULT_AVATAR]
+        self.open_picker = Picker("Select Avatar", avatar_files, self.size, self.on_avatar_chosen)
+        self.open_picker.idx = 0
+
+    def on_avatar_chosen(self, val):
+        self.avatar_path = catalogue().path(val)
+        game_save.select_avatar(val)
+
+    def on_pick_profile(self):
+        names = game_save.get_profile_names()
+        self.open_picker = Picker("Select Profile", names, self.size, self.on_profile_chosen, avatars=False)
+        self.open_picker.idx = names.index(game_save.get_active_profile())
+
+    def on_profile_chosen(self, name):
+        game_save.set_active_profile(name)
+        self.profile_btn.text = name
+        self.avatar_path = None  # play with the new profile's own avatar
+
+    def on_show_leaderboard(self):
+        from leaderboard import load_leaderboard
+        board = load_leaderboard()
+        if board is None and game_save.uses_profiles():
+            board = game_save.get_high_scores()  # every profile in the database
+        if board is not None:
+            # merged from many saves with leaderboard.py, or the profiles': show the leader of each table
+            items = []
+            if board.get("coins"):
+                top = board["coins"][0]
+                items.append(f"Most Coins: {top['name']} ({top['coins']})")
+            for lvl in range(1, len(LEVEL_DATA) + 1):
+                if LEVEL_DATA[lvl - 1].get("endless"):
+                    continue
+                entries = board.get("times", {}).get(str(lvl))
+                if entries:
+                    items.append(f"Level {lvl}: {entries[0]['name']} {entries[0]['time']:.2f}s")
+                else:
+                    items.append(f"Level {lvl}: No times yet")
+            self.open_picker = {"title": "Leaderboard", "items": items, "type": "leaderboard"}
+            return
         best_times = game_save.get_best_times()
         total_coins = game_save.get_total_coins()
         items = [f"Total Coins: {total_coins}"]
         for lvl in range(1, len(LEVEL_DATA) + 1):
+            if LEVEL_DATA[lvl - 1].get("endless"):
+                continue
             time = best_times.get(str(lvl))
             if time is not None:
                 items.append(f"Level {lvl}: {time:.2f} seconds")
             else:
                 items.append(f"Level {lvl}: Not completed yet")
-        open_picker = {"title": "Leaderboard", "items": items, "type": "leaderboard"}
-
-    level_btn_w, level_btn_h = 160, 140
-    levels_per_row = 3
-    level_gap = 30
-    level_buttons = []
-
-    n_levels = len(LEVEL_DATA)
-    rows = (n_levels + levels_per_row - 1) // levels_per_row
-    level_y = int(H * 0.25)
-
-    for row in range(rows):
-        # how many items in this row
-        start_idx = row * levels_per_row
-        remaining = n_levels - start_idx
-        items_in_row = min(levels_per_row, remaining)
-
-        # center this row
-        row_total_w = items_in_row * level_btn_w + (items_in_row - 1) * level_gap
-        row_start_x = (W - row_total_w) // 2
-
-        for col in range(items_in_row):
-            i = start_idx + col
-            level_num = i + 1
-            x = row_start_x + col * (level_btn_w + level_gap)
-            y = level_y + row * (level_btn_h + level_gap)
-            level_buttons.append(
-                LevelButton(pg.Rect(x, y, level_btn_w, level_btn_h), 
-                           level_num, name_font, on_select_level)
-            )
-
-    def on_quit():
-        result["quit"] = True
-
-    # compute responsive sizes/positions so buttons won't overlap
-    btn_w, btn_h = int(W * 0.33), 60
-    gap = 24
-    # position near bottom with some padding
-    # move buttons a bit lower so they don't overlap level thumbnails
-    y_pos = H - btn_h - 30
-    total_w = btn_w * 2 + gap
-    start_x = (W - total_w) // 2
-
-    buttons = [
-        Button(pg.Rect(start_x, y_pos, btn_w, btn_h), "Select Avatar", btn_font, on_pick_avatar),
-        Button(pg.Rect(start_x + btn_w + gap, y_pos, btn_w, btn_h), "Quit", btn_font, on_quit),
-    ]
-    
-    # Separate leaderboard button in top right, square
-    leaderboard_btn = Button(pg.Rect(W - 60, 10, 50, 50), "", btn_font, on_show_leaderboard, image_path="images/bxh.png")
-    
-    bg_img = try_load_bg((W, H))
-
-    while True:
-        dt = clock.tick(60) / 1000.0
-
-        for event in pg.event.get():
-            if event.type == pg.QUIT:
-                result["quit"] = True
-                return result
-
-            if open_picker:
-                if isinstance(open_picker, dict) and open_picker.get("type") == "leaderboard":
-                    # allow ESC to close
-                    if event.type == pg.KEYDOWN:
-                        if event.key == pg.K_ESCAPE:
-                            open_picker = None
-                    # handle mouse click on the close button — compute same card position as draw_leaderboard
-                    elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                        card_size = min(int(W * 0.6), int(H * 0.6))
-                        # draw_leaderboard places the card at top-right: W - card_size - 10, 10
-                        card = pg.Rect(W - card_size - 10, 10, card_size, card_size)
-                        close_btn_rect = pg.Rect(card.right - 50, card.top + 10, 40, 40)
-                        if close_btn_rect.collidepoint(event.pos):
-                            open_picker = None
-                    continue
-                elif isinstance(open_picker, Picker):
-                    if event.type == pg.KEYDOWN:
-                        if event.key == pg.K_ESCAPE:
-                            open_picker = None
-                        if event.key in (pg.K_RETURN, pg.K_KP_ENTER, pg.K_SPACE):
-                            val = open_picker.value
-                            avatar_dir = os.path.join("images", "avatar")
-                            candidate = os.path.join(avatar_dir, val)
-                            if not os.path.isfile(candidate):
-                                candidate = os.path.join("images", val)
-                            result["avatar_path"] = candidate
-                            import game_save
-                            save_data = game_save.load_game_data()
-                            save_data["selected_avatar"] = val
-                            game_save.save_game_data(save_data)
-                            open_picker = None
-                        elif event.key in (pg.K_LEFT, pg.K_a):
-                            open_picker.prev()
-                        elif event.key in (pg.K_RIGHT, pg.K_d):
-                            open_picker.next()
-                    continue
+        self.open_picker = {"title": "Leaderboard", "items": items, "type": "leaderboard"}
 
-            for b in buttons:
-                b.handle(event)
-            
-            leaderboard_btn.handle(event)
-            
-            for lb in level_buttons:
-                lb.handle(event)
-
-        if result["quit"] or result["start"]:
-            return result
+    def handle(self, event):
+        self.needs_draw = True
+        open_picker = self.open_picker
+        if open_picker:
+            if isinstance(open_picker, dict) and open_picker.get("type") == "leaderboard":
+                # allow ESC to close
+                if event.type == pg.KEYDOWN:
+                    if event.key == pg.K_ESCAPE:
+                        self.open_picker = None
+                # handle mouse click on the close button — same card position as draw_leaderboard
+                elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+                    card = self._leaderboard_card()
+                    close_btn_rect = pg.Rect(card.right - 50, card.top + 10, 40, 40)
+                    if close_btn_rect.collidepoint(event.pos):
+                        self.open_picker = None
+            elif isinstance(open_picker, Picker):
+                if event.type == pg.KEYDOWN:
+                    if event.key == pg.K_ESCAPE:
+                        self.open_picker = None
+                    if event.key in (pg.K_RETURN, pg.K_KP_ENTER, pg.K_SPACE):
+                        self.open_picker = None
+                        open_picker.on_pick(open_picker.value)
+                    elif event.key in (pg.K_LEFT, pg.K_a):
+                        open_picker.prev()
+                    elif event.key in (pg.K_RIGHT, pg.K_d):
+                        open_picker.next()
+            return
+
+        for b in self.buttons:
+            b.handle(event)
+
+        for b in self._corner_buttons():
+            b.handle(event)
+
+        for lb in self.level_buttons:
+            lb.handle(event)
+
+    def draw(self, screen: pg.Surface):
+        if not (self.needs_draw or self.active()):
+            return None
+        self.needs_draw = False
+        W, H = self.size
 
-        if bg_img:
-            screen.blit(bg_img, (0, 0))
+        if self.bg_img:
+            screen.blit(self.bg_img, (0, 0))
         else:
             screen.fill(COLOR_BG_DARK)
 
-        title = "JUMP RUSH"
-        title_s = title_font.render(title, True, COLOR_TEXT_MAIN)
-        title_r = title_s.get_rect(center=(W//2, int(H*0.1)))
-        screen.blit(title_s, title_r)
+        screen.blit(self.title_s, self.title_s.get_rect(center=(W//2, int(H*0.1))))
+        screen.blit(self.level_title, self.level_title.get_rect(center=(W//2, int(H*0.22))))
 
-        level_title = btn_font.render("Select a Level", True, COLOR_TEXT_SUB)
-        title_rect = level_title.get_rect(center=(W//2, int(H*0.22)))
-        screen.blit(level_title, title_rect)
-        
-        for lb in level_buttons:
+        for lb in self.level_buttons:
             lb.draw(screen, 0)
 
-        for b in buttons:
+        for b in self.buttons:
             b.draw(screen, 0)
 
-        leaderboard_btn.draw(screen, 0)
-
-        if open_picker:
-            if isinstance(open_picker, Picker):
-                open_picker.draw(screen)
-            elif isinstance(open_picker, dict) and open_picker.get("type") == "leaderboard":
-                draw_leaderboard(open_picker)
+        for b in self._corner_buttons():
+            b.draw(screen, 0)
 
-        pg.display.flip()
\ No newline at end of file
+        if self.open_picker:
+            if isinstance(self.open_picker, Picker):
+                self.open_picker.draw(screen)
+            elif isinstance(self.open_picker, dict) and self.open_picker.get("type") == "leaderboard":
+                self.draw_leaderboard(screen, self.open_picker)
+        return True
@@ -0,0 +1,70 @@
+#  filename: telemetry.py
+#  Gameplay telemetry: deaths, coin pickups and wins as fixed-size records in an append-only file
+#
+#  heatmap.py turns the file into per-column heatmaps.
+
+import os
+import queue
+import struct
+import threading
+
+TELEMETRY_FILE = "telemetry.bin"
+MAGIC = b"JRTEL1\n"  # written once, when the file is created
+
+DEATH, COIN, WIN = range(3)
+EVENT_NAMES = ("death", "coin", "win")
+
+# event, level, column, y, frame, attempt: 16 bytes, no padding. heatmap.py
+# reads the same layout with NumPy (RECORD_DTYPE there).
+RECORD = struct.Struct("<BBIhII")
+FLUSH_BYTES = 64 * 1024  # buffer this much before handing it to the writer thread
+
+
+class TelemetryLog:
+    """Buffers records in memory and appends them to `path` from a daemon thread.
+
+    record() only packs 16 bytes onto a bytearray. Full buffers, and whatever
+    is buffered when flush() is called, are passed to the writer thread as
+    one chunk, so the game never waits on the disk. A crash loses at most
+    the unflushed buffer; readers ignore a partial record at the end.
+    """
+
+    def __init__(self, path=TELEMETRY_FILE):
+        self.path = path
+        self.buffer = bytearray()
+        self.records = 0
+        self._chunks = queue.Queue()
+        self._thread = threading.Thread(target=self._write, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def record(self, event, level, column, y, frame, attempt):
+        self.buffer += RECORD.pack(event, level, max(column, 0), max(-32768, min(y, 32767)), frame, attempt)
+        self.records += 1
+        if len(self.buffer) >= FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffer to the writer thread (returns at once)."""
+        if self.buffer:
+            self._chunks.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def close(self, timeout=1.0):
+        """Flush and wait up to `timeout` seconds for the writes to finish."""
+        self.flush()
+        self._chunks.put(None)
+        self._thread.join(timeout)
+
+    def _write(self):
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                return
+            try:
+                new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+                with open(self.path, 'ab') as f:
+                    if new:
+                        f.write(MAGIC)
+                    f.write(chunk)
+            except OSError as e:
+                print(f"Error writing telemetry: {e}")
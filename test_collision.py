@@ -0,0 +1,88 @@
+#  filename: test_collision.py
+#  Swept collision: a box dropped onto a floor and one run into a thin spike
+#  must be stopped at every speed multiplier, however far they move per frame
+#
+#      python -m pytest test_collision.py      (python test_collision.py prints the table)
+
+import pygame
+import pytest
+
+from collision import HAZARD, SOLID, TileLayers, TileType
+
+MULTIPLIERS = (1, 2, 4, 8, 16)
+PHASES = 8  # start offsets tried per speed, so frames land on every part of a tile
+FALL, RUN = 6, 4  # px per frame at multiplier 1
+
+
+class Tile(pygame.sprite.Sprite):
+    def __init__(self, image, pos, *groups):
+        super().__init__(*groups)
+        self.image = image
+        self.rect = image.get_rect(topleft=pos)
+
+
+class Box:
+    def __init__(self, pos):
+        self.rect = pygame.Rect(pos, (20, 20))
+        self.mask = pygame.mask.Mask((20, 20), fill=True)
+        self.stopped = self.died = False
+
+
+def _land(player, sprite, yvel):
+    player.rect.bottom = sprite.rect.top
+    player.stopped = True
+
+
+def _spike(player, sprite, yvel):
+    player.died = True
+
+
+def _layers():
+    """A floor along y=200 and a 4px-wide spike at x=300, with their own
+    tile types and handlers (the game's registries are left alone)."""
+    tile_types = {
+        "0": TileType("0", Tile, SOLID, lambda: pygame.Surface((32, 32))),
+        "Spike": TileType("Spike", Tile, HAZARD, lambda: pygame.Surface((32, 32)), hitbox=(14, 0, 4, 32)),
+    }
+    layers = TileLayers(tile_types=tile_types, handlers={SOLID: _land, HAZARD: _spike})
+    for col in range(40):
+        layers.spawn("0", (col * 32, 200))
+    layers.spawn("Spike", (300, 100))
+    return layers
+
+
+def missed(mult, swept):
+    """How many of the PHASES fallers went through the floor and runners through the spike."""
+    fall, run = FALL * mult, RUN * mult
+    count = 0
+    for phase in range(PHASES):
+        layers = _layers()
+        faller, runner = Box((5, phase * 7)), Box((150 + phase * 5, 110))
+        for _ in range(400 // run):
+            for box, dx, dy in ((faller, 0, fall), (runner, run, 0)):
+                if swept:
+                    layers.sweep(box, dx, dy)
+                else:
+                    box.rect.y += dy
+                    layers.collide(box, dy)
+            layers.scroll_by(run)
+        count += (not faller.stopped) + (not runner.died)
+    return count
+
+
+@pytest.mark.parametrize("mult", MULTIPLIERS)
+def test_swept_never_tunnels(mult):
+    assert missed(mult, swept=True) == 0
+
+
+def test_discrete_steps_tunnel_at_high_speed():
+    # the problem the sweep fixes: per-frame overlap tests miss the spike once a step is wider than it
+    assert missed(1, swept=False) == 0
+    assert missed(16, swept=False) > 0
+
+
+if __name__ == "__main__":
+    print("speed x  fall px/frame  run px/frame  missed (discrete)  missed (swept)")
+    for mult in MULTIPLIERS:
+        print(f"{mult:>7}  {FALL * mult:>13}  {RUN * mult:>12}  {missed(mult, False):>12} / {2 * PHASES}"
+              f"  {missed(mult, True):>9} / {2 * PHASES}")
@@ -0,0 +1,364 @@
+#  filename: vec_env.py
+#  Headless, vectorised Jump Rush for bots: N players run the same level in lockstep
+#
+#  Benchmark from the command line:
+#      python vec_env.py level_1.csv [--envs 1024] [--steps 2000] [--workers 4]
+
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from avatars import DEFAULT_AVATAR, avatar_path
+from level_stream import open_columns
+from physics import game_physics
+
+# tile codes in the observation grid
+EMPTY, SOLID, SPIKE, COIN, ORB, END = range(6)
+TOKEN_CODES = {"0": SOLID, "Spike": SPIKE, "Coin": COIN, "Orb": ORB, "End": END}  # anything else is air
+
+SPIKE_IMAGE = "images/obj-spike.png"
+END_IMAGE = avatar_path(DEFAULT_AVATAR)  # the End tile is drawn as the avatar (main.py)
+START = (140, 140)     # player's top-left at the start: main.py spawns it centred on (150, 150)
+SCREEN_HEIGHT = 600    # the player dies once its top is below the window
+OBS_ABOVE, OBS_BELOW = 4, 4     # observation window, in tiles around the player's tile
+OBS_BEHIND, OBS_AHEAD = 2, 13
+
+PROGRESS_REWARD = 1.0  # per column run
+COIN_REWARD = 1.0
+DEATH_REWARD = -10.0
+WIN_REWARD = 20.0
+
+
+def load_grid(path):
+    """A level file (.csv or .cols) as a (rows, cols) int8 array of tile codes."""
+    columns = [[TOKEN_CODES.get(tok, EMPTY) for tok in col] for col in open_columns(path)]
+    if not columns:
+        raise ValueError(f"{path} has no columns")
+    return np.array(columns, dtype=np.int8).T.copy()
+
+
+def spike_mask(physics, image=SPIKE_IMAGE):
+    """(tile, tile) bool array of the pixels of a spike that hurt: its hitbox,
+    trimmed to where the image is opaque, as the game's use_mask does."""
+    ts = physics.tile
+    hx, hy, hw, hh = physics.spike_hitbox
+    mask = np.zeros((ts, ts), dtype=bool)
+    mask[hy:hy + hh, hx:hx + hw] = True
+    try:
+        img = pygame.transform.smoothscale(pygame.image.load(image), (ts, ts))
+    except (OSError, pygame.error) as e:
+        print(f"Warning: could not load {image} ({e}), spikes hurt over their whole hitbox")
+        return mask
+    return mask & (pygame.surfarray.array_alpha(img).T > 127)
+
+
+def end_size(physics, image=END_IMAGE):
+    """(w, h) of the End tile's rect, from its cell's top-left: physics.end_size,
+    else the size of `image`, as the game builds the tile from the avatar."""
+    if physics.end_size is not None:
+        return physics.end_size
+    try:
+        return pygame.image.load(image).get_size()
+    except (OSError, pygame.error) as e:
+        print(f"Warning: could not load {image} ({e}), the End tile is one cell")
+        return physics.tile, physics.tile
+
+
+class VecJumpEnv:
+    """`n` players on one level, stepped together with NumPy.
+
+    Gym-style: reset() -> obs, step(actions) -> (obs, rewards, dones, info).
+    An action is 1 to hold jump, 0 to let go. Players that die, win or run out
+    of steps are reset on the spot, so every call steps all `n`; `info` has
+    "won", "died" and "progress" (fraction of the level run, as of the end of
+    the episode for those that just finished).
+
+    obs is a dict: "tiles" (n, rows, cols) int8 tile codes in a window around
+    each player (collected coins read as EMPTY) and "player" (n, 3) float32:
+    where the player's centre sits inside its tile row (0..1), vertical speed in
+    tiles per frame and 1.0 if it landed this frame.
+
+    The game sweeps the player against every tile rect; here each frame is cut
+    into substeps no taller than half the player and tested against the 2x2
+    cells the player can overlap, x before y. The two agree except for rare
+    corner grazes, which is close enough to train and tune on. Spikes use the
+    same pixel mask as the game (the player counts as a solid square), and the
+    End tile the game's rect (end_size, reaching past its cell), tested after
+    every substep.
+    """
+
+    def __init__(self, level, n, physics=None, max_steps=None):
+        self.grid = load_grid(level) if isinstance(level, str) else np.asarray(level, dtype=np.int8)
+        self.n = n
+        self.physics = physics or game_physics()
+        rows, cols = self.grid.shape
+        p = self.physics
+        self.level_px = cols * p.tile
+        self.fall_y = max(rows * p.tile, SCREEN_HEIGHT)
+        self.max_steps = max_steps or int(self.level_px / p.speed * 1.5)
+
+        # pad so window and corner lookups never index outside the array
+        self.pad_r = OBS_ABOVE + OBS_BELOW + 1
+        self.pad_c = OBS_BEHIND + OBS_AHEAD + 1
+        self.padded = np.pad(self.grid, ((self.pad_r, self.pad_r), (self.pad_c, self.pad_c)))
+        coin_cells = np.argwhere(self.padded == COIN)
+        self.coin_id = np.full(self.padded.shape, -1, dtype=np.int32)
+        self.coin_id[coin_cells[:, 0], coin_cells[:, 1]] = np.arange(len(coin_cells))
+        # summed-area table of the spike mask: "does this box touch it" in four lookups
+        self.spike_area = np.zeros((p.tile + 1, p.tile + 1), dtype=np.int32)
+        self.spike_area[1:, 1:] = spike_mask(p).cumsum(axis=0).cumsum(axis=1)
+        # End tiles as level-pixel rects (left, top, right, bottom), one column each
+        ew, eh = end_size(p)
+        ends = np.argwhere(self.grid == END).T * p.tile
+        self.end_rects = np.stack((ends[1], ends[0], ends[1] + ew, ends[0] + eh))[:, None, :]
+        self.win_rows = np.arange(-OBS_ABOVE, OBS_BELOW + 1)
+        self.win_cols = np.arange(-OBS_BEHIND, OBS_AHEAD + 1)
+
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.vy = np.zeros(n)
+        self.grounded = np.zeros(n, dtype=bool)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.taken = np.zeros((n, max(len(coin_cells), 1)), dtype=bool)
+        self._all = np.arange(n)
+
+    # -------------------- API --------------------
+
+    def reset(self):
+        self._reset(np.ones(self.n, dtype=bool))
+        return self._obs()
+
+    def step(self, actions):
+        p = self.physics
+        ts, pw = p.tile, p.player
+        held = np.asarray(actions).astype(bool).reshape(self.n)
+        rewards = np.zeros(self.n)
+        died = np.zeros(self.n, dtype=bool)
+
+        # Player.update: jump from the ground, gravity in the air, orbs while held
+        self.vy[held & self.grounded] = -p.jump
+        air = ~self.grounded
+        self.vy[air] = np.minimum(self.vy[air] + p.gravity, p.max_fall)
+        self._orbs(held, self.x, self.y)
+        died |= self._touches_solid(self.x, self.y)  # tiles scrolled in side-on last frame
+
+        substeps = max(1, int(np.ceil(np.abs(self.vy).max() / (pw / 2))))
+        dx = p.speed / substeps
+        dy = self.vy / substeps
+        self.grounded[:] = False
+        won = np.zeros(self.n, dtype=bool)
+        for _ in range(substeps):
+            live = ~died
+            nx = self.x + dx
+            # x first: anything solid in the way is a side-on hit
+            died |= live & self._touches_solid(nx, self.y)
+            self.x = np.where(died, self.x, nx)
+            ny = self.y + dy
+            hit = ~died & (dy != 0) & self._touches_solid(self.x, ny)
+            down = hit & (dy > 0)
+            up = hit & (dy < 0)
+            # land on the row the bottom edge went into; bonk under the row the top went into
+            ny[down] = np.ceil((ny[down] + pw) / ts - 1) * ts - pw
+            ny[up] = (np.floor(ny[up] / ts) + 1) * ts
+            self.vy[down] = 0.0
+            self.grounded |= down
+            dy = np.where(hit, 0.0, dy)
+            self.y = np.where(died, self.y, ny)
+            self._orbs(held & ~died, self.x, self.y)
+            died |= self._touches_spike(self.x, self.y)
+            won |= self._touches_end(self.x, self.y)
+        self.y = np.round(self.y)
+
+        rewards += self._coins(~died)
+        died |= self.y > self.fall_y
+        won &= ~died
+        self.steps += 1
+        rewards[~died] += PROGRESS_REWARD * p.speed / ts
+        rewards[died] += DEATH_REWARD
+        rewards[won] += WIN_REWARD
+
+        dones = died | won | (self.steps >= self.max_steps)
+        info = {"won": won, "died": died, "progress": np.minimum(self.x / self.level_px, 1.0)}
+        if dones.any():
+            self._reset(dones)
+        return self._obs(), rewards, dones, info
+
+    # -------------------- internals --------------------
+
+    def _reset(self, mask):
+        self.x[mask], self.y[mask] = START
+        self.vy[mask] = 0.0
+        self.grounded[mask] = False
+        self.steps[mask] = 0
+        self.taken[mask] = False
+
+    def _corners(self, x, y):
+        """Padded (rows, cols) of the 2x2 cells a player box at x, y can overlap, each (4, n)."""
+        ts, pw = self.physics.tile, self.physics.player
+        c0 = np.floor(x / ts)
+        c1 = np.ceil((x + pw) / ts) - 1
+        r0 = np.floor(y / ts)
+        r1 = np.ceil((y + pw) / ts) - 1
+        rows = np.stack((r0, r0, r1, r1)).astype(np.int64) + self.pad_r
+        cols = np.stack((c0, c1, c0, c1)).astype(np.int64) + self.pad_c
+        np.clip(rows, 0, self.padded.shape[0] - 1, out=rows)
+        np.clip(cols, 0, self.padded.shape[1] - 1, out=cols)
+        return rows, cols
+
+    def _touches(self, code, x, y):
+        rows, cols = self._corners(x, y)
+        return (self.padded[rows, cols] == code).any(axis=0)
+
+    def _touches_solid(self, x, y):
+        return self._touches(SOLID, x, y)
+
+    def _touches_spike(self, x, y):
+        ts, pw = self.physics.tile, self.physics.player
+        rows, cols = self._corners(x, y)
+        spike = self.padded[rows, cols] == SPIKE
+        # the player box in each cell's own pixel coordinates, cut to the cell
+        left = np.round(x) - (cols - self.pad_c) * ts
+        top = np.round(y) - (rows - self.pad_r) * ts
+        x0, x1 = (np.clip(v, 0, ts).astype(np.int64) for v in (left, left + pw))
+        y0, y1 = (np.clip(v, 0, ts).astype(np.int64) for v in (top, top + pw))
+        a = self.spike_area
+        area = a[y1, x1] - a[y0, x1] - a[y1, x0] + a[y0, x0]
+        return (spike & (area > 0)).any(axis=0)
+
+    def _touches_end(self, x, y):
+        pw = self.physics.player
+        left, top, right, bottom = self.end_rects
+        x, y = np.round(x)[:, None], np.round(y)[:, None]
+        # >= left: the game's sweep counts running up to the tile by the end of a step
+        return ((x < right) & (x + pw >= left) & (y < bottom) & (y + pw > top)).any(axis=1)
+
+    def _orbs(self, held, x, y):
+        self.vy[held & self._touches(ORB, x, y)] = -self.physics.orb_jump
+
+    def _coins(self, live):
+        rows, cols = self._corners(self.x, self.y)
+        ids = np.where(live, self.coin_id[rows, cols], -1)
+        hit = ids >= 0
+        # the 2x2 corners can name the same coin twice; count each one once
+        got = np.zeros(self.taken.shape, dtype=bool)
+        got[np.broadcast_to(self._all, ids.shape)[hit], ids[hit]] = True
+        got &= ~self.taken
+        self.taken |= got
+        return got.sum(axis=1) * COIN_REWARD
+
+    def _obs(self):
+        ts, pw = self.physics.tile, self.physics.player
+        row = np.floor((self.y + pw / 2) / ts).astype(np.int64)
+        col = np.floor((self.x + pw / 2) / ts).astype(np.int64)
+        rows = np.clip(row[:, None] + self.win_rows + self.pad_r, 0, self.padded.shape[0] - 1)
+        cols = np.clip(col[:, None] + self.win_cols + self.pad_c, 0, self.padded.shape[1] - 1)
+        rows, cols = rows[:, :, None], cols[:, None, :]
+        tiles = self.padded[rows, cols]
+        ids = self.coin_id[rows, cols]
+        taken = (ids >= 0) & self.taken[self._all[:, None, None], np.maximum(ids, 0)]
+        tiles[taken] = EMPTY
+        player = np.stack(((self.y + pw / 2) / ts - row, self.vy / ts, self.grounded), axis=1)
+        return {"tiles": tiles, "player": player.astype(np.float32)}
+
+
+# -------------------- Process pool --------------------
+
+def _worker(conn, level, n, physics, max_steps):
+    env = VecJumpEnv(level, n, physics, max_steps)
+    while True:
+        cmd, data = conn.recv()
+        if cmd == "step":
+            conn.send(env.step(data))
+        elif cmd == "reset":
+            conn.send(env.reset())
+        else:
+            conn.close()
+            return
+
+
+def _concat(parts):
+    if isinstance(parts[0], dict):
+        return {key: _concat([p[key] for p in parts]) for key in parts[0]}
+    return np.concatenate(parts)
+
+
+class ProcessVecEnv:
+    """VecJumpEnv split over `workers` processes with `n` players each; same API.
+
+    Every step goes out to all workers before any answer is read, so they run
+    in parallel. Call close() (or use it as a context manager) when done.
+    """
+
+    def __init__(self, level, workers, n, physics=None, max_steps=None):
+        self.n = workers * n
+        self.conns = []
+        self.procs = []
+        for _ in range(workers):
+            parent, child = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_worker, args=(child, level, n, physics, max_steps), daemon=True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+
+    def reset(self):
+        for conn in self.conns:
+            conn.send(("reset", None))
+        return _concat([conn.recv() for conn in self.conns])
+
+    def step(self, actions):
+        for conn, part in zip(self.conns, np.array_split(np.asarray(actions), len(self.conns))):
+            conn.send(("step", part))
+        results = [conn.recv() for conn in self.conns]
+        return tuple(_concat([r[i] for r in results]) for i in range(4))
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(("close", None))
+            except OSError:
+                pass
+        for proc in self.procs:
+            proc.join(timeout=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the vectorised environment with a random policy")
+    parser.add_argument("level")
+    parser.add_argument("--envs", type=int, default=1024, help="players per process")
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=0, help="processes (0 = run in this one)")
+    parser.add_argument("--jump", type=float, default=0.1, help="chance of holding jump each frame")
+    args = parser.parse_args(argv)
+    if args.workers:
+        env = ProcessVecEnv(args.level, args.workers, args.envs)
+    else:
+        env = VecJumpEnv(args.level, args.envs)
+    rng = np.random.default_rng(0)
+    env.reset()
+    wins = deaths = 0
+    t = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, _, info = env.step(rng.random(env.n) < args.jump)
+        wins += int(info["won"].sum())
+        deaths += int(info["died"].sum())
+    elapsed = time.perf_counter() - t
+    if args.workers:
+        env.close()
+    print(f"{env.n * args.steps / elapsed:,.0f} env-steps/s ({env.n} players x {args.steps} steps "
+          f"in {elapsed:.2f}s), {deaths} deaths, {wins} wins")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
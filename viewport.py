@@ -0,0 +1,186 @@
+#  filename: viewport.py
+#  The window, and the 800 x 600 logical surface every screen draws on
+#
+#  Screens lay themselves out for LOGICAL_SIZE; present() scales that
+#  surface to fit the (resizable or fullscreen) window, keeping its aspect
+#  ratio. Whole-number scales use a plain pixel-doubling scale (the fast
+#  path), others smoothscale. With scaling "native" the game draws straight
+#  into the window at a whole-number scale instead, with images pre-scaled
+#  once per scale (see ScaledSet), so nothing is scaled per frame.
+#
+#  F11 toggles fullscreen, F10 cycles the scaling; both are saved in
+#  settings.json.
+
+import math
+import weakref
+
+import pygame
+
+import asset_cache
+from settings import get_setting, set_setting
+
+LOGICAL_SIZE = (800, 600)
+BORDER_COLOR = (0, 0, 0)  # bars around the picture when the window's aspect ratio differs
+# fit: fill the window (smoothscale unless the scale is whole), integer: the largest
+# whole scale that fits, native: integer, and the game draws at that scale itself
+SCALING_CHOICES = ["fit", "integer", "native"]
+
+
+class ScaledSet:
+    """Images at `scale` times their size, made once per image and kept.
+
+    Images loaded through asset_cache are scaled again from their source
+    file (and cached on disk for that size), so they stay crisp; others are
+    pixel-doubled. A copy is dropped along with its image.
+    """
+
+    def __init__(self, scale):
+        self.scale = scale
+        self._images = weakref.WeakKeyDictionary()  # image -> scaled copy
+
+    def get(self, image):
+        scaled = self._images.get(image)
+        if scaled is None:
+            scaled = self._images[image] = asset_cache.rescale(image, self.scale)
+        return scaled
+
+    def clear(self):
+        self._images.clear()
+
+
+class Viewport:
+    """Owns the window; `surface` is the LOGICAL_SIZE surface to draw on."""
+
+    def __init__(self, size=LOGICAL_SIZE, fullscreen=None, scaling=None):
+        self.size = size
+        self.fullscreen = get_setting("fullscreen", False) if fullscreen is None else fullscreen
+        self.scaling = get_setting("scaling", "fit") if scaling is None else scaling
+        if self.scaling not in SCALING_CHOICES:
+            print(f"Warning: unknown scaling '{self.scaling}', using fit")
+            self.scaling = "fit"
+        self.window = None
+        self.surface = None
+        self.dest = pygame.Rect((0, 0), size)  # where the picture goes in the window
+        self.scale = 1.0  # window pixels per logical pixel
+        self.whole = True  # scale is a whole number (the fast path)
+        self.native = False  # this frame is drawn by native_target()
+        self.stale = False  # `surface` is older than what the window shows (see capture)
+        self.dirty = True  # the window was cleared since the last full present
+        self._sets = {}  # scale -> ScaledSet
+        self._open()
+
+    def _open(self):
+        if self.fullscreen:
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.window = pygame.display.set_mode(self.size, pygame.RESIZABLE)
+        if self.surface is None:
+            self.surface = pygame.Surface(self.size).convert()
+        self._layout()
+
+    def _layout(self):
+        """Work out the scale and the picture's place in the window, and clear the bars."""
+        self.window = pygame.display.get_surface()
+        ww, wh = self.window.get_size()
+        fit = min(ww / self.size[0], wh / self.size[1])
+        if self.scaling != "fit" and fit >= 1:
+            fit = math.floor(fit)
+        self.scale = fit
+        self.whole = fit == int(fit)
+        w, h = round(self.size[0] * fit), round(self.size[1] * fit)
+        self.dest = pygame.Rect((ww - w) // 2, (wh - h) // 2, w, h)
+        self.window.fill(BORDER_COLOR)
+        self.native = self.stale = False  # nothing left in the window to capture
+        self.dirty = True
+
+    @property
+    def native_scale(self):
+        """The whole scale the game draws at in native mode (1: draw on `surface` as usual)."""
+        if self.scaling == "native" and self.whole and self.scale >= 2:
+            return int(self.scale)
+        return 1
+
+    def scaled(self, scale):
+        """The ScaledSet for `scale`, kept for as long as the viewport."""
+        if scale not in self._sets:
+            self._sets[scale] = ScaledSet(scale)
+        return self._sets[scale]
+
+    def clear_scaled(self):
+        """Drop every pre-scaled image (they are made again as they are drawn)."""
+        for images in self._sets.values():
+            images.clear()
+
+    def native_target(self):
+        """The part of the window to draw this frame on directly, at native_scale."""
+        self.native = self.stale = True
+        return self.window.subsurface(self.dest)
+
+    def capture(self):
+        """Bring `surface` up to date with a frame drawn natively (screens
+        that open over the last frame copy it from there)."""
+        if self.stale:
+            pygame.transform.smoothscale(self.window.subsurface(self.dest), self.size, self.surface)
+            self.stale = False
+
+    def to_logical(self, pos):
+        """A window position in logical pixels."""
+        return (int((pos[0] - self.dest.x) / self.scale), int((pos[1] - self.dest.y) / self.scale))
+
+    def present(self, shown):
+        """Show the frame: True for all of it, or a list of logical rects that changed."""
+        if shown is True:
+            self.dirty = False
+        if self.native:
+            self.native = False  # the next frame draws on `surface` unless it asks again
+            pygame.display.flip()
+            return
+        self.stale = False
+        target = self.window.subsurface(self.dest)
+        rects = None if shown is True else [pygame.Rect(r).clip(self.surface.get_rect()) for r in shown]
+        if self.scale == 1:
+            if rects is None:
+                target.blit(self.surface, (0, 0))
+            else:
+                target.blits([(self.surface, r.topleft, r) for r in rects], doreturn=False)
+        elif self.whole:
+            k = int(self.scale)
+            for r in [self.surface.get_rect()] if rects is None else rects:
+                if r.w and r.h:
+                    pygame.transform.scale(self.surface.subsurface(r), (r.w * k, r.h * k),
+                                           target.subsurface((r.x * k, r.y * k, r.w * k, r.h * k)))
+        else:
+            pygame.transform.smoothscale(self.surface, self.dest.size, target)
+        if rects is None:
+            pygame.display.flip()
+        else:
+            s = self.scale
+            pygame.display.update([pygame.Rect(self.dest.x + math.floor(r.x * s), self.dest.y + math.floor(r.y * s),
+                                               math.ceil(r.w * s) + 1, math.ceil(r.h * s) + 1) for r in rects])
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        set_setting("fullscreen", self.fullscreen)
+        self._open()
+
+    def cycle_scaling(self):
+        self.scaling = SCALING_CHOICES[(SCALING_CHOICES.index(self.scaling) + 1) % len(SCALING_CHOICES)]
+        set_setting("scaling", self.scaling)
+        self._layout()
+        print(f"Scaling: {self.scaling} (x{self.scale:g})")
+
+    def handle(self, event):
+        """Deal with window and display events; mouse positions are made logical.
+        Returns True if the event was used up here."""
+        if event.type == pygame.VIDEORESIZE:
+            self._layout()
+            return True
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+            self.toggle_fullscreen()
+            return True
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F10:
+            self.cycle_scaling()
+            return True
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            event.pos = self.to_logical(event.pos)
+        return False